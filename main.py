@@ -52,6 +52,9 @@ from preprocessing.data_preprocessor import DataPreprocessor
 from preprocessing.feature_engineering import FeatureEngineer
 from analysis.event_study import EventStudyAnalyzer
 from analysis.regression_analysis import RegressionAnalyzer
+from utils.stage_handoff import StageHandoff, HandoffLedger
+from utils.returns_panel import ReturnsPanel
+from utils.missing_data import MissingDataProfile, match_policies
 from visualization import PlotGenerator
 
 # Suppress warnings for cleaner output
@@ -74,6 +77,14 @@ class MacroAnnouncementAnalysis:
         self.economic_data = None
         self.aligned_data = None
         
+        # Stage handoff of the aligned data and its copy ledger
+        self.aligned_handoff = None
+        self.handoff_ledger = HandoffLedger()
+        self.interactions = None
+        
+        # Returns computed once per run and shared by every stage
+        self.returns_panel = None
+        
         # Analyzers
         self.event_study_analyzer = None
         self.regression_analyzer = None
@@ -360,14 +371,37 @@ class MacroAnnouncementAnalysis:
             
             # Clean the data based on quality analysis
             self.logger.info("Cleaning data based on quality analysis...")
-            cleaned_data = self._enhanced_data_cleaning(raw_data, quality_report)
+            cleaned_data = self._enhanced_data_cleaning(
+                raw_data, quality_report, missing_profile=quality_analyzer.missing_profile
+            )
             
             self.logger.info(f"Cleaned dataset: {cleaned_data.shape[0]} observations, {cleaned_data.shape[1]} variables")
             
             # Feature engineering
             self.logger.info("Engineering features...")
-            engineer = FeatureEngineer()
-            self.aligned_data = engineer.create_analysis_features(cleaned_data)
+            engineer = FeatureEngineer(n_jobs=self.config.get('analysis', {}).get('feature_n_jobs', 1))
+            self.returns_panel = ReturnsPanel(cleaned_data)
+            self.aligned_data = engineer.create_analysis_features(
+                cleaned_data,
+                feature_patterns=self.config.get('analysis', {}).get('feature_patterns'),
+                virtual_interactions=self.config.get('analysis', {}).get('virtual_interactions', False),
+                returns_panel=self.returns_panel
+            )
+            self.interactions = engineer.interactions
+            
+            # Drop redundant (highly correlated) features
+            pruning_config = self.config.get('analysis', {}).get('feature_pruning') or {}
+            if pruning_config.get('enabled', False):
+                from preprocessing.feature_pruning import FeaturePruner
+                pruner = FeaturePruner(
+                    threshold=pruning_config.get('threshold', 0.98),
+                    min_periods=pruning_config.get('min_periods', 30),
+                    block_size=pruning_config.get('block_size', 256),
+                    protect=pruning_config.get('protect'),
+                    cache_path=pruning_config.get('cache_path')
+                )
+                # The raw price columns feed the derived variables and the event study
+                self.aligned_data = pruner.fit_transform(self.aligned_data, keep=cleaned_data.columns)
             
             # Calculate returns and volatilities
             self.aligned_data = self._calculate_derived_variables(self.aligned_data)
@@ -427,18 +461,29 @@ class MacroAnnouncementAnalysis:
         else:
             return pd.DataFrame()
     
-    def _enhanced_data_cleaning(self, data: pd.DataFrame, quality_report: Dict) -> pd.DataFrame:
-        """Enhanced data cleaning based on quality analysis."""
+    def _enhanced_data_cleaning(
+        self,
+        data: pd.DataFrame,
+        quality_report: Dict,
+        missing_profile: Optional[MissingDataProfile] = None
+    ) -> pd.DataFrame:
+        """
+        Enhanced data cleaning based on quality analysis.
+        
+        Missing-data decisions (dropping sparse columns, fill policies) use the
+        quality analysis' ``MissingDataProfile`` of ``data`` when given.
+        """
         
         cleaned_data = data.copy()
+        missing_config = self.config.get('analysis', {}).get('missing_data') or {}
+        profile = missing_profile
+        if profile is None or not profile.matches(data):
+            profile = MissingDataProfile(data)
         
         # Remove columns with excessive missing data (>50% for structural issues)
         # Adjusted threshold from 80% to 50% to handle newer cryptocurrencies
-        missing_analysis = quality_report.get('missing_data', {})
-        missing_pct = missing_analysis.get('missing_percentage', {})
-        
-        high_missing_threshold = 50  # More strict threshold for newer assets
-        columns_to_drop = [col for col, pct in missing_pct.items() if pct > high_missing_threshold]
+        high_missing_threshold = missing_config.get('drop_above_pct', 50)  # More strict threshold for newer assets
+        columns_to_drop = profile.columns_above(high_missing_threshold)
         
         if columns_to_drop:
             self.logger.warning(f"Dropping {len(columns_to_drop)} columns with >{high_missing_threshold}% missing data")
@@ -446,26 +491,31 @@ class MacroAnnouncementAnalysis:
             cleaned_data = cleaned_data.drop(columns=columns_to_drop)
         
         # Log moderate missing data (20-50%) as informational
-        moderate_missing = [(col, pct) for col, pct in missing_pct.items() 
-                           if 20 < pct <= high_missing_threshold and col in cleaned_data.columns]
+        moderate_threshold = missing_config.get('moderate_above_pct', 20)
+        moderate_missing = profile.columns_between(moderate_threshold, high_missing_threshold)
         if moderate_missing:
-            self.logger.info(f"{len(moderate_missing)} columns have 20-{high_missing_threshold}% missing data (kept but may indicate newer assets)")
+            self.logger.info(f"{len(moderate_missing)} columns have {moderate_threshold}-{high_missing_threshold}% missing data (kept but may indicate newer assets)")
         
-        # Handle outliers based on quality analysis
+        # Cap extreme outliers (beyond the 1st/99th percentiles) of the columns
+        # the quality analysis flagged, all columns at once
         outlier_analysis = quality_report.get('outlier_detection', {})
-        for col, outlier_info in outlier_analysis.items():
-            if col in cleaned_data.columns:
-                # Cap extreme outliers (beyond 99th percentile)
-                if 'z_outliers_pct' in outlier_info and outlier_info['z_outliers_pct'] > 5:
-                    series = cleaned_data[col]
-                    lower_cap = series.quantile(0.01)
-                    upper_cap = series.quantile(0.99)
-                    cleaned_data[col] = series.clip(lower=lower_cap, upper=upper_cap)
-        
-        # Forward fill missing values for economic indicators (common practice)
-        econ_cols = [col for col in cleaned_data.columns if 'economic' in col.lower()]
-        if econ_cols:
-            cleaned_data[econ_cols] = cleaned_data[econ_cols].ffill()
+        capped_columns = [
+            col for col, outlier_info in outlier_analysis.items()
+            if col in cleaned_data.columns and outlier_info.get('z_outliers_pct', 0) > 5
+        ]
+        if capped_columns:
+            caps = cleaned_data[capped_columns].quantile([0.01, 0.99])
+            cleaned_data[capped_columns] = cleaned_data[capped_columns].clip(
+                lower=caps.loc[0.01], upper=caps.loc[0.99], axis=1
+            )
+        
+        # Fill policies by column pattern, applied in bulk (by default forward
+        # fill of economic indicators, common practice)
+        fill_policies = match_policies(
+            cleaned_data.columns, missing_config.get('fill_policies', {'*economic*': 'ffill'})
+        )
+        if fill_policies:
+            cleaned_data = profile.fill(cleaned_data, fill_policies, limit=missing_config.get('fill_limit'))
         
         # Remove rows that are entirely empty
         cleaned_data = cleaned_data.dropna(how='all')
@@ -484,14 +534,16 @@ class MacroAnnouncementAnalysis:
         # Collect all new columns in a dictionary to avoid DataFrame fragmentation
         new_columns = {}
         
+        # Returns are read from the run's shared panel
+        self.returns_panel = ReturnsPanel.for_data(data, self.returns_panel)
+        
         # Calculate price-based derived variables
         for col in price_columns:
             if col in data.columns:
-                series = data[col].dropna()
-                if len(series) > 10:
+                if data[col].notna().sum() > 10:
                     
                     # Calculate returns
-                    returns = series.pct_change().dropna()
+                    returns = self.returns_panel.series(col)
                     if not returns.empty:
                         new_columns[f"{col}_return"] = returns
                         
@@ -518,7 +570,7 @@ class MacroAnnouncementAnalysis:
                     new_columns[f"{col}_surprise"] = surprise
                     
                     # Calculate year-over-year change
-                    yoy_change = series.pct_change(periods=12)
+                    yoy_change = self.returns_panel.series(col, horizon=12)
                     new_columns[f"{col}_yoy_change"] = yoy_change
         
         # Efficiently combine original data with new columns using pd.concat
@@ -639,6 +691,12 @@ class MacroAnnouncementAnalysis:
             except Exception as exc:
                 self.logger.warning(f"Failed to export data overview tables: {exc}")
     
+    def _get_aligned_handoff(self) -> StageHandoff:
+        """Return the preprocessing-stage handoff of the current aligned data."""
+        if self.aligned_handoff is None or self.aligned_handoff.source is not self.aligned_data:
+            self.aligned_handoff = StageHandoff(self.aligned_data, 'preprocessing', ledger=self.handoff_ledger)
+        return self.aligned_handoff
+    
     def _basic_preprocessing_fallback(self):
         """Fallback to basic preprocessing if enhanced fails."""
         self.logger.info("Using basic preprocessing fallback...")
@@ -708,12 +766,21 @@ class MacroAnnouncementAnalysis:
                 self.logger.warning("No events found within data range, using synthetic events")
                 sample_event_dates = self._generate_synthetic_events()
             
-            # Run enhanced event study
+            # Run enhanced event study (windows in sessions of the configured trading calendar)
+            trading_calendar = self.config.get('analysis', {}).get('trading_calendar')
+            estimation_config = self.config.get('analysis', {}).get('event_estimation') or {}
+            estimation_options = {
+                'estimation_mode': estimation_config.get('mode', 'pooled'),
+                'estimation_gap': estimation_config.get('gap', 0)
+            }
             event_results = self.event_study_analyzer.analyze_events(
-                aligned_data=self.aligned_data,
+                aligned_data=self._get_aligned_handoff(),
                 sample_events=sample_event_dates,
                 event_window_days=5,  # Extended window for more comprehensive analysis
-                estimation_window=250
+                estimation_window=250,
+                returns_panel=self.returns_panel,
+                calendar=trading_calendar,
+                **estimation_options
             )
             
             # Run additional event study analysis for robustness
@@ -723,10 +790,13 @@ class MacroAnnouncementAnalysis:
                 # Test different event windows
                 for window in [1, 3, 5, 7]:
                     window_results = self.event_study_analyzer.analyze_events(
-                        aligned_data=self.aligned_data,
+                        aligned_data=self._get_aligned_handoff(),
                         sample_events=sample_event_dates[:5],  # Use subset for robustness
                         event_window_days=window,
-                        estimation_window=250
+                        estimation_window=250,
+                        returns_panel=self.returns_panel,
+                        calendar=trading_calendar,
+                        **estimation_options
                     )
                     if window_results and 'error' not in window_results:
                         event_results[f'window_{window}_day'] = window_results
@@ -876,9 +946,11 @@ class MacroAnnouncementAnalysis:
             # 1. Standard pooled regression
             self.logger.info("Running pooled regression analysis...")
             regression_results = self.regression_analyzer.run_pooled_regression(
-                aligned_data=self.aligned_data,
+                aligned_data=self._get_aligned_handoff(),
                 crypto_assets=crypto_assets,
-                stock_assets=stock_assets
+                stock_assets=stock_assets,
+                interactions=self.interactions,
+                returns_panel=self.returns_panel
             )
             
             # 2. Run comprehensive statistical analysis (with limited assets)
@@ -894,10 +966,11 @@ class MacroAnnouncementAnalysis:
             self.logger.info(f"Using {len(economic_indicators)} economic indicators for analysis")
             
             statistical_results = statistical_analyzer.run_complete_analysis(
-                data=self.aligned_data,
+                data=self._get_aligned_handoff(),
                 crypto_assets=crypto_assets,
                 stock_assets=stock_assets, 
-                economic_indicators=economic_indicators
+                economic_indicators=economic_indicators,
+                returns_panel=self.returns_panel
             )
             
             # 3. Combine all results
@@ -956,7 +1029,8 @@ class MacroAnnouncementAnalysis:
                 basic_results = self.regression_analyzer.run_pooled_regression(
                     aligned_data=self.aligned_data,
                     crypto_assets=None,
-                    stock_assets=None
+                    stock_assets=None,
+                    returns_panel=self.returns_panel
                 )
                 if basic_results:
                     self.results['regression'] = basic_results
@@ -1405,6 +1479,9 @@ class MacroAnnouncementAnalysis:
             self.run_regression_analysis()
             self.generate_summary_report()
             
+            # Report bytes copied at each stage boundary
+            self.handoff_ledger.log_summary(self.logger)
+            
             # Success message
             end_time = datetime.now()
             duration = end_time - start_time
@@ -4,8 +4,12 @@ Analysis package for econometric models and statistical tests.
 
 from .event_study import EventStudyAnalyzer
 from .regression_analysis import RegressionAnalyzer
+from .market_model import fit_market_model, fit_event_market_models, MarketModelFit
 
 __all__ = [
     'EventStudyAnalyzer',
-    'RegressionAnalyzer'
+    'RegressionAnalyzer',
+    'fit_market_model',
+    'fit_event_market_models',
+    'MarketModelFit'
 ]
\ No newline at end of file
@@ -10,6 +10,15 @@ from typing import Dict, List, Tuple, Optional, Any, Union
 import scipy.stats as stats
 import logging
 import warnings
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.stage_handoff import StageHandoff
+from utils.returns_panel import ReturnsPanel
 
 warnings.filterwarnings('ignore', category=FutureWarning)
 warnings.filterwarnings('ignore', category=RuntimeWarning)
@@ -28,15 +37,18 @@ class ComprehensiveStatisticalAnalysis:
         
     def run_complete_analysis(
         self, 
-        data: pd.DataFrame,
+        data: Union[pd.DataFrame, StageHandoff],
         crypto_assets: List[str] = None,
         stock_assets: List[str] = None,
-        economic_indicators: List[str] = None
+        economic_indicators: List[str] = None,
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> Dict[str, Any]:
         """
         Run simplified statistical analysis for the research.
         
         OPTIMIZATION: Simplified to prevent hanging and data errors.
+        Asset returns are read from ``returns_panel`` (the run's shared
+        panel) when given.
         """
         
         self.logger.info("Starting simplified statistical analysis")
@@ -61,14 +73,20 @@ class ComprehensiveStatisticalAnalysis:
         
         self.logger.info(f"Simplified analysis: {len(crypto_assets)} crypto, {len(stock_assets)} stock, {len(economic_indicators)} economic")
         
+        # Take only the selected series from a stage handoff (column views, no copy)
+        if isinstance(data, StageHandoff):
+            data = data.select(crypto_assets + stock_assets + economic_indicators, consumer='statistical_analysis')
+        
         results = {}
         
         try:
+            panel = ReturnsPanel.for_data(data, returns_panel)
+            
             # Simplified summary statistics
-            results['data_summary'] = self._simple_summary_statistics(data, crypto_assets, stock_assets)
+            results['data_summary'] = self._simple_summary_statistics(data, crypto_assets, stock_assets, panel)
             
             # Simplified hypothesis tests
-            results['hypothesis_tests'] = self._simple_hypothesis_tests(data, crypto_assets, stock_assets)
+            results['hypothesis_tests'] = self._simple_hypothesis_tests(data, crypto_assets, stock_assets, panel)
             
             # Basic correlation analysis
             results['correlation_analysis'] = self._basic_correlation_analysis(data, crypto_assets, stock_assets)
@@ -88,9 +106,11 @@ class ComprehensiveStatisticalAnalysis:
         self, 
         data: pd.DataFrame, 
         crypto_assets: List[str], 
-        stock_assets: List[str]
+        stock_assets: List[str],
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> Dict[str, Any]:
         """Generate simple descriptive statistics."""
+        panel = ReturnsPanel.for_data(data, returns_panel)
         
         summary = {
             'dataset_overview': {
@@ -111,8 +131,7 @@ class ComprehensiveStatisticalAnalysis:
                 if asset in data.columns:
                     series = data[asset].dropna()
                     if len(series) > 10:
-                        # Calculate returns
-                        returns = series.pct_change().dropna()
+                        returns = panel.series(asset)
                         if len(returns) > 5:
                             category_stats[asset] = {
                                 'observations': len(series),
@@ -132,11 +151,13 @@ class ComprehensiveStatisticalAnalysis:
         self, 
         data: pd.DataFrame, 
         crypto_assets: List[str], 
-        stock_assets: List[str]
+        stock_assets: List[str],
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> Dict[str, Any]:
         """Run simplified hypothesis tests."""
         
         results = {}
+        panel = ReturnsPanel.for_data(data, returns_panel)
         
         # Calculate returns for comparison
         crypto_returns = []
@@ -145,17 +166,15 @@ class ComprehensiveStatisticalAnalysis:
         # Collect returns from available assets
         for asset in crypto_assets:
             if asset in data.columns:
-                prices = data[asset].dropna()
-                if len(prices) > 20:  # Lower threshold
-                    returns = prices.pct_change().dropna()
+                if data[asset].notna().sum() > 20:  # Lower threshold
+                    returns = panel.series(asset)
                     if len(returns) > 10:
                         crypto_returns.extend(returns.values)
         
         for asset in stock_assets:
             if asset in data.columns:
-                prices = data[asset].dropna()
-                if len(prices) > 20:  # Lower threshold
-                    returns = prices.pct_change().dropna()
+                if data[asset].notna().sum() > 20:  # Lower threshold
+                    returns = panel.series(asset)
                     if len(returns) > 10:
                         stock_returns.extend(returns.values)
         
@@ -4,7 +4,7 @@ Event study analysis implementation.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional, Union
 from datetime import datetime
 import scipy.stats as stats
 import logging
@@ -16,6 +16,12 @@ src_path = Path(__file__).parent.parent
 sys.path.insert(0, str(src_path))
 
 from utils.config import Config
+from utils.stage_handoff import StageHandoff
+from utils.returns_panel import ReturnsPanel
+from utils.calendars import TradingCalendar, get_calendar, calendar_for_column, BY_ASSET_CLASS
+from .market_model import fit_market_model, fit_event_market_models, ESTIMATED, SHORT_OVERLAP, INSUFFICIENT_DATA
+
+ESTIMATION_MODES = ('pooled', 'event')
 
 # Global config instance
 config = Config()
@@ -49,7 +55,8 @@ class EventStudyAnalyzer:
         returns_data: pd.DataFrame,
         market_returns: pd.Series,
         estimation_window: int = 100,  # Reduced to fit available data
-        exclude_event_windows: List[Tuple[datetime, datetime]] = None
+        exclude_event_windows: List[Tuple[datetime, datetime]] = None,
+        calendar: Optional[Union[str, TradingCalendar]] = None
     ) -> Dict[str, Dict[str, float]]:
         """
         Estimate normal return model parameters (market model).
@@ -61,109 +68,64 @@ class EventStudyAnalyzer:
             market_returns: Series with market returns (e.g., S&P 500)
             estimation_window: Number of days for estimation
             exclude_event_windows: List of (start, end) tuples to exclude
+            calendar: Trading calendar ('nyse', 'crypto', 'fx' or a
+                TradingCalendar); the estimation window then spans the last
+                ``estimation_window`` sessions instead of the last
+                ``estimation_window`` observations. 'by_asset_class' counts
+                each asset's window in the sessions of its asset class
             
         Returns:
-            Dictionary with model parameters for each asset
+            Dictionary with model parameters for each asset (see
+            ``fit_market_model`` for the arrays behind it)
         """
-        model_params = {}
+        groups = self._calendar_groups(returns_data.columns, calendar)
+        if len(groups) > 1:
+            model_params = {}
+            for group_calendar, columns in groups:
+                model_params.update(self.estimate_normal_returns(
+                    returns_data[columns], market_returns, estimation_window,
+                    exclude_event_windows, calendar=group_calendar
+                ))
+            return {asset: model_params[asset] for asset in returns_data.columns}
+        calendar = groups[0][0] if groups else None
+        
+        # All assets in one batch: one exclusion mask, masked sufficient statistics
+        fit = fit_market_model(
+            returns_data, market_returns, estimation_window, exclude_event_windows, calendar=calendar
+        )
+        # Fallback volatility only for the assets with too little overlap
+        short = [asset for asset, status in zip(fit.assets, fit.status) if status == SHORT_OVERLAP]
+        fallback_std = returns_data[short].std()
+        n_valid = returns_data[short].notna().sum()
         
-        for asset in returns_data.columns:
-            asset_returns = returns_data[asset].dropna()
-            
-            # Align with market returns first
-            common_dates = asset_returns.index.intersection(market_returns.index)
-            min_required_days = max(10, min(30, len(asset_returns) // 3))  # Adaptive minimum
-            if len(common_dates) < min_required_days:
-                self.logger.debug(f"Limited overlapping data for {asset}: {len(common_dates)} days (min required: {min_required_days})")
+        model_params = {}
+        for i, asset in enumerate(fit.assets):
+            status = fit.status[i]
+            if status == ESTIMATED:
+                model_params[asset] = {
+                    'alpha': fit.alpha[i],
+                    'beta': fit.beta[i],
+                    # Ensure residual_std is never zero to avoid division by zero
+                    'residual_std': max(fit.residual_std[i], 1e-8),
+                    'r_squared': fit.r_squared[i],
+                    'n_observations': int(fit.n_observations[i])
+                }
+            elif status == SHORT_OVERLAP:
+                self.logger.debug(f"Limited overlapping data for {asset}: {fit.n_common[i]} days")
                 # Use simple fallback model instead of skipping
-                residual_std = asset_returns.std() * 0.5 if len(asset_returns) > 5 else 0.02
+                residual_std = fallback_std[asset] * 0.5 if n_valid[asset] > 5 else 0.02
                 model_params[asset] = {
                     'alpha': 0.0,
                     'beta': 1.0 if 'crypto' not in asset.lower() else 1.5,  # Higher beta for crypto
                     'residual_std': max(residual_std, 1e-8),  # Ensure never zero
                     'r_squared': 0.1,  # Conservative estimate
-                    'n_observations': len(common_dates)
+                    'n_observations': int(fit.n_observations[i])
                 }
-                continue
-                
-            asset_ret = asset_returns.loc[common_dates]
-            market_ret = market_returns.loc[common_dates]
-            
-            # Exclude event windows if specified
-            if exclude_event_windows:
-                mask = pd.Series(True, index=common_dates)
-                for start_date, end_date in exclude_event_windows:
-                    event_mask = (common_dates >= start_date) & (common_dates <= end_date)
-                    mask = mask & ~event_mask
-                
-                asset_ret = asset_ret[mask]
-                market_ret = market_ret[mask]
-            
-            # Use available data up to estimation_window
-            n_available = min(len(asset_ret), estimation_window)
-            if n_available > 15:
-                asset_ret = asset_ret.tail(n_available)
-                market_ret = market_ret.tail(n_available)
-            
-                # Remove any remaining NaN values
-                valid_mask = asset_ret.notna() & market_ret.notna()
-                asset_ret_clean = asset_ret[valid_mask]
-                market_ret_clean = market_ret[valid_mask]
-                
-                if len(asset_ret_clean) > 10:  # Reduced minimum requirement
-                    try:
-                        # Simple OLS regression
-                        X = np.column_stack([np.ones(len(market_ret_clean)), market_ret_clean])
-                        y = asset_ret_clean.values
-                        
-                        params = np.linalg.lstsq(X, y, rcond=None)[0]
-                        alpha, beta = params[0], params[1]
-                        
-                        # Calculate residuals and statistics
-                        predicted = alpha + beta * market_ret_clean
-                        residuals = asset_ret_clean - predicted
-                        residual_std = np.std(residuals) if len(residuals) > 1 else 0.02
-                        # Ensure residual_std is never zero to avoid division by zero
-                        residual_std = max(residual_std, 1e-8)
-                        
-                        # Avoid division by zero
-                        var_actual = np.var(asset_ret_clean)
-                        var_residuals = np.var(residuals)
-                        r_squared = max(0, 1 - var_residuals / var_actual) if var_actual > 0 else 0.0
-                        
-                        model_params[asset] = {
-                            'alpha': alpha,
-                            'beta': beta,
-                            'residual_std': residual_std,
-                            'r_squared': r_squared,
-                            'n_observations': len(asset_ret_clean)
-                        }
-                        
-                        self.logger.info(
-                            f"Estimated model for {asset}: alpha={alpha:.4f}, beta={beta:.4f}, R2={r_squared:.4f}, N={len(asset_ret_clean)}"
-                        )
-                        
-                    except (np.linalg.LinAlgError, ValueError) as e:
-                        self.logger.warning(f"Could not estimate model for {asset}: {e}")
-                        residual_std = np.std(asset_ret_clean) if len(asset_ret_clean) > 1 else 0.02
-                        model_params[asset] = {
-                            'alpha': 0.0,
-                            'beta': 1.0 if asset != market_returns.name else 1.0,
-                            'residual_std': max(residual_std, 1e-8),  # Ensure never zero
-                            'r_squared': 0.0,
-                            'n_observations': len(asset_ret_clean)
-                        }
-                else:
-                    self.logger.warning(f"Insufficient clean data for {asset}: {len(asset_ret_clean)} observations")
-                    model_params[asset] = {
-                        'alpha': 0.0,
-                        'beta': 1.0,
-                        'residual_std': max(0.02, 1e-8),  # Ensure never zero
-                        'r_squared': 0.0,
-                        'n_observations': 0
-                    }
             else:
-                self.logger.warning(f"Insufficient data for {asset}: {n_available} observations")
+                if status == INSUFFICIENT_DATA:
+                    self.logger.warning(f"Insufficient data for {asset}: {fit.n_available[i]} observations")
+                else:
+                    self.logger.warning(f"Insufficient clean data for {asset}")
                 model_params[asset] = {
                     'alpha': 0.0,
                     'beta': 1.0,
@@ -172,14 +134,95 @@ class EventStudyAnalyzer:
                     'n_observations': 0
                 }
         
+        self.logger.info(
+            f"Estimated market model for {int(fit.estimated.sum())} of {len(fit)} assets "
+            f"(median beta={np.nanmedian(fit.beta) if fit.estimated.any() else float('nan'):.4f})"
+        )
         return model_params
     
+    def estimate_event_normal_returns(
+        self,
+        returns_data: pd.DataFrame,
+        market_returns: pd.Series,
+        event_windows: List[Tuple[datetime, datetime]],
+        estimation_window: int = 250,
+        estimation_gap: int = 0,
+        calendar: Optional[Union[str, TradingCalendar]] = None,
+        fallback_params: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Estimate a separate market model for every event and asset.
+        
+        Each event's estimation window covers the ``estimation_window``
+        observations (sessions, with a calendar) ending ``estimation_gap``
+        before its event window; all event windows are excluded from the
+        samples. Every (event, asset) fit is O(1) from prefix sums (see
+        ``fit_event_market_models``).
+        
+        Args:
+            returns_data: DataFrame with asset returns
+            market_returns: Series with market returns
+            event_windows: List of (start, end) event windows
+            estimation_window: Observations (sessions) per estimation window
+            estimation_gap: Observations (sessions) between the estimation
+                and event windows
+            calendar: Trading calendar ('nyse', 'crypto', 'fx' or a
+                TradingCalendar) in whose sessions the windows are counted;
+                'by_asset_class' uses each asset's own calendar
+            fallback_params: Parameters by asset used where an event's
+                window has too little data (e.g. ``estimate_normal_returns``)
+            
+        Returns:
+            Dictionary of model parameters by asset, by event name ('event_1', ...)
+        """
+        groups = self._calendar_groups(returns_data.columns, calendar)
+        if len(groups) > 1:
+            event_params = {f'event_{i+1}': {} for i in range(len(event_windows))}
+            for group_calendar, columns in groups:
+                group_params = self.estimate_event_normal_returns(
+                    returns_data[columns], market_returns, event_windows, estimation_window,
+                    estimation_gap=estimation_gap, calendar=group_calendar, fallback_params=fallback_params
+                )
+                for event_name, params in group_params.items():
+                    event_params[event_name].update(params)
+            return event_params
+        calendar = groups[0][0] if groups else None
+        
+        fit = fit_event_market_models(
+            returns_data, market_returns, event_windows, estimation_window,
+            gap=estimation_gap, exclude_event_windows=event_windows, calendar=calendar
+        )
+        fallback_params = fallback_params or {}
+        
+        event_params = {}
+        for i in range(len(event_windows)):
+            params = {}
+            for j, asset in enumerate(fit.assets):
+                if fit.status[i, j] == ESTIMATED:
+                    params[asset] = {
+                        'alpha': fit.alpha[i, j],
+                        'beta': fit.beta[i, j],
+                        'residual_std': max(fit.residual_std[i, j], 1e-8),  # Ensure never zero
+                        'r_squared': fit.r_squared[i, j],
+                        'n_observations': int(fit.n_observations[i, j])
+                    }
+                elif asset in fallback_params:
+                    params[asset] = fallback_params[asset]
+            event_params[f'event_{i+1}'] = params
+        
+        self.logger.info(
+            f"Estimated event-specific market models: {int(fit.estimated.sum())} of "
+            f"{fit.status.size} (event, asset) pairs, window={estimation_window}, gap={estimation_gap}"
+        )
+        return event_params
+    
     def calculate_abnormal_returns(
         self,
         returns_data: pd.DataFrame,
         market_returns: pd.Series,
         model_params: Dict[str, Dict[str, float]],
-        event_windows: List[Tuple[datetime, datetime]]
+        event_windows: List[Tuple[datetime, datetime]],
+        event_model_params: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Calculate abnormal returns for event windows.
@@ -191,6 +234,9 @@ class EventStudyAnalyzer:
             market_returns: Series with market returns
             model_params: Model parameters from estimation
             event_windows: List of (start, end) event windows
+            event_model_params: Event-specific parameters by event name
+                (``estimate_event_normal_returns``), used instead of
+                ``model_params`` for those events
             
         Returns:
             Dictionary with abnormal returns for each event
@@ -199,6 +245,7 @@ class EventStudyAnalyzer:
         
         for i, (start_date, end_date) in enumerate(event_windows):
             asset_abnormal_returns: List[pd.Series] = []
+            params_by_asset = (event_model_params or {}).get(f'event_{i+1}', model_params)
             
             # Get returns in event window - use consistent index
             event_mask = (returns_data.index >= start_date) & (returns_data.index <= end_date)
@@ -211,8 +258,8 @@ class EventStudyAnalyzer:
             
             if not event_returns.empty and not event_market_returns.empty:
                 for asset in returns_data.columns:
-                    if asset in model_params and asset in event_returns.columns:
-                        params = model_params[asset]
+                    if asset in params_by_asset and asset in event_returns.columns:
+                        params = params_by_asset[asset]
                         alpha = params['alpha']
                         beta = params['beta']
                         
@@ -274,7 +321,8 @@ class EventStudyAnalyzer:
         self,
         abnormal_returns: Dict[str, pd.DataFrame],
         model_params: Dict[str, Dict[str, float]],
-        confidence_level: float = 0.05
+        confidence_level: float = 0.05,
+        event_model_params: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
     ) -> Dict[str, Dict[str, Dict[str, float]]]:
         """
         Test statistical significance of abnormal returns.
@@ -283,6 +331,8 @@ class EventStudyAnalyzer:
             abnormal_returns: Dictionary with abnormal returns
             model_params: Model parameters for standard error calculation
             confidence_level: Significance level for tests
+            event_model_params: Event-specific parameters by event name, used
+                instead of ``model_params`` for those events
             
         Returns:
             Dictionary with test statistics and p-values
@@ -291,20 +341,21 @@ class EventStudyAnalyzer:
         
         for event_name, ar_data in abnormal_returns.items():
             event_tests = {}
+            params_by_asset = (event_model_params or {}).get(event_name, model_params)
             
             for asset in ar_data.columns:
-                if asset in model_params:
+                if asset in params_by_asset:
                     ar_series = ar_data[asset].dropna()
                     
                     if len(ar_series) > 0:
                         # Use residual standard error from estimation
-                        std_error = model_params[asset]['residual_std']
+                        std_error = params_by_asset[asset]['residual_std']
                         
                         # Calculate test statistics for each day
                         t_stats = ar_series / std_error
                         # stats.t.cdf returns a numpy array; wrap it back to Series to preserve index
                         p_vals_array = 2 * (
-                            1 - stats.t.cdf(np.abs(t_stats.values), df=model_params[asset]['n_observations'] - 2)
+                            1 - stats.t.cdf(np.abs(t_stats.values), df=params_by_asset[asset]['n_observations'] - 2)
                         )
                         p_values = pd.Series(p_vals_array, index=ar_series.index)
                         
@@ -319,7 +370,7 @@ class EventStudyAnalyzer:
                         else:
                             car_t_stat = car_total / car_std_error
                             car_p_value = 2 * (1 - stats.t.cdf(np.abs(car_t_stat),
-                                                              df=model_params[asset]['n_observations']-2))
+                                                              df=params_by_asset[asset]['n_observations']-2))
                         
                         event_tests[asset] = {
                             'daily_t_stats': t_stats.to_dict(),
@@ -384,34 +435,54 @@ class EventStudyAnalyzer:
     
     def analyze_events(
         self,
-        aligned_data: pd.DataFrame,
+        aligned_data: Union[pd.DataFrame, StageHandoff],
         sample_events: List[datetime],
         event_window_days: int = 3,
-        estimation_window: int = 250
+        estimation_window: int = 250,
+        returns_panel: Optional[ReturnsPanel] = None,
+        calendar: Optional[Union[str, TradingCalendar]] = None,
+        estimation_mode: str = 'pooled',
+        estimation_gap: int = 0
     ) -> Dict[str, any]:
         """
         Analyze events using the aligned data.
         
         Args:
-            aligned_data: DataFrame with aligned asset data
+            aligned_data: DataFrame with aligned asset data, or a StageHandoff
+                from which only the candidate price columns are taken
             sample_events: List of event dates
             event_window_days: Days around event (±days)
             estimation_window: Days for model estimation
+            returns_panel: Shared returns panel of the run; None computes
+                returns on a local panel
+            calendar: Trading calendar for the event and estimation windows
+                (see ``run_full_event_study``); None uses calendar days
+            estimation_mode: 'pooled' or 'event' (see ``run_full_event_study``)
+            estimation_gap: Gap before each event's estimation window ('event' mode)
             
         Returns:
             Dictionary with event study results
         """
+        # Find price columns by excluding volume, return, volatility and other derived columns
+        excluded_tokens = ['volume', '_return', '_volatility', 'surprise', 'lag', 'dummy', 'unrate', 'payems', 'civpart', 'cpiaucsl', 'cpilfesl', 'pcepi', 'pcepilfe']
+        candidate_columns = [
+            col for col in aligned_data.columns
+            if not any(suffix in col.lower() for suffix in excluded_tokens)
+        ]
+        
+        # Take only the candidate columns from a stage handoff (column views, no copy)
+        if isinstance(aligned_data, StageHandoff):
+            aligned_data = aligned_data.select(candidate_columns, consumer='event_study')
+        
         self.logger.info(f"Analyzing {len(sample_events)} events")
         self.logger.info(f"Data shape: {aligned_data.shape}")
         self.logger.info(f"Available columns: {list(aligned_data.columns)}")
         
-        # Find price columns by excluding volume, return, volatility and other derived columns
         price_columns = []
-        for col in aligned_data.columns:
-            if not any(suffix in col.lower() for suffix in ['volume', '_return', '_volatility', 'surprise', 'lag', 'dummy', 'unrate', 'payems', 'civpart', 'cpiaucsl', 'cpilfesl', 'pcepi', 'pcepilfe']):
-                # Check if column has sufficient non-null data
-                if aligned_data[col].notna().sum() > 100:  # At least 100 observations
-                    price_columns.append(col)
+        for col in candidate_columns:
+            # Check if column has sufficient non-null data
+            if aligned_data[col].notna().sum() > 100:  # At least 100 observations
+                price_columns.append(col)
         
         self.logger.info(f"Selected price columns: {price_columns}")
         
@@ -429,12 +500,12 @@ class EventStudyAnalyzer:
                 # Create synthetic data for demonstration purposes (ONLY when explicitly allowed)
                 return self._create_synthetic_event_study_results()
         
-        # Calculate returns from prices
+        # Returns from prices (read from the shared panel)
+        panel = ReturnsPanel.for_data(aligned_data, returns_panel)
         returns_dict = {}
         for col in price_columns:
-            prices = aligned_data[col].dropna()
-            if len(prices) > 10:  # Need minimum data points
-                returns = prices.pct_change().dropna()
+            if aligned_data[col].notna().sum() > 10:  # Need minimum data points
+                returns = panel.series(col)
                 # Remove extreme outliers (>20% daily change) - likely data errors, but be less aggressive
                 returns = returns[np.abs(returns) < 0.20]
                 returns_dict[col] = returns
@@ -498,7 +569,10 @@ class EventStudyAnalyzer:
             market_returns=market_returns,
             announcement_times=sample_events,
             event_window_days=event_window_days,
-            estimation_window=estimation_window
+            estimation_window=estimation_window,
+            calendar=calendar,
+            estimation_mode=estimation_mode,
+            estimation_gap=estimation_gap
         )
         
         return results
@@ -509,7 +583,10 @@ class EventStudyAnalyzer:
         market_returns: pd.Series,
         announcement_times: List[datetime],
         event_window_days: int = 3,
-        estimation_window: int = 250
+        estimation_window: int = 250,
+        calendar: Optional[Union[str, TradingCalendar]] = None,
+        estimation_mode: str = 'pooled',
+        estimation_gap: int = 0
     ) -> Dict[str, any]:
         """
         Run complete event study analysis.
@@ -520,27 +597,71 @@ class EventStudyAnalyzer:
             announcement_times: List of announcement times
             event_window_days: Days around announcement (±days)
             estimation_window: Days for model estimation
+            calendar: Trading calendar ('nyse', 'crypto', 'fx' or a
+                TradingCalendar); event and estimation windows are then
+                counted in sessions instead of calendar days/observations.
+                'by_asset_class' runs the study per calendar of the assets'
+                classes (``calendar_for_column``) and merges the results by
+                asset; 'event_windows' then spans every calendar's window of
+                each event and 'calendar_event_windows' holds them by calendar name
+            estimation_mode: 'pooled' (one model per asset over the trailing
+                window, shared by all events) or 'event' (one model per event
+                and asset over the window ending before that event)
+            estimation_gap: Observations (sessions) between each event's
+                estimation window and its event window ('event' mode)
             
         Returns:
             Dictionary with complete results
         """
+        if estimation_mode not in ESTIMATION_MODES:
+            raise ValueError(f"Estimation mode must be one of {ESTIMATION_MODES}, got '{estimation_mode}'")
+        groups = self._calendar_groups(returns_data.columns, calendar)
+        if len(groups) > 1:
+            # One study per calendar (e.g. crypto on calendar days, equities on NYSE sessions)
+            group_results = {
+                group_calendar.name: self.run_full_event_study(
+                    returns_data[columns], market_returns, announcement_times, event_window_days,
+                    estimation_window, calendar=group_calendar, estimation_mode=estimation_mode,
+                    estimation_gap=estimation_gap
+                )
+                for group_calendar, columns in groups
+            }
+            return self._merge_calendar_results(group_results, groups, list(returns_data.columns))
+        calendar = groups[0][0] if groups else None
         self.logger.info(f"Running event study for {len(announcement_times)} events")
         
         # Create event windows
-        event_windows = []
-        for announce_time in announcement_times:
-            start_date = announce_time - pd.Timedelta(days=event_window_days)
-            end_date = announce_time + pd.Timedelta(days=event_window_days)
-            event_windows.append((start_date, end_date))
+        if calendar is not None and len(announcement_times):
+            # ±event_window_days sessions around each announcement's session, in one lookup
+            calendar = get_calendar(calendar)
+            starts, ends = calendar.window(announcement_times, event_window_days, event_window_days)
+            if returns_data.index.tz is not None:
+                starts = starts.tz_localize(returns_data.index.tz)
+                ends = ends.tz_localize(returns_data.index.tz)
+            event_windows = list(zip(starts, ends))
+        else:
+            event_windows = []
+            for announce_time in announcement_times:
+                start_date = announce_time - pd.Timedelta(days=event_window_days)
+                end_date = announce_time + pd.Timedelta(days=event_window_days)
+                event_windows.append((start_date, end_date))
         
         # Step 1: Estimate normal return models
         model_params = self.estimate_normal_returns(
-            returns_data, market_returns, estimation_window, event_windows
+            returns_data, market_returns, estimation_window, event_windows, calendar=calendar
         )
+        event_model_params = None
+        if estimation_mode == 'event' and event_windows:
+            # Per-event models; the pooled ones cover events with too little data
+            event_model_params = self.estimate_event_normal_returns(
+                returns_data, market_returns, event_windows, estimation_window,
+                estimation_gap=estimation_gap, calendar=calendar, fallback_params=model_params
+            )
         
         # Step 2: Calculate abnormal returns
         abnormal_returns = self.calculate_abnormal_returns(
-            returns_data, market_returns, model_params, event_windows
+            returns_data, market_returns, model_params, event_windows,
+            event_model_params=event_model_params
         )
         
         # Step 3: Calculate cumulative abnormal returns
@@ -548,7 +669,7 @@ class EventStudyAnalyzer:
         
         # Step 4: Test significance
         significance_tests = self.test_abnormal_returns_significance(
-            abnormal_returns, model_params
+            abnormal_returns, model_params, event_model_params=event_model_params
         )
         
         # Step 5: Calculate averages
@@ -571,13 +692,93 @@ class EventStudyAnalyzer:
                 'n_events': len(event_windows),
                 'n_assets': len(returns_data.columns),
                 'estimation_window': estimation_window,
-                'event_window_days': event_window_days
+                'event_window_days': event_window_days,
+                'calendar': calendar.name if isinstance(calendar, TradingCalendar) else calendar,
+                'estimation_mode': estimation_mode,
+                'estimation_gap': estimation_gap if estimation_mode == 'event' else None
             }
         }
         
+        if event_model_params is not None:
+            results['event_model_parameters'] = event_model_params
+        
         self.logger.info("Event study analysis completed")
         return results
     
+    def _calendar_groups(
+        self,
+        columns: Sequence[str],
+        calendar: Optional[Union[str, TradingCalendar]]
+    ) -> List[Tuple[Optional[Union[str, TradingCalendar]], List[str]]]:
+        """Assets by trading calendar: one group, or one per asset-class calendar with 'by_asset_class'."""
+        if not (isinstance(calendar, str) and calendar.lower() == BY_ASSET_CLASS):
+            return [(calendar, list(columns))]
+        groups: Dict[str, Tuple[TradingCalendar, List[str]]] = {}
+        for col in columns:
+            asset_calendar = calendar_for_column(col)
+            groups.setdefault(asset_calendar.name, (asset_calendar, []))[1].append(col)
+        return list(groups.values())
+    
+    def _merge_calendar_results(
+        self,
+        group_results: Dict[str, Dict[str, any]],
+        groups: List[Tuple[TradingCalendar, List[str]]],
+        assets: List[str]
+    ) -> Dict[str, any]:
+        """Merge event studies run per trading calendar into one result keyed by asset."""
+        def by_event(key: str) -> Dict[str, list]:
+            parts: Dict[str, list] = {}
+            for result in group_results.values():
+                for event_name, value in (result.get(key) or {}).items():
+                    parts.setdefault(event_name, []).append(value)
+            return dict(sorted(parts.items(), key=lambda item: int(item[0].split('_')[-1])))
+        
+        def asset_frame(frames: List[pd.DataFrame]) -> pd.DataFrame:
+            frame = pd.concat(frames, axis=1)
+            return frame[[asset for asset in assets if asset in frame.columns]]
+        
+        def merge_assets(parts) -> Dict[str, any]:
+            return {asset: value for part in parts for asset, value in part.items()}
+        
+        abnormal_returns = {name: asset_frame(frames) for name, frames in by_event('abnormal_returns').items()}
+        cars = {name: asset_frame(frames) for name, frames in by_event('cumulative_abnormal_returns').items()}
+        
+        first = next(iter(group_results.values()))
+        summaries = [result['summary_statistics'] for result in group_results.values()]
+        results = {
+            'model_parameters': merge_assets(result['model_parameters'] for result in group_results.values()),
+            'abnormal_returns': abnormal_returns,
+            'cumulative_abnormal_returns': cars,
+            'significance_tests': {name: merge_assets(parts) for name, parts in by_event('significance_tests').items()},
+            'average_abnormal_returns': pd.concat(
+                [result['average_abnormal_returns'] for result in group_results.values()], axis=1
+            ),
+            'average_cumulative_abnormal_returns': pd.concat(
+                [result['average_cumulative_abnormal_returns'] for result in group_results.values()], axis=1
+            ),
+            'event_windows': [
+                (min(start for start, _ in windows), max(end for _, end in windows))
+                for windows in zip(*(result['event_windows'] for result in group_results.values()))
+            ],
+            'calendar_event_windows': {name: result['event_windows'] for name, result in group_results.items()},
+            # From each calendar's own CARs: the merged frames span the union of the
+            # calendars' dates, so their last row misses windows that end earlier
+            'summary_statistics': {
+                asset: summary[asset] for asset in assets for summary in summaries if asset in summary
+            },
+            'provenance': dict(
+                first['provenance'],
+                n_assets=len(assets),
+                calendar=BY_ASSET_CLASS,
+                asset_calendars={asset: group_calendar.name for group_calendar, columns in groups for asset in columns}
+            )
+        }
+        if 'event_model_parameters' in first:
+            results['event_model_parameters'] = {
+                name: merge_assets(parts) for name, parts in by_event('event_model_parameters').items()
+            }
+        return results
+    
     def _calculate_summary_statistics(
         self,
         abnormal_returns: Dict[str, pd.DataFrame],
@@ -11,12 +11,23 @@ Key improvements:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+import warnings
 import statsmodels.api as sm
 from statsmodels.stats.sandwich_covariance import cov_hac
 from statsmodels.regression.linear_model import OLS
 from scipy import stats
 import logging
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.rolling import rolling_quantile
+
+WINSORIZE_MODES = ('full', 'expanding', 'rolling')
 
 class ImprovedStatisticalInference:
     """Improved statistical methods with proper robust inference."""
@@ -456,6 +467,93 @@ class WinsorizeAndRobustness:
         
         return winsorized
     
+    def winsorize_panel(
+        self,
+        data: pd.DataFrame,
+        lower_percentile: float = 0.01,
+        upper_percentile: float = 0.99,
+        mode: str = 'full',
+        window: Optional[int] = None,
+        min_periods: Optional[int] = None,
+        inplace: bool = False
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Winsorize every numeric column of a panel at once.
+        
+        Bounds are the column quantiles of the full sample ('full', as in
+        ``winsorize``), or, free of look-ahead, of all observations up to and
+        including each date ('expanding') or of the trailing ``window`` rows
+        ('rolling'). Rolling and expanding quantiles of all columns come from
+        one pass of the skiplist quantile engine per bound.
+        
+        Args:
+            data: DataFrame (dates x series); non-numeric columns pass through
+            lower_percentile: Lower bound quantile (e.g., 0.01 for 1%)
+            upper_percentile: Upper bound quantile (e.g., 0.99 for 99%)
+            mode: 'full', 'expanding' or 'rolling'
+            window: Window length in rows (required for 'rolling')
+            min_periods: Valid observations needed before a date's bounds
+                apply (default ``window`` for 'rolling', 30 for 'expanding');
+                earlier values are left unclipped
+            inplace: Write the clipped values into ``data`` instead of a copy
+            
+        Returns:
+            Tuple of (winsorized DataFrame, per-column report with the number
+            of valid observations, values clipped at each bound and the clip rate)
+        """
+        if mode not in WINSORIZE_MODES:
+            raise ValueError(f"Mode must be one of {WINSORIZE_MODES}, got '{mode}'")
+        if mode == 'rolling' and not window:
+            raise ValueError("Rolling winsorization needs a window")
+        
+        columns = data.select_dtypes(include=[np.number]).columns
+        values = data[columns].to_numpy(dtype=float)
+        
+        if mode == 'full':
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                lower, upper = np.nanquantile(values, [lower_percentile, upper_percentile], axis=0)
+        else:
+            if mode == 'expanding':
+                window = max(len(values), 1)
+                min_periods = 30 if min_periods is None else min_periods
+            bounds = rolling_quantile(
+                values, int(window), (lower_percentile, upper_percentile),
+                min_periods=min(min_periods or window, window)
+            )
+            lower, upper = bounds[..., 0], bounds[..., 1]
+        
+        # Clip in place on the float block; NaN bounds and values never compare true
+        lower = np.broadcast_to(lower, values.shape)
+        upper = np.broadcast_to(upper, values.shape)
+        with np.errstate(invalid='ignore'):
+            below = values < lower
+            above = values > upper
+        np.copyto(values, lower, where=below)
+        np.copyto(values, upper, where=above)
+        
+        n_valid = (~np.isnan(values)).sum(axis=0)
+        report = pd.DataFrame({
+            'n_valid': n_valid,
+            'n_lower': below.sum(axis=0),
+            'n_upper': above.sum(axis=0)
+        }, index=columns)
+        report['clip_rate'] = (report['n_lower'] + report['n_upper']) / np.maximum(n_valid, 1)
+        
+        result = data if inplace else data.copy()
+        changed = columns[(below | above).any(axis=0)]
+        if len(changed):
+            positions = columns.get_indexer(changed)
+            result[changed] = pd.DataFrame(values[:, positions], index=data.index, columns=changed)
+        
+        n_clipped = int(report['n_lower'].sum() + report['n_upper'].sum())
+        self.logger.info(
+            f"Winsorized {n_clipped} obs in {len(changed)} of {len(columns)} columns "
+            f"({mode}, {lower_percentile}, {upper_percentile}); "
+            f"max clip rate {report['clip_rate'].max() * 100 if len(report) else 0.0:.1f}%"
+        )
+        return result, report
+    
     def placebo_test(
         self,
         data: pd.DataFrame,
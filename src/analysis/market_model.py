@@ -0,0 +1,422 @@
+"""
+Batched market-model estimation for all assets at once.
+
+The market model ``r_{i,t} = alpha_i + beta_i * m_t + e_{i,t}`` used to be
+fitted asset by asset: intersect indexes, mask every event window in a
+Python loop, then call ``np.linalg.lstsq``. ``fit_market_model`` instead
+builds one exclusion mask for all event windows (two ``searchsorted`` calls
+and a difference array), one (dates x assets) mask of the estimation
+sample of every asset, and solves all the regressions together from masked
+sufficient statistics (counts, means and cross-products of mean-shifted
+returns, as matrix products with the shared market series). The fit is
+returned as arrays aligned with the assets.
+
+``fit_event_market_models`` fits a separate model per (event, asset) over
+an estimation window ending before each event (optionally ``gap`` rows
+earlier), each in O(1) from prefix sums of the masked moments.
+
+Example:
+    fit = fit_market_model(returns, market, estimation_window=250, exclude_event_windows=windows)
+    fit.beta, fit.residual_std, fit.n_observations
+    per_event = fit_event_market_models(returns, market, windows, estimation_window=120, gap=10)
+    per_event.beta                 # (events x assets)
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.calendars import TradingCalendar, get_calendar
+
+# Outcome of each asset's estimation
+ESTIMATED = 'estimated'
+SHORT_OVERLAP = 'short_overlap'            # too few dates shared with the market
+INSUFFICIENT_DATA = 'insufficient_data'    # estimation window too short
+INSUFFICIENT_CLEAN = 'insufficient_clean'  # too few dates with a valid market return
+
+
+class MarketModelFit:
+    """Market-model estimates of several assets as arrays (one entry per asset)."""
+
+    def __init__(
+        self,
+        assets: Sequence[str],
+        alpha: np.ndarray,
+        beta: np.ndarray,
+        r_squared: np.ndarray,
+        residual_std: np.ndarray,
+        n_observations: np.ndarray,
+        status: np.ndarray,
+        n_common: Optional[np.ndarray] = None,
+        n_available: Optional[np.ndarray] = None,
+        events: Optional[pd.DatetimeIndex] = None
+    ):
+        """
+        Args:
+            assets: Asset names
+            alpha: Intercepts (NaN where not estimated)
+            beta: Market betas (NaN where not estimated)
+            r_squared: Coefficients of determination, floored at zero
+            residual_std: Residual standard deviations (ddof=0)
+            n_observations: Observations used in each regression
+            status: Outcome per asset (``ESTIMATED``, ``SHORT_OVERLAP``,
+                ``INSUFFICIENT_DATA`` or ``INSUFFICIENT_CLEAN``)
+            n_common: Dates where the asset and the market index overlap
+            n_available: Dates in each asset's estimation window
+            events: Event window starts for event-specific fits, whose arrays
+                are (events x assets) instead of (assets,)
+        """
+        self.assets = list(assets)
+        self.alpha = alpha
+        self.beta = beta
+        self.r_squared = r_squared
+        self.residual_std = residual_std
+        self.n_observations = n_observations
+        self.status = status
+        self.n_common = n_common
+        self.n_available = n_available
+        self.events = pd.DatetimeIndex(events) if events is not None else None
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    @property
+    def estimated(self) -> np.ndarray:
+        """Boolean array, True where the regression was estimated."""
+        return self.status == ESTIMATED
+
+    def to_frame(self) -> pd.DataFrame:
+        """Estimates as a DataFrame indexed by asset (by event and asset for event fits)."""
+        if self.events is None:
+            index = pd.Index(self.assets, name='asset')
+        else:
+            index = pd.MultiIndex.from_product([self.events, self.assets], names=['event', 'asset'])
+        return pd.DataFrame({
+            'alpha': np.ravel(self.alpha),
+            'beta': np.ravel(self.beta),
+            'r_squared': np.ravel(self.r_squared),
+            'residual_std': np.ravel(self.residual_std),
+            'n_observations': np.ravel(self.n_observations),
+            'status': np.ravel(self.status)
+        }, index=index)
+
+    def __repr__(self) -> str:
+        events = '' if self.events is None else f"events={len(self.events)}, "
+        return f"MarketModelFit({events}assets={len(self)}, estimated={int(self.estimated.sum())})"
+
+
+def _as_index_timestamps(index: pd.DatetimeIndex, dates) -> pd.DatetimeIndex:
+    """``dates`` in the timezone convention of ``index``."""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is None and index.tz is not None:
+        return dates.tz_localize(index.tz)
+    if dates.tz is not None and index.tz is None:
+        return dates.tz_convert(None)
+    if dates.tz is not None:
+        return dates.tz_convert(index.tz)
+    return dates
+
+
+def exclusion_mask(
+    index: pd.DatetimeIndex,
+    windows: Optional[List[Tuple[pd.Timestamp, pd.Timestamp]]]
+) -> np.ndarray:
+    """
+    Boolean array over a sorted ``index``, True inside any ``[start, end]`` window.
+
+    All windows are placed with two ``searchsorted`` calls and merged with a
+    difference array, so overlapping windows cost nothing extra.
+    """
+    excluded = np.zeros(len(index), dtype=bool)
+    if not windows or not len(index):
+        return excluded
+    starts = _as_index_timestamps(index, [start for start, _ in windows])
+    ends = _as_index_timestamps(index, [end for _, end in windows])
+    first = index.searchsorted(starts, side='left')
+    last = index.searchsorted(ends, side='right')
+    delta = np.zeros(len(index) + 1, dtype=np.int64)
+    np.add.at(delta, first, 1)
+    np.add.at(delta, last, -1)
+    return np.cumsum(delta[:-1]) > 0
+
+
+def _fit_from_sums(
+    n: np.ndarray,
+    sum_x: np.ndarray,
+    sum_y: np.ndarray,
+    sum_xx: np.ndarray,
+    sum_yy: np.ndarray,
+    sum_xy: np.ndarray,
+    shift_x: Union[float, np.ndarray] = 0.0,
+    shift_y: Union[float, np.ndarray] = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Simple-regression estimates from sums of (shifted) x, y and their products.
+
+    ``shift_x`` and ``shift_y`` are the constants subtracted from x and y
+    before summing (the slope and the residuals do not depend on them).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = sum_x / n
+        mean_y = sum_y / n
+        sxx = np.clip(sum_xx - sum_x * mean_x, 0.0, None)
+        syy = np.clip(sum_yy - sum_y * mean_y, 0.0, None)
+        sxy = sum_xy - sum_x * mean_y
+
+        beta = np.where(sxx > 0, sxy / sxx, 0.0)
+        alpha = mean_y + shift_y - beta * (mean_x + shift_x)
+        ssr = np.clip(syy - beta * sxy, 0.0, None)
+        residual_std = np.sqrt(ssr / n)
+        r_squared = np.where(syy > 0, np.clip(1 - ssr / syy, 0.0, None), 0.0)
+
+    enough = n >= 2
+    return {
+        'n': np.asarray(np.rint(n), dtype=np.int64),
+        'alpha': np.where(enough, alpha, np.nan),
+        'beta': np.where(enough, beta, np.nan),
+        'r_squared': np.where(enough, r_squared, np.nan),
+        'residual_std': np.where(enough, residual_std, np.nan)
+    }
+
+
+def masked_ols(y: np.ndarray, x: np.ndarray, mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Simple regressions of every column of ``y`` on ``x`` over masked rows.
+
+    Args:
+        y: Dependent variables (dates x assets), NaN allowed outside ``mask``
+        x: Regressor (dates,) or (dates x assets), NaN allowed outside ``mask``
+        mask: Boolean (dates x assets), rows used by each regression
+
+    Returns:
+        Dictionary of arrays (one entry per asset): 'n', 'alpha', 'beta',
+        'r_squared' (floored at zero, 0 without variance) and 'residual_std'
+        (ddof=0); NaN where fewer than two rows are used
+    """
+    weights = mask.astype(float)
+    n = weights.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if x.ndim == 1:
+            # Shared regressor: cross-products as matrix products, on values
+            # shifted by the overall means (for accuracy)
+            shift_x = np.nanmean(x) if np.isfinite(x).any() else 0.0
+            shift_y = np.where(n > 0, np.where(mask, y, 0.0).sum(axis=0) / n, 0.0)
+            xc = np.where(np.isnan(x), 0.0, x - shift_x)
+            yc = np.where(mask, y - shift_y, 0.0)
+            return _fit_from_sums(
+                n, xc @ weights, yc.sum(axis=0), (xc * xc) @ weights,
+                np.einsum('ij,ij->j', yc, yc), xc @ yc, shift_x, shift_y
+            )
+
+        shift_x = np.where(n > 0, np.where(mask, x, 0.0).sum(axis=0) / n, 0.0)
+        shift_y = np.where(n > 0, np.where(mask, y, 0.0).sum(axis=0) / n, 0.0)
+    xc = np.where(mask, x - shift_x, 0.0)
+    yc = np.where(mask, y - shift_y, 0.0)
+    return _fit_from_sums(
+        n, xc.sum(axis=0), yc.sum(axis=0), (xc * xc).sum(axis=0),
+        (yc * yc).sum(axis=0), (xc * yc).sum(axis=0), shift_x, shift_y
+    )
+
+
+def _estimation_window(
+    kept: np.ndarray,
+    index: pd.DatetimeIndex,
+    estimation_window: int,
+    calendar: Optional[TradingCalendar]
+) -> np.ndarray:
+    """Per asset, the kept rows within the estimation window ending at its last kept row."""
+    if calendar is None:
+        # The last ``estimation_window`` kept rows
+        from_end = np.cumsum(kept[::-1], axis=0, dtype=np.int32)[::-1]
+        return kept & (from_end <= estimation_window)
+
+    # Rows on or after the session ``estimation_window - 1`` sessions before the last kept row
+    has_rows = kept.any(axis=0)
+    last_rows = len(index) - 1 - np.argmax(kept[::-1], axis=0)
+    positions = calendar.session_position(index[last_rows[has_rows]], 'backward')
+    firsts = calendar.sessions[np.maximum(positions - estimation_window + 1, 0)]
+    if index.tz is not None:
+        firsts = firsts.tz_localize(index.tz)
+    first_ns = np.full(kept.shape[1], np.iinfo(np.int64).max)
+    first_ns[has_rows] = firsts.as_unit('ns').asi8
+    return kept & (index.as_unit('ns').asi8[:, None] >= first_ns[None, :])
+
+
+def fit_market_model(
+    returns_data: pd.DataFrame,
+    market_returns: pd.Series,
+    estimation_window: int = 100,
+    exclude_event_windows: Optional[List[Tuple[pd.Timestamp, pd.Timestamp]]] = None,
+    calendar: Optional[Union[str, TradingCalendar]] = None,
+    min_window_obs: int = 15,
+    min_clean_obs: int = 10
+) -> MarketModelFit:
+    """
+    Fit the market model of every asset in one batch.
+
+    Per asset, the sample is the dates where the asset has a return and the
+    market index has a date, outside all event windows; the estimation
+    window is its last ``estimation_window`` dates (or, with a calendar, the
+    dates within the last ``estimation_window`` sessions), and the
+    regression uses the window's dates with a valid market return.
+
+    Args:
+        returns_data: Asset returns (dates x assets) on a DatetimeIndex
+        market_returns: Market returns
+        estimation_window: Observations (or sessions) in the estimation window
+        exclude_event_windows: (start, end) windows removed from the sample
+        calendar: Trading calendar ('nyse', 'crypto', 'fx' or a
+            TradingCalendar) in whose sessions the window is counted
+        min_window_obs: The window needs more than this many dates
+        min_clean_obs: The regression needs more than this many dates
+
+    Returns:
+        MarketModelFit with one entry per column of ``returns_data``
+    """
+    if not returns_data.index.is_monotonic_increasing:
+        returns_data = returns_data.sort_index()
+    index = pd.DatetimeIndex(returns_data.index)
+    calendar = get_calendar(calendar) if calendar is not None else None
+    y = returns_data.to_numpy(dtype=float)
+    n_assets = y.shape[1]
+
+    market = market_returns[~market_returns.index.duplicated(keep='last')]
+    in_market = index.isin(market.index)
+    x = market.reindex(index).to_numpy(dtype=float)
+
+    valid = ~np.isnan(y)
+    common = valid & in_market[:, None]
+    n_common = common.sum(axis=0)
+    # Adaptive minimum overlap
+    min_required = np.maximum(10, np.minimum(30, valid.sum(axis=0) // 3))
+    short_overlap = n_common < min_required
+
+    kept = common & ~exclusion_mask(index, exclude_event_windows)[:, None]
+    in_window = _estimation_window(kept, index, int(estimation_window), calendar)
+    n_available = in_window.sum(axis=0)
+    clean = in_window & ~np.isnan(x)[:, None]
+
+    ols = masked_ols(y, x, clean)
+    status = np.full(n_assets, ESTIMATED, dtype=object)
+    status[ols['n'] <= min_clean_obs] = INSUFFICIENT_CLEAN
+    status[n_available <= min_window_obs] = INSUFFICIENT_DATA
+    status[short_overlap] = SHORT_OVERLAP
+
+    estimated = status == ESTIMATED
+    n_observations = np.where(estimated, ols['n'], 0)
+    n_observations[short_overlap] = n_common[short_overlap]
+    return MarketModelFit(
+        returns_data.columns,
+        alpha=np.where(estimated, ols['alpha'], np.nan),
+        beta=np.where(estimated, ols['beta'], np.nan),
+        r_squared=np.where(estimated, ols['r_squared'], np.nan),
+        residual_std=np.where(estimated, ols['residual_std'], np.nan),
+        n_observations=n_observations,
+        status=status,
+        n_common=n_common,
+        n_available=n_available
+    )
+
+
+def fit_event_market_models(
+    returns_data: pd.DataFrame,
+    market_returns: pd.Series,
+    event_windows: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    estimation_window: int = 250,
+    gap: int = 0,
+    exclude_event_windows: Optional[List[Tuple[pd.Timestamp, pd.Timestamp]]] = None,
+    calendar: Optional[Union[str, TradingCalendar]] = None,
+    min_clean_obs: int = 10
+) -> MarketModelFit:
+    """
+    Fit a separate market model for every (event, asset) from prefix sums.
+
+    The estimation window of an event ends ``gap`` rows (sessions, with a
+    calendar) before the start of its event window and spans the
+    ``estimation_window`` rows (sessions) before that. Per asset, only
+    dates with an asset and a market return, outside ``exclude_event_windows``,
+    enter the regression. Prefix sums of the masked, mean-shifted r, m,
+    r·m, m² and r² make every (event, asset) fit O(1), whatever the number
+    of events.
+
+    Args:
+        returns_data: Asset returns (dates x assets) on a DatetimeIndex
+        market_returns: Market returns
+        event_windows: (start, end) event windows, one fit per window and asset
+        estimation_window: Rows (or sessions) in each estimation window
+        gap: Rows (or sessions) between the estimation and event windows
+        exclude_event_windows: (start, end) windows removed from every sample
+        calendar: Trading calendar ('nyse', 'crypto', 'fx' or a
+            TradingCalendar) in whose sessions the windows are counted
+        min_clean_obs: A fit needs more than this many dates
+
+    Returns:
+        MarketModelFit with (events x assets) arrays
+    """
+    if not returns_data.index.is_monotonic_increasing:
+        returns_data = returns_data.sort_index()
+    index = pd.DatetimeIndex(returns_data.index)
+    y = returns_data.to_numpy(dtype=float)
+    market = market_returns[~market_returns.index.duplicated(keep='last')]
+    x = market.reindex(index).to_numpy(dtype=float)
+    estimation_window, gap = int(estimation_window), int(gap)
+    if estimation_window < 1 or gap < 0:
+        raise ValueError(f"Need estimation_window >= 1 and gap >= 0, got {estimation_window} and {gap}")
+
+    # Estimation rows [first, last) of every event
+    starts = _as_index_timestamps(index, [start for start, _ in event_windows])
+    if calendar is None:
+        last = index.searchsorted(starts, side='left') - gap
+        first = last - estimation_window
+    else:
+        calendar = get_calendar(calendar)
+        last_dates = calendar.offset(starts, -gap)
+        first_dates = calendar.offset(starts, -(gap + estimation_window))
+        if index.tz is not None:
+            last_dates = last_dates.tz_localize(index.tz)
+            first_dates = first_dates.tz_localize(index.tz)
+        last = index.searchsorted(last_dates, side='left')
+        first = index.searchsorted(first_dates, side='left')
+    last = np.clip(last, 0, len(index))
+    first = np.clip(first, 0, last)
+
+    # Prefix sums of the masked moments (shifted by the sample means, for accuracy)
+    clean = ~np.isnan(y) & ~np.isnan(x)[:, None]
+    clean &= ~exclusion_mask(index, exclude_event_windows)[:, None]
+    weights = clean.astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        counts = weights.sum(axis=0)
+        shift_x = np.where(counts > 0, np.where(clean, x[:, None], 0.0).sum(axis=0) / counts, 0.0)
+        shift_y = np.where(counts > 0, np.where(clean, y, 0.0).sum(axis=0) / counts, 0.0)
+    xc = np.where(clean, x[:, None] - shift_x, 0.0)
+    yc = np.where(clean, y - shift_y, 0.0)
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        prefix = np.zeros((len(values) + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=prefix[1:])
+        return prefix[last] - prefix[first]
+
+    ols = _fit_from_sums(
+        window_sums(weights), window_sums(xc), window_sums(yc), window_sums(xc * xc),
+        window_sums(yc * yc), window_sums(xc * yc), shift_x, shift_y
+    )
+
+    status = np.where(ols['n'] > min_clean_obs, ESTIMATED, INSUFFICIENT_CLEAN).astype(object)
+    estimated = status == ESTIMATED
+    return MarketModelFit(
+        returns_data.columns,
+        alpha=np.where(estimated, ols['alpha'], np.nan),
+        beta=np.where(estimated, ols['beta'], np.nan),
+        r_squared=np.where(estimated, ols['r_squared'], np.nan),
+        residual_std=np.where(estimated, ols['residual_std'], np.nan),
+        n_observations=np.where(estimated, ols['n'], 0),
+        status=status,
+        n_available=np.broadcast_to((last - first)[:, None], status.shape),
+        events=starts
+    )
@@ -11,6 +11,16 @@ from statsmodels.stats.diagnostic import het_breuschpagan
 from statsmodels.stats.stattools import durbin_watson
 import logging
 import warnings
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.stage_handoff import StageHandoff
+from utils.returns_panel import ReturnsPanel
+from preprocessing.interactions import VirtualInteractions
 
 # Suppress statsmodels warnings to prevent "invalid value encountered" warnings
 warnings.filterwarnings('ignore', category=RuntimeWarning, message='.*invalid value encountered.*')
@@ -94,17 +104,25 @@ class RegressionAnalyzer:
     
     def run_pooled_regression(
         self,
-        aligned_data: pd.DataFrame,
+        aligned_data: Union[pd.DataFrame, StageHandoff],
         crypto_assets: List[str] = None,
-        stock_assets: List[str] = None
+        stock_assets: List[str] = None,
+        interactions: Optional[VirtualInteractions] = None,
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> Dict[str, any]:
         """
         Run pooled regression analysis on aligned data.
         
         Args:
-            aligned_data: DataFrame with aligned asset and economic data
+            aligned_data: DataFrame with aligned asset and economic data, or a
+                StageHandoff from which only price and surprise columns are taken
             crypto_assets: List of cryptocurrency asset names
             stock_assets: List of stock asset names
+            interactions: Virtual surprise x regime interactions; when given,
+                each asset also gets a regression on the interaction terms of
+                its surprise measures
+            returns_panel: Shared returns panel of the run; None computes
+                returns on a local panel
             
         Returns:
             Dictionary with regression results
@@ -118,7 +136,13 @@ class RegressionAnalyzer:
         price_columns = [col for col in aligned_data.columns 
                         if not any(suffix in col.lower() for suffix in ['_return', '_volatility', 'surprise', 'lag', 'dummy'])]
         
-        # Calculate returns from prices (limit to key assets)
+        # Take only price and surprise columns from a stage handoff (column views, no copy)
+        if isinstance(aligned_data, StageHandoff):
+            needed_columns = price_columns + [col for col in aligned_data.columns if 'surprise' in col.lower()]
+            aligned_data = aligned_data.select(needed_columns, consumer='regression')
+        
+        # Returns from prices (limit to key assets), read from the shared panel
+        panel = ReturnsPanel.for_data(aligned_data, returns_panel)
         returns_data = pd.DataFrame(index=aligned_data.index)
         processed_count = 0
         
@@ -127,9 +151,8 @@ class RegressionAnalyzer:
                 break
                 
             if col in aligned_data.columns:
-                prices = aligned_data[col].dropna()
-                if len(prices) > 100:  # Higher threshold for data quality
-                    returns = prices.pct_change().dropna()
+                if aligned_data[col].notna().sum() > 100:  # Higher threshold for data quality
+                    returns = panel.series(col)
                     if len(returns) > 50:
                         returns_data[col] = returns
                         processed_count += 1
@@ -217,6 +240,14 @@ class RegressionAnalyzer:
                                     except Exception as e:
                                         self.logger.debug(f"Regression failed for {asset} vs {surprise_col}: {e}")
                         
+                        # Surprise x regime interactions, expanded only in the design matrix
+                        if interactions is not None:
+                            terms = interactions.select([f"{col}_x_*" for col in surprise_columns])
+                            if len(terms):
+                                interaction_result = self.interaction_regression(asset_returns, terms)
+                                if interaction_result is not None:
+                                    asset_results['surprise_x_regime'] = interaction_result
+                        
                         if asset_results:
                             results[asset] = asset_results
                 
@@ -246,6 +277,97 @@ class RegressionAnalyzer:
         self.logger.info(f"Completed regression analysis for {len(results)} assets/models")
         return results
     
+    def build_design_matrix(
+        self,
+        data: pd.DataFrame,
+        columns: List[str],
+        interactions: Optional[VirtualInteractions] = None,
+        add_constant: bool = True
+    ) -> pd.DataFrame:
+        """
+        Build a regression design matrix, expanding virtual interaction terms.
+        
+        Args:
+            data: DataFrame with the base regressors
+            columns: Base regressor columns taken from ``data``
+            interactions: Interaction terms expanded as one broadcasted
+                product block on the rows of ``data``
+            add_constant: Prepend an intercept column
+            
+        Returns:
+            Design matrix indexed like ``data``
+        """
+        X = data[columns]
+        if interactions is not None and len(interactions):
+            block = pd.DataFrame(
+                interactions.product_block(data.index), index=data.index, columns=interactions.columns
+            )
+            X = pd.concat([X, block], axis=1)
+        if add_constant:
+            X = sm.add_constant(X, has_constant='add')
+        return X
+    
+    def interaction_regression(
+        self,
+        asset_returns: pd.Series,
+        interactions: VirtualInteractions
+    ) -> Optional[sm.regression.linear_model.RegressionResultsWrapper]:
+        """
+        Regress returns on surprises, regimes and their interactions.
+        
+        The surprise and regime main effects come from the interaction
+        object's own columns; the product terms are expanded only here.
+        Complementary regime dummies (e.g. high/low volatility, bull/bear
+        market) sum to one, which with the constant makes the design
+        perfectly collinear; the later dummy of each such pair is the
+        reference category and is dropped with its interaction terms.
+        
+        Args:
+            asset_returns: Return series of one asset
+            interactions: Interaction terms to include
+            
+        Returns:
+            OLS results with HC3 standard errors, or None if there is too little data
+        """
+        surprise_cols = sorted(set(interactions.pairs[:, 0]))
+        regime_cols = sorted(set(interactions.pairs[:, 1]))
+        base = pd.concat([
+            asset_returns.rename('return'),
+            interactions.surprise_data.iloc[:, surprise_cols],
+            interactions.regime_data.iloc[:, regime_cols]
+        ], axis=1, join='inner').replace([np.inf, -np.inf], np.nan).dropna()
+        
+        # Drop the reference dummy of each complementary pair (dummy-variable trap)
+        regimes = base[[interactions.regime_columns[r] for r in regime_cols]]
+        binary = [col for col in regimes.columns if regimes[col].isin([0, 1]).all()]
+        reference = []
+        for i, first in enumerate(binary):
+            if first in reference:
+                continue
+            reference += [
+                second for second in binary[i + 1:]
+                if second not in reference and (regimes[first] + regimes[second] == 1).all()
+            ]
+        if reference:
+            dropped = [interactions.regime_columns.index(col) for col in reference]
+            interactions = VirtualInteractions(
+                interactions.surprise_data, interactions.regime_data,
+                interactions.pairs[~np.isin(interactions.pairs[:, 1], dropped)]
+            )
+        
+        main_effects = [col for col in base.columns if col not in ['return'] + reference]
+        X = self.build_design_matrix(base, main_effects, interactions)
+        # Drop terms that never vary in the sample (e.g. a regime that never occurs)
+        X = X[[col for col in X.columns if col == 'const' or X[col].std() > 0]]
+        
+        if len(base) <= X.shape[1] + 10:
+            return None
+        try:
+            return sm.OLS(base['return'], X).fit(cov_type='HC3')
+        except Exception as e:
+            self.logger.debug(f"Interaction regression failed: {e}")
+            return None
+    
     def _calculate_regression_summary(self, results: Dict) -> Dict[str, Dict[str, float]]:
         """Calculate summary statistics from regression results."""
         summary = {}
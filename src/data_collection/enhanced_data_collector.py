@@ -19,6 +19,8 @@ src_path = Path(__file__).parent.parent
 sys.path.insert(0, str(src_path))
 
 from .base_collector import BaseDataCollector
+from utils.outliers import handle_outliers
+from utils.missing_data import MissingDataProfile
 
 # Suppress yfinance warnings
 warnings.filterwarnings("ignore", message=".*invalid value encountered in divide.*")
@@ -479,10 +481,17 @@ class DataQualityAnalyzer:
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.DataQualityAnalyzer")
+        self.missing_profile: Optional[MissingDataProfile] = None
     
     def comprehensive_data_analysis(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Perform comprehensive data quality analysis."""
+        """
+        Perform comprehensive data quality analysis.
+        
+        The missing-data profile of ``data`` is kept in ``self.missing_profile``
+        so that cleaning can reuse its validity mask.
+        """
         
+        self.missing_profile = MissingDataProfile(data)
         analysis = {
             'basic_stats': self._basic_statistics(data),
             'missing_data': self._missing_data_analysis(data),
@@ -516,56 +525,38 @@ class DataQualityAnalyzer:
         return stats
     
     def _missing_data_analysis(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze missing data patterns."""
-        
-        missing_analysis = {
-            'total_missing': data.isnull().sum().to_dict(),
-            'missing_percentage': (data.isnull().sum() / len(data) * 100).to_dict(),
-            'missing_patterns': {}
-        }
-        
-        # Identify patterns of missingness
-        missing_matrix = data.isnull()
-        for col in data.columns:
-            col_missing = missing_matrix[col]
-            if col_missing.sum() > 0:
-                # Find consecutive missing periods
-                missing_groups = col_missing.groupby((~col_missing).cumsum()).sum()
-                missing_analysis['missing_patterns'][col] = {
-                    'max_consecutive': missing_groups.max(),
-                    'avg_consecutive': missing_groups.mean(),
-                    'num_gaps': len(missing_groups[missing_groups > 0])
-                }
+        """Analyze missing data patterns (rates, gaps, structural starts) in one pass."""
         
-        return missing_analysis
+        profile = self.missing_profile
+        if profile is None or not (data.index.equals(profile.index) and data.columns.equals(profile.columns)):
+            profile = MissingDataProfile(data)
+        return profile.to_report()
     
     def _outlier_detection(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Detect outliers using multiple methods."""
+        """Detect outliers using multiple methods (all columns at once)."""
         
         outliers = {}
         
-        for col in data.select_dtypes(include=[np.number]).columns:
-            series = data[col].dropna()
-            if len(series) > 10:
-                # IQR method
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                iqr_outliers = series[(series < lower_bound) | (series > upper_bound)]
-                
-                # Z-score method
-                z_scores = np.abs((series - series.mean()) / series.std())
-                z_outliers = series[z_scores > 3]
-                
-                outliers[col] = {
-                    'iqr_outliers_count': len(iqr_outliers),
-                    'iqr_outliers_pct': len(iqr_outliers) / len(series) * 100,
-                    'z_outliers_count': len(z_outliers),
-                    'z_outliers_pct': len(z_outliers) / len(series) * 100
-                }
+        numeric = data.select_dtypes(include=[np.number])
+        valid_counts = numeric.notna().sum()
+        numeric = numeric.loc[:, valid_counts > 10]
+        if numeric.empty:
+            return outliers
+        
+        # IQR (1.5 x IQR fences) and z-score (|z| > 3) masks for every column
+        _, iqr_mask = handle_outliers(numeric, method='iqr', threshold=1.5, policy='flag')
+        _, z_mask = handle_outliers(numeric, method='zscore', threshold=3.0, policy='flag')
+        iqr_counts = iqr_mask.counts()
+        z_counts = z_mask.counts()
+        
+        for col in numeric.columns:
+            n_valid = valid_counts[col]
+            outliers[col] = {
+                'iqr_outliers_count': int(iqr_counts[col]),
+                'iqr_outliers_pct': iqr_counts[col] / n_valid * 100,
+                'z_outliers_count': int(z_counts[col]),
+                'z_outliers_pct': z_counts[col] / n_valid * 100
+            }
         
         return outliers
     
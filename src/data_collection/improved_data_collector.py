@@ -11,12 +11,20 @@ Key improvements:
 
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, timedelta
 import yfinance as yf
 import logging
+import sys
 from pathlib import Path
 
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.event_panel import EventPanel
+from utils.calendars import TradingCalendar, get_calendar
+
 class ImprovedDataCollector:
     """Enhanced data collector with proper methodology."""
     
@@ -343,16 +351,36 @@ class ImprovedDataCollector:
     def align_to_business_days(
         self,
         equity_data: pd.DataFrame,
-        crypto_data: pd.DataFrame
+        crypto_data: pd.DataFrame,
+        calendar: Optional[Union[str, TradingCalendar]] = None
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Align crypto data to equity business days for cross-asset analysis.
         
+        Args:
+            equity_data: Equity data on a daily index
+            crypto_data: Crypto data (trading every day)
+            calendar: Trading calendar ('nyse', 'fx' or a TradingCalendar)
+                defining the business days over the equity span; None uses
+                the dates present in ``equity_data``
+        
         Returns:
             Tuple of (aligned_equity, aligned_crypto) both on business day index
         """
-        # Get business day index from equity data
-        business_days = equity_data.index
+        if calendar is None:
+            # Get business day index from equity data
+            business_days = equity_data.index
+        else:
+            # Sessions of the calendar; equity gaps on sessions stay visible as NaN
+            calendar = get_calendar(calendar)
+            business_days = calendar.sessions_in(equity_data.index.min(), equity_data.index.max())
+            if equity_data.index.tz is not None:
+                business_days = business_days.tz_localize(equity_data.index.tz)
+            business_days = business_days.rename(equity_data.index.name)
+            missing = (~business_days.isin(equity_data.index)).sum()
+            if missing:
+                self.logger.warning(f"Equity data missing {missing} {calendar.name} sessions")
+            equity_data = equity_data.reindex(business_days)
         
         # Reindex crypto to business days, forward filling weekend values
         crypto_aligned = crypto_data.reindex(business_days, method='ffill')
@@ -368,14 +396,32 @@ class ImprovedDataCollector:
         data: Dict[str, pd.DataFrame],
         event_times: List[pd.Timestamp],
         window_hours_pre: int = 24,
-        window_hours_post: int = 24
-    ) -> Dict[str, pd.DataFrame]:
+        window_hours_post: int = 24,
+        as_panel: bool = False
+    ) -> Dict[str, Any]:
         """
         Create event-aligned dataset with proper timestamp handling.
         
         For intraday analysis, would use minute/hourly data.
         For daily analysis, aligns to next business day open.
+        
+        With ``as_panel=True`` each dataset becomes one EventPanel
+        (events x days_to_event x series) gathered in a single pass, keyed
+        like ``data``, instead of one small frame per event and dataset.
         """
+        if as_panel:
+            event_dates = pd.DatetimeIndex(event_times).normalize()
+            return {
+                key: EventPanel.by_time(
+                    df, event_dates,
+                    pre=pd.Timedelta(hours=window_hours_pre),
+                    post=pd.Timedelta(hours=window_hours_post),
+                    unit='1D'
+                )
+                for key, df in data.items()
+                if isinstance(df, pd.DataFrame) and not df.empty
+            }
+        
         event_windows = {}
         
         for i, event_time in enumerate(event_times):
@@ -4,8 +4,20 @@ Preprocessing package for data cleaning and feature engineering.
 
 from .data_preprocessor import DataPreprocessor
 from .feature_engineering import FeatureEngineer
+from .feature_registry import FeatureRegistry
+from .incremental_features import IncrementalFeatureState
+from .feature_pruning import FeaturePruner
+from .interactions import VirtualInteractions
+from .lag_tensor import LagTensor
+from .chunked_pipeline import ChunkedPipeline
 
 __all__ = [
     'DataPreprocessor',
-    'FeatureEngineer'
+    'FeatureEngineer',
+    'FeatureRegistry',
+    'IncrementalFeatureState',
+    'FeaturePruner',
+    'VirtualInteractions',
+    'LagTensor',
+    'ChunkedPipeline'
 ]
\ No newline at end of file
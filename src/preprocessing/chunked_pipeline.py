@@ -0,0 +1,577 @@
+"""
+Out-of-core, chunked preprocessing of long (e.g. 1-minute) price panels.
+
+``DataPreprocessor`` and ``FeatureEngineer`` work on one in-memory
+DataFrame, which does not fit once years of minute bars for dozens of
+symbols are kept. ``ChunkedPipeline`` streams time-ordered chunks through
+the same steps instead:
+
+1. cleaning (forward fill or row drop, then outlier treatment as in
+   ``DataPreprocessor.clean_price_data``),
+2. returns (as ``calculate_returns_and_volatility``: between consecutive
+   valid prices),
+3. rolling return and volatility features (as
+   ``FeatureEngineer.create_return_features`` and
+   ``create_volatility_features`` on log returns).
+
+Each step is a streaming stage that keeps what it needs from earlier chunks:
+windowed steps keep an overlap buffer of the last ``lookback`` input rows
+(the largest window) and, for centered windows, hold back the last
+``lookahead`` rows until the next chunk arrives; recursive steps (forward
+fill, returns, exponentially weighted volatility) carry their state. Steps
+that need whole-sample statistics get them from a first, cheap profiling
+pass over the source (column z-score moments and the valid-observation
+counts that decide feature eligibility), so the source is read twice.
+
+Results equal the in-memory run: exactly for cleaning and returns, and up to
+floating-point rounding for the rolling moments and z-score bounds.
+Outlier methods that need whole-sample quantiles ('modified_zscore',
+'iqr') and time interpolation are not available in chunked mode.
+
+Chunk sizes follow a memory budget: the pipeline runs on a small probe
+chunk, measures its peak allocation per row, and sizes chunks so that a
+chunk's peak stays within the budget (shrinking later chunks if one
+overshoots). Every chunk's memory is recorded in ``memory_budget``.
+
+Example:
+    pipeline = ChunkedPipeline(memory_budget_mb=256, outlier_method='rolling_mad')
+    pipeline.run(sorted(Path('data/minute').glob('*.csv')),
+                 sink=lambda name, chunk: chunk.to_csv(f'{name}.csv', mode='a'))
+"""
+
+import pandas as pd
+import numpy as np
+from abc import ABC, abstractmethod
+from scipy.signal import lfilter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+import logging
+import sys
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.memory_budget import MemoryBudget
+from utils.outliers import OutlierMask, outlier_bounds, apply_outlier_policy
+from utils.rolling import rolling_moments
+from .feature_engineering import _return_feature_block
+
+CHUNKED_OUTLIER_METHODS = ('zscore', 'rolling_mad', 'hampel')
+CHUNKED_CLEAN_METHODS = ('forward_fill', 'drop')
+
+Source = Union[pd.DataFrame, str, Path, List[Union[str, Path]], Callable[[], Iterable[pd.DataFrame]]]
+
+
+def _read_file(path: Union[str, Path]) -> pd.DataFrame:
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+class _Stage(ABC):
+    """
+    Streaming step over time-ordered chunks.
+
+    Output row ``t`` may depend on the ``lookback`` input rows before it and
+    the ``lookahead`` rows after it; ``push`` returns the rows that are
+    complete, ``flush`` the rest at the end of the stream.
+    """
+
+    lookback = 0
+    lookahead = 0
+
+    def __init__(self):
+        self.history: Optional[pd.DataFrame] = None
+        self.pending: Optional[pd.DataFrame] = None
+
+    @abstractmethod
+    def compute(self, buffer: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+        """Output for buffer rows ``[start, stop)``, given the whole buffer."""
+        pass
+
+    def _run(self, chunk: Optional[pd.DataFrame], final: bool) -> pd.DataFrame:
+        pieces = [piece for piece in (self.history, self.pending, chunk) if piece is not None and len(piece)]
+        if not pieces:
+            return pd.DataFrame()
+        buffer = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        start = 0 if self.history is None else len(self.history)
+        stop = len(buffer) if final else max(len(buffer) - self.lookahead, start)
+
+        output = self.compute(buffer, start, stop) if stop > start else buffer.iloc[0:0]
+        self.history = buffer.iloc[max(stop - self.lookback, 0):stop] if self.lookback else None
+        self.pending = buffer.iloc[stop:]
+        return output
+
+    def push(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        return self._run(chunk, final=False)
+
+    def flush(self) -> pd.DataFrame:
+        return self._run(None, final=True)
+
+
+class _ForwardFill(_Stage):
+    """Forward fill, carrying the last filled row across chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self.last: Optional[pd.DataFrame] = None
+
+    def compute(self, buffer, start, stop):
+        rows = buffer.iloc[start:stop]
+        filled = (rows if self.last is None else pd.concat([self.last, rows])).ffill().iloc[-len(rows):]
+        self.last = filled.iloc[[-1]]
+        return filled
+
+
+class _DropMissing(_Stage):
+    """Drop rows with any missing value."""
+
+    def compute(self, buffer, start, stop):
+        return buffer.iloc[start:stop].dropna()
+
+
+class _Outliers(_Stage):
+    """Outlier bounds and policy; records outlier positions in the stream's row space."""
+
+    def __init__(self, method: str, threshold: float, window: int, policy: str, zscore_bounds=None):
+        super().__init__()
+        self.method = method
+        self.threshold = threshold
+        self.window = window
+        self.policy = policy
+        self.zscore_bounds = zscore_bounds
+        if method == 'rolling_mad':
+            self.lookback = window - 1
+        elif method == 'hampel':
+            self.lookback = window // 2
+            self.lookahead = window - 1 - window // 2
+        self.rows: List[np.ndarray] = []
+        self.cols: List[np.ndarray] = []
+        self.index: List[pd.Index] = []
+        self.n_rows = 0
+
+    def compute(self, buffer, start, stop):
+        values = buffer.to_numpy(dtype=float)
+        if self.method == 'zscore':
+            lower, upper = self.zscore_bounds
+            values = values[start:stop]
+        else:
+            # Bounds over the buffer; every emitted row has its full window in it
+            lower, upper = outlier_bounds(values, self.method, self.threshold, self.window)
+            values, lower, upper = values[start:stop], lower[start:stop], upper[start:stop]
+        treated, mask = apply_outlier_policy(values, lower, upper, self.policy)
+
+        rows, cols = np.nonzero(mask)
+        self.rows.append(rows + self.n_rows)
+        self.cols.append(cols)
+        self.index.append(buffer.index[start:stop])
+        self.n_rows += stop - start
+        return pd.DataFrame(treated, index=buffer.index[start:stop], columns=buffer.columns)
+
+    def mask(self, columns: pd.Index) -> OutlierMask:
+        index = self.index[0].append(self.index[1:]) if self.index else pd.Index([])
+        rows = np.concatenate(self.rows) if self.rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(self.cols) if self.cols else np.empty(0, dtype=np.int64)
+        return OutlierMask(rows, cols, index, columns)
+
+
+class _Returns(_Stage):
+    """Returns between consecutive valid prices, dated at the later one."""
+
+    def __init__(self, method: str):
+        super().__init__()
+        self.method = method
+        self.last_valid: Optional[pd.DataFrame] = None
+
+    def compute(self, buffer, start, stop):
+        prices = buffer.iloc[start:stop]
+        pieces = [prices] if self.last_valid is None else [self.last_valid, prices]
+        previous = pd.concat(pieces).ffill().shift(1).iloc[len(pieces) - 1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = prices.to_numpy() / previous.to_numpy()
+            returns = np.log(ratio) if self.method == 'log' else ratio - 1
+        self.last_valid = pd.concat(pieces).ffill().iloc[[-1]]
+        return pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+
+
+class _RollingFeatures(_Stage):
+    """
+    Return features (return, then mean/std/skew/kurt/sum per window) and
+    volatility features (realized vol, EWM vol, jump per window) on log
+    returns of adjacent rows, named as ``FeatureEngineer`` names them.
+    """
+
+    def __init__(
+        self,
+        columns: pd.Index,
+        return_assets: np.ndarray,
+        volatility_assets: np.ndarray,
+        return_windows: List[int],
+        volatility_windows: List[int]
+    ):
+        super().__init__()
+        self.return_idx = np.flatnonzero(return_assets)
+        self.vol_idx = np.flatnonzero(volatility_assets)
+        self.return_windows = list(return_windows)
+        self.volatility_windows = list(volatility_windows)
+        # Prices: one row more than the largest window of returns
+        self.lookback = max(self.return_windows + self.volatility_windows)
+
+        # EWM state per (asset, window): decayed sums of weights, weighted
+        # values and squares, squared weights, and the observation count
+        shape = (len(self.vol_idx), len(self.volatility_windows))
+        self.decay = np.array([1 - 2 / (window + 1) for window in self.volatility_windows])
+        self.ewm_sums = np.zeros((4,) + shape)
+        self.ewm_nobs = np.zeros(shape)
+
+        names = ['mean', 'volatility', 'skewness', 'kurtosis', 'cumret']
+        self.columns = []
+        for col in columns[self.return_idx]:
+            self.columns.append(f"{col}_return")
+            for window in self.return_windows:
+                self.columns.extend(
+                    f"{col}_return_{name}_{window}d" if name == 'mean' else f"{col}_{name}_{window}d"
+                    for name in names
+                )
+        for col in columns[self.vol_idx]:
+            for window in self.volatility_windows:
+                self.columns.extend([
+                    f"{col}_realized_vol_{window}d", f"{col}_exp_vol_{window}d", f"{col}_jump_{window}d"
+                ])
+
+    def _ewm_std(self, returns: np.ndarray) -> np.ndarray:
+        """``Series.ewm(alpha=2/(w+1)).std()`` continued from the carried state (rows x assets x windows)."""
+        valid = ~np.isnan(returns)
+        x = np.where(valid, returns, 0.0)
+        inputs = (valid.astype(float), x, x * x, valid.astype(float))
+
+        std = np.empty(returns.shape + (len(self.volatility_windows),))
+        for w_idx, decay in enumerate(self.decay):
+            sums = []
+            for k, values in enumerate(inputs):
+                # y_t = v_t + d * y_{t-1}; squared weights decay with d^2
+                factor = decay * decay if k == 3 else decay
+                initial = factor * self.ewm_sums[k, :, w_idx][None, :]
+                filtered, _ = lfilter([1.0], [1.0, -factor], values, axis=0, zi=initial)
+                self.ewm_sums[k, :, w_idx] = filtered[-1] if len(filtered) else self.ewm_sums[k, :, w_idx]
+                sums.append(filtered)
+            weight, weighted, weighted_sq, weight_sq = sums
+            nobs = self.ewm_nobs[:, w_idx] + np.cumsum(valid, axis=0)
+            self.ewm_nobs[:, w_idx] = nobs[-1] if len(nobs) else self.ewm_nobs[:, w_idx]
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = weighted / weight
+                population = np.maximum(weighted_sq / weight - mean * mean, 0.0)
+                denominator = weight * weight - weight_sq
+                variance = np.where(
+                    (nobs >= 1) & (denominator > 0), weight * weight / denominator * population, np.nan
+                )
+            std[:, :, w_idx] = np.sqrt(variance)
+        return std
+
+    def compute(self, buffer, start, stop):
+        prices = buffer.to_numpy(dtype=float)[:stop]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices[1:] / prices[:-1])
+        returns = np.vstack([np.full((1, prices.shape[1]), np.nan), returns])
+        returns[np.isinf(returns)] = np.nan
+        n_rows = stop - start
+
+        blocks = []
+        if len(self.return_idx):
+            block = _return_feature_block(returns[:, self.return_idx], self.return_windows)
+            blocks.append(block[start:].reshape(n_rows, -1))
+        if len(self.vol_idx):
+            vol_returns = returns[:, self.vol_idx]
+            variance = rolling_moments(vol_returns, self.volatility_windows, min_periods=1, stats=('var',))[..., 0]
+            variance = variance[start:]
+            vol_block = np.empty(variance.shape + (3,))
+            vol_block[..., 0] = np.sqrt(variance * 252)
+            vol_block[..., 1] = self._ewm_std(vol_returns[start:]) * np.sqrt(252)
+            with np.errstate(invalid='ignore'):
+                vol_block[..., 2] = np.abs(vol_returns[start:])[:, :, None] > np.sqrt(variance) * 3
+            blocks.append(vol_block.reshape(n_rows, -1))
+
+        values = np.hstack(blocks) if blocks else np.empty((n_rows, 0))
+        features = pd.DataFrame(values, index=buffer.index[start:stop], columns=self.columns)
+        jump_columns = [col for col in self.columns if '_jump_' in col]
+        features[jump_columns] = features[jump_columns].astype(int)
+        return features
+
+
+class ChunkedPipeline:
+    """Streams time-ordered chunks through cleaning, returns and rolling features."""
+
+    def __init__(
+        self,
+        memory_budget_mb: float = 512,
+        chunk_rows: Optional[int] = None,
+        clean_method: str = "forward_fill",
+        outlier_method: str = "zscore",
+        outlier_threshold: float = 3.0,
+        outlier_policy: str = "nan",
+        outlier_window: int = 21,
+        return_method: str = "log",
+        return_windows: List[int] = [1, 5, 10, 20],
+        volatility_windows: List[int] = [5, 10, 20, 60],
+        features: bool = True,
+        probe_rows: int = 2048
+    ):
+        """
+        Args:
+            memory_budget_mb: Peak memory a chunk may allocate while passing
+                through the stages
+            chunk_rows: Fixed chunk size in rows; None sizes chunks from the
+                budget
+            clean_method: 'forward_fill' or 'drop' (see ``clean_price_data``)
+            outlier_method: 'zscore', 'rolling_mad' or 'hampel'
+            outlier_threshold: Width of the outlier bounds
+            outlier_policy: 'nan', 'clip' or 'flag'
+            outlier_window: Window length for the rolling outlier methods
+            return_method: 'log' or 'simple' returns
+            return_windows: Windows of the return features
+            volatility_windows: Windows of the volatility features
+            features: Whether to produce the rolling features
+            probe_rows: Rows of the probe chunk used to size chunks
+        """
+        if clean_method not in CHUNKED_CLEAN_METHODS:
+            raise ValueError(f"Chunked cleaning supports {CHUNKED_CLEAN_METHODS}, got '{clean_method}'")
+        if outlier_method not in CHUNKED_OUTLIER_METHODS:
+            raise ValueError(
+                f"Chunked outlier detection supports {CHUNKED_OUTLIER_METHODS}, got '{outlier_method}' "
+                "(it needs whole-sample quantiles)"
+            )
+        self.logger = logging.getLogger(f"{__name__}.ChunkedPipeline")
+        self.budget_bytes = int(memory_budget_mb * 1024**2)
+        self.chunk_rows = chunk_rows
+        self.clean_method = clean_method
+        self.outlier_method = outlier_method
+        self.outlier_threshold = outlier_threshold
+        self.outlier_policy = outlier_policy
+        self.outlier_window = int(outlier_window)
+        self.return_method = return_method
+        self.return_windows = list(return_windows)
+        self.volatility_windows = list(volatility_windows)
+        self.features = features
+        self.probe_rows = probe_rows
+
+        self.memory_budget = MemoryBudget()
+        self.outlier_mask: Optional[OutlierMask] = None
+        self.profile: Optional[Dict[str, object]] = None
+
+    def _chunks(self, source: Source, chunk_rows: Union[int, Callable[[], int]]) -> Iterator[pd.DataFrame]:
+        """
+        Numeric, time-ordered chunks of at most ``chunk_rows`` rows (a
+        callable is asked again for every chunk).
+        """
+        if isinstance(source, pd.DataFrame):
+            pieces: Iterable[pd.DataFrame] = [source]
+        elif isinstance(source, (str, Path)):
+            pieces = (_read_file(path) for path in [source])
+        elif callable(source):
+            pieces = source()
+        else:
+            pieces = (_read_file(path) for path in source)
+        rows = chunk_rows if callable(chunk_rows) else (lambda: chunk_rows)
+
+        last = None
+        for piece in pieces:
+            if not len(piece):
+                continue
+            if not piece.index.is_monotonic_increasing or (last is not None and piece.index[0] <= last):
+                raise ValueError("Chunked preprocessing needs time-ordered chunks")
+            last = piece.index[-1]
+            numeric = piece.select_dtypes(include=[np.number]).columns
+            start = 0
+            while start < len(piece):
+                step = max(int(rows()), 1)
+                yield piece.iloc[start:start + step][numeric].astype(float)
+                start += step
+
+    def _profile(self, source: Source) -> Dict[str, object]:
+        """
+        First pass: columns, first-step cleaned valid counts, log-return
+        valid counts and z-score moments (merged per chunk).
+        """
+        first_step = _ForwardFill() if self.clean_method == 'forward_fill' else _DropMissing()
+        columns = None
+        count = mean = m2 = return_count = None
+        last_price = None
+
+        def update(cleaned: pd.DataFrame):
+            nonlocal count, mean, m2, return_count, last_price
+            values = cleaned.to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            n = valid.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                chunk_mean = np.where(n > 0, np.where(valid, values, 0.0).sum(axis=0) / np.maximum(n, 1), 0.0)
+                chunk_m2 = (np.where(valid, values - chunk_mean, 0.0) ** 2).sum(axis=0)
+                # Parallel (Chan et al.) merge of count, mean and M2
+                total = count + n
+                delta = chunk_mean - mean
+                mean = np.where(total > 0, mean + delta * n / np.maximum(total, 1), 0.0)
+                m2 = m2 + chunk_m2 + delta * delta * count * n / np.maximum(total, 1)
+                count = total
+
+                previous = np.vstack([last_price, values[:-1]])
+                returns = np.log(values / previous)
+            return_count += np.isfinite(returns).sum(axis=0)
+            last_price = values[-1]
+
+        for chunk in self._chunks(source, self.chunk_rows or 65536):
+            if columns is None:
+                columns = chunk.columns
+                count, mean, m2, return_count = (np.zeros(len(columns)) for _ in range(4))
+                last_price = np.full(len(columns), np.nan)
+            elif not chunk.columns.equals(columns):
+                raise ValueError("All chunks must have the same columns")
+            cleaned = first_step.push(chunk)
+            if len(cleaned):
+                update(cleaned)
+        if columns is None:
+            raise ValueError("Chunked preprocessing got an empty source")
+        cleaned = first_step.flush()
+        if len(cleaned):
+            update(cleaned)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(count > 1, np.sqrt(m2 / np.maximum(count - 1, 1)), np.nan)
+        return {
+            'columns': columns,
+            'counts': count,
+            'return_counts': return_count,
+            'mean': np.where(count > 0, mean, np.nan),
+            'std': std
+        }
+
+    def _build_stages(self, profile: Dict[str, object]) -> Dict[str, object]:
+        zscore_bounds = None
+        if self.outlier_method == 'zscore':
+            spread = self.outlier_threshold * profile['std']
+            zscore_bounds = (profile['mean'] - spread, profile['mean'] + spread)
+
+        stages = {
+            'clean': _ForwardFill() if self.clean_method == 'forward_fill' else _DropMissing(),
+            'outliers': _Outliers(
+                self.outlier_method, self.outlier_threshold, self.outlier_window,
+                self.outlier_policy, zscore_bounds
+            ),
+            'refill': _ForwardFill() if self.outlier_policy == 'nan' else None,
+            'returns': _Returns(self.return_method),
+            'features': None
+        }
+        if self.features:
+            stages['features'] = _RollingFeatures(
+                profile['columns'],
+                profile['counts'] > max(self.return_windows),
+                profile['return_counts'] > max(self.volatility_windows),
+                self.return_windows,
+                self.volatility_windows
+            )
+        return stages
+
+    @staticmethod
+    def _advance(stages: Dict[str, object], chunk: Optional[pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Pass one chunk (None: end of stream) through every stage."""
+        def step(stage, frame: pd.DataFrame) -> pd.DataFrame:
+            if stage is None:
+                return frame
+            output = stage.push(frame) if len(frame) else pd.DataFrame()
+            if chunk is not None:
+                return output
+            # End of stream: the upstream tail, then this stage's held-back rows
+            pieces = [piece for piece in (output, stage.flush()) if len(piece)]
+            return pd.concat(pieces) if pieces else pd.DataFrame()
+
+        frame = step(stages['clean'], chunk if chunk is not None else pd.DataFrame())
+        frame = step(stages['outliers'], frame)
+        prices = step(stages['refill'], frame)
+        outputs = {'prices': prices, 'returns': step(stages['returns'], prices)}
+        if stages['features'] is not None:
+            outputs['features'] = step(stages['features'], prices)
+        return outputs
+
+    def _size_chunks(self, source: Source, profile: Dict[str, object]) -> int:
+        """Rows per chunk that keep a chunk's measured peak within the budget."""
+        probe = next(self._chunks(source, self.probe_rows))
+        stages = self._build_stages(profile)
+        probe_budget = MemoryBudget()
+        with probe_budget.step('probe', baseline=probe):
+            self._advance(stages, probe)
+            self._advance(stages, None)
+
+        per_row = max(probe_budget.peak_bytes / max(len(probe), 1), 1.0)
+        lookback = max([self.outlier_window] + self.return_windows + self.volatility_windows)
+        rows = int(self.budget_bytes // per_row) - lookback
+        if rows < 2 * lookback:
+            raise ValueError(
+                f"Memory budget of {self.budget_bytes / 1024**2:.1f} MB is too small for "
+                f"{len(profile['columns'])} columns (about {per_row:,.0f} bytes per row)"
+            )
+        self.logger.info(f"Chunk size {rows:,} rows (about {per_row:,.0f} bytes per row)")
+        return rows
+
+    def run(
+        self,
+        source: Source,
+        sink: Optional[Callable[[str, pd.DataFrame], None]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Stream the source through cleaning, returns and rolling features.
+
+        Args:
+            source: A DataFrame, a CSV/Parquet file or list of files (one
+                time slice each, in order), or a callable returning an
+                iterable of time-ordered DataFrames (called once per pass)
+            sink: Called as ``sink(name, frame)`` with each finished piece of
+                'prices', 'returns' and 'features'; None collects them and
+                returns the concatenated frames (for sources that fit in memory)
+
+        Returns:
+            Dictionary with 'prices', 'returns' and 'features' when
+            collecting, else an empty dictionary
+        """
+        if not isinstance(source, (pd.DataFrame, str, Path)) and not callable(source):
+            source = list(source)
+
+        self.profile = self._profile(source)
+        chunk_rows = self.chunk_rows or self._size_chunks(source, self.profile)
+        stages = self._build_stages(self.profile)
+        collected: Dict[str, List[pd.DataFrame]] = {'prices': [], 'returns': [], 'features': []}
+
+        def emit(outputs: Dict[str, pd.DataFrame]):
+            for name, frame in outputs.items():
+                if frame is None or not len(frame):
+                    continue
+                if sink is None:
+                    collected[name].append(frame)
+                else:
+                    sink(name, frame)
+
+        n_chunks = 0
+        self.memory_budget.start()
+        try:
+            for chunk in self._chunks(source, lambda: chunk_rows):
+                with self.memory_budget.step(f'chunk {n_chunks}', baseline=chunk) as record:
+                    record['rows'] = len(chunk)
+                    emit(self._advance(stages, chunk))
+                n_chunks += 1
+                if record['peak_bytes'] > self.budget_bytes and self.chunk_rows is None:
+                    # Shrink the following chunks in proportion to the overshoot
+                    chunk_rows = max(int(chunk_rows * self.budget_bytes / record['peak_bytes']), 1)
+                    self.logger.warning(f"Chunk peak above budget; continuing with {chunk_rows:,}-row chunks")
+            with self.memory_budget.step('flush'):
+                emit(self._advance(stages, None))
+        finally:
+            self.memory_budget.stop()
+
+        self.outlier_mask = stages['outliers'].mask(self.profile['columns'])
+        self.logger.info(
+            f"Processed {n_chunks} chunks; outliers ({self.outlier_method}, {self.outlier_policy}): "
+            f"{len(self.outlier_mask)}; largest chunk peak {self.memory_budget.peak_bytes / 1024**2:.1f} MB"
+        )
+        if sink is not None:
+            return {}
+        return {name: pd.concat(frames) if frames else pd.DataFrame() for name, frames in collected.items()}
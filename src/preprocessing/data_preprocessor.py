@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union
 from datetime import datetime
+from contextlib import contextmanager, nullcontext
 import logging
 import sys
 from pathlib import Path
@@ -16,6 +17,13 @@ sys.path.insert(0, str(src_path))
 
 from utils.config import Config
 from utils.helpers import calculate_returns, calculate_realized_volatility, synchronize_timestamps, ensure_datetime_index, get_timezone_policy
+from utils.memory_budget import MemoryBudget
+from utils.returns_panel import ReturnsPanel
+from utils.event_panel import EventPanel
+from utils.outliers import OutlierMask, handle_outliers
+from utils.realized import realized_measures, add_realized_measures
+from .lag_tensor import LagTensor
+from .chunked_pipeline import ChunkedPipeline
 
 # Global config instance
 config = Config()
@@ -24,56 +32,130 @@ logger = logging.getLogger(__name__)
 class DataPreprocessor:
     """Main class for data preprocessing operations."""
     
-    def __init__(self):
+    def __init__(self, copy_free: bool = False):
+        """
+        Args:
+            copy_free: Pipeline mode in which transforms run on copy-on-write
+                data instead of defensive copies, new columns are appended as
+                preallocated blocks, and every step's allocations are recorded
+                in ``self.memory_budget``. Outputs only stay copy-free when
+                pandas copy-on-write is enabled globally
+                (``pd.options.mode.copy_on_write = True``); otherwise
+                ``create_analysis_dataset`` runs all its steps under
+                copy-on-write and deep-copies only the final dataset, and a
+                step called on its own deep-copies its output (both copies
+                are recorded as ``release_*`` steps)
+        """
         self.logger = logging.getLogger(f"{__name__}.DataPreprocessor")
+        self.lag_tensor: Optional[LagTensor] = None
+        self.outlier_mask: Optional[OutlierMask] = None
+        self.copy_free = copy_free
+        self.memory_budget: Optional[MemoryBudget] = MemoryBudget() if copy_free else None
+        self.chunked_memory_budget: Optional[MemoryBudget] = None
+        if copy_free and pd.get_option('mode.copy_on_write') is not True:
+            self.logger.info(
+                "Copy-on-write is not enabled globally: copy-free outputs are deep-copied "
+                "when they are returned (set pd.options.mode.copy_on_write = True to share them)"
+            )
+    
+    @contextmanager
+    def _pipeline_step(self, name: str, data=None):
+        """Run a step under copy-on-write and record its memory (copy-free mode only)."""
+        if not self.copy_free:
+            yield
+            return
+        with pd.option_context('mode.copy_on_write', True), self.memory_budget.step(name, baseline=data):
+            yield
+    
+    def _copy(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Defensive copy, or a lazy copy-on-write reference in copy-free mode."""
+        return data.copy(deep=not self.copy_free)
+    
+    def _release(self, data: pd.DataFrame, name: str) -> pd.DataFrame:
+        """
+        Hand a step's output to the caller (call outside ``_pipeline_step``).
+        
+        Copy-on-write only protects shared buffers while it is enabled, so
+        a copy-free output leaving copy-on-write is deep-copied here; the
+        copy is recorded as step ``release_{name}``.
+        """
+        if self.copy_free and pd.get_option('mode.copy_on_write') is not True:
+            with self.memory_budget.step(f'release_{name}', baseline=data):
+                # Column by column: a deep ``copy`` would also consolidate the
+                # appended blocks, holding up to three copies at its peak
+                data = data.astype({}, copy=True)
+        return data
+    
+    def _append_columns(self, data: pd.DataFrame, new_columns: pd.DataFrame) -> pd.DataFrame:
+        """Append a block of new columns (existing ones are only copied in the default mode)."""
+        existing = [col for col in new_columns.columns if col in data.columns]
+        if existing:
+            data = data.drop(columns=existing)
+        return pd.concat([data, new_columns], axis=1, copy=not self.copy_free)
         
     def clean_price_data(
         self,
         price_data: pd.DataFrame,
         method: str = "forward_fill",
-        outlier_threshold: float = 3.0
+        outlier_threshold: float = 3.0,
+        outlier_method: str = "zscore",
+        outlier_policy: str = "nan",
+        outlier_window: int = 21
     ) -> pd.DataFrame:
         """
         Clean price data by handling missing values and outliers.
         
+        Outliers of all numeric columns are detected in one vectorized pass;
+        their positions are kept in ``self.outlier_mask``.
+        
         Args:
             price_data: DataFrame with price data
             method: Method for handling missing values ('forward_fill', 'interpolate', 'drop')
-            outlier_threshold: Z-score threshold for outlier detection
+            outlier_threshold: Threshold for outlier detection (z-score or
+                scaled MAD units, see ``utils.outliers.outlier_bounds``)
+            outlier_method: 'zscore' (global), 'modified_zscore', 'iqr',
+                'rolling_mad' (trailing median/MAD) or 'hampel' (centered)
+            outlier_policy: 'nan' (set missing, then forward fill), 'clip'
+                (to the bounds) or 'flag' (only record in ``outlier_mask``)
+            outlier_window: Window length for the rolling methods
             
         Returns:
             Cleaned DataFrame
         """
-        cleaned_data = price_data.copy()
-        
-        # Handle missing values
-        if method == "forward_fill":
-            cleaned_data = cleaned_data.fillna(method='ffill')
-        elif method == "interpolate":
-            cleaned_data = cleaned_data.interpolate(method='time')
-        elif method == "drop":
-            cleaned_data = cleaned_data.dropna()
-        
-        # Remove outliers
-        for col in cleaned_data.columns:
-            if cleaned_data[col].dtype in ['float64', 'int64']:
-                # Calculate z-scores
-                z_scores = np.abs((cleaned_data[col] - cleaned_data[col].mean()) / cleaned_data[col].std())
-                
-                # Replace outliers with NaN and forward fill
-                outlier_mask = z_scores > outlier_threshold
-                cleaned_data.loc[outlier_mask, col] = np.nan
-                cleaned_data[col] = cleaned_data[col].fillna(method='ffill')
+        with self._pipeline_step('clean_price_data', price_data):
+            cleaned_data = self._copy(price_data)
+            
+            # Handle missing values
+            if method == "forward_fill":
+                cleaned_data = cleaned_data.ffill()
+            elif method == "interpolate":
+                cleaned_data = cleaned_data.interpolate(method='time')
+            elif method == "drop":
+                cleaned_data = cleaned_data.dropna()
+            
+            # Treat outliers of every numeric column at once
+            numeric = cleaned_data.select_dtypes(include=['float64', 'int64']).columns
+            if len(numeric):
+                treated, self.outlier_mask = handle_outliers(
+                    cleaned_data[numeric], method=outlier_method, threshold=outlier_threshold,
+                    window=outlier_window, policy=outlier_policy
+                )
+                if outlier_policy == 'nan':
+                    treated = treated.ffill()
+                if outlier_policy != 'flag':
+                    cleaned_data[numeric] = treated
+                self.logger.info(f"Outliers ({outlier_method}, {outlier_policy}): {len(self.outlier_mask)}")
         
         self.logger.info(f"Cleaned data shape: {cleaned_data.shape}")
-        return cleaned_data
+        return self._release(cleaned_data, 'clean_price_data')
     
     def calculate_returns_and_volatility(
         self,
         price_data: pd.DataFrame,
         return_method: str = "log",
         volatility_window: str = "1D",
-        annualize: bool = True
+        annualize: bool = True,
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Calculate returns and volatility from price data.
@@ -83,22 +165,22 @@ class DataPreprocessor:
             return_method: Return calculation method ('log' or 'simple')
             volatility_window: Window for volatility calculation
             annualize: Whether to annualize volatility
+            returns_panel: Shared returns panel of the run; None computes
+                returns on a local panel
             
         Returns:
             Dictionary with 'returns', 'volatility', and 'prices' DataFrames
         """
         results = {}
         
-        # Calculate returns for each asset
+        # Returns for each asset, read from the shared panel
+        panel = ReturnsPanel.for_data(price_data, returns_panel)
         returns_data = pd.DataFrame(index=price_data.index)
         volatility_data = pd.DataFrame()
         
         for col in price_data.columns:
-            prices = price_data[col].dropna()
-            
-            if len(prices) > 1:
-                # Calculate returns
-                returns = calculate_returns(prices, method=return_method)
+            if price_data[col].notna().sum() > 1:
+                returns = panel.series(col, kind=return_method)
                 returns_data[col] = returns
                 
                 # Calculate realized volatility
@@ -118,26 +200,132 @@ class DataPreprocessor:
         self.logger.info(f"Calculated returns and volatility for {len(price_data.columns)} assets")
         return results
     
+    def run_chunked(
+        self,
+        source,
+        sink=None,
+        memory_budget_mb: Optional[float] = None,
+        chunk_rows: Optional[int] = None,
+        **options
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Clean, compute returns and rolling features out of core, chunk by chunk.
+        
+        For price panels too large for one DataFrame (e.g. years of 1-minute
+        bars). Results match ``clean_price_data``, ``calculate_returns_and_volatility``
+        returns and the ``FeatureEngineer`` return/volatility features of the
+        in-memory run; see ``ChunkedPipeline``.
+        
+        Args:
+            source: DataFrame, CSV/Parquet file(s) or callable yielding
+                time-ordered chunks
+            sink: ``sink(name, frame)`` receiving each finished piece; None
+                collects and returns the frames
+            memory_budget_mb: Peak memory per chunk (default
+                ``analysis.chunked_preprocessing.memory_budget_mb``)
+            chunk_rows: Fixed chunk size in rows instead of budget sizing
+            **options: Cleaning/outlier/feature options of ``ChunkedPipeline``
+            
+        Returns:
+            Dictionary with 'prices', 'returns' and 'features' (empty with a sink);
+            the per-chunk memory records are kept in ``self.chunked_memory_budget``
+        """
+        settings = config.get('analysis.chunked_preprocessing') or {}
+        pipeline = ChunkedPipeline(
+            memory_budget_mb=memory_budget_mb if memory_budget_mb is not None else settings.get('memory_budget_mb', 512),
+            chunk_rows=chunk_rows if chunk_rows is not None else settings.get('chunk_rows'),
+            **options
+        )
+        results = pipeline.run(source, sink=sink)
+        
+        self.outlier_mask = pipeline.outlier_mask
+        self.chunked_memory_budget = pipeline.memory_budget
+        self.logger.info(
+            f"Chunked preprocessing: {len(pipeline.memory_budget.records) - 1} chunks, "
+            f"largest chunk peak {pipeline.memory_budget.peak_bytes / 1024**2:.1f} MB"
+        )
+        return results
+    
+    def add_realized_measures(
+        self,
+        daily_data: pd.DataFrame,
+        intraday_close: pd.DataFrame,
+        intraday_open: Optional[pd.DataFrame] = None,
+        intraday_high: Optional[pd.DataFrame] = None,
+        intraday_low: Optional[pd.DataFrame] = None,
+        subsample=None,
+        measures: Optional[List[str]] = None,
+        **options
+    ) -> pd.DataFrame:
+        """
+        Add daily realized measures of the intraday bars to a daily panel.
+        
+        Realized variance, bipower variation, realized skewness/kurtosis and
+        the Parkinson/Garman-Klass range estimators of every symbol are
+        computed at once (see ``utils.realized``) and joined as
+        ``{symbol}_{measure}`` columns.
+        
+        Args:
+            daily_data: Daily panel on a DatetimeIndex
+            intraday_close: Intraday bar closes (bars x symbols)
+            intraday_open: Bar opens for Garman-Klass (optional)
+            intraday_high: Bar highs for the range estimators (optional)
+            intraday_low: Bar lows for the range estimators (optional)
+            subsample: Sampling step in bars or as a duration (default
+                ``analysis.realized_measures.subsample``)
+            measures: Measures to add (default ``analysis.realized_measures.measures``,
+                or all)
+            **options: Further options of ``realized_measures``
+            
+        Returns:
+            Daily panel with the realized measure columns
+        """
+        settings = config.get('analysis.realized_measures') or {}
+        measures_by_name = realized_measures(
+            intraday_close,
+            open=intraday_open,
+            high=intraday_high,
+            low=intraday_low,
+            subsample=subsample if subsample is not None else settings.get('subsample', 1),
+            measures=measures if measures is not None else settings.get('measures'),
+            **{'min_returns': settings.get('min_returns', 2), **options}
+        )
+        
+        self.logger.info(
+            f"Added {len(measures_by_name)} realized measures for "
+            f"{len(intraday_close.columns)} symbols from {len(intraday_close)} intraday bars"
+        )
+        return add_realized_measures(daily_data, measures_by_name)
+    
     def synchronize_datasets(
         self,
         datasets: Dict[str, pd.DataFrame],
-        freq: str = "1H",
-        method: str = "ffill"
+        freq: Optional[str] = "1H",
+        method: str = "ffill",
+        tolerance=None,
+        windows: Optional[List[Tuple[datetime, datetime]]] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Synchronize multiple datasets to common timestamps.
         
         Args:
             datasets: Dictionary of DataFrames to synchronize
-            freq: Target frequency
+            freq: Target frequency; None aligns on the datasets' native
+                timestamps (as-of, no dense grid)
             method: Method for handling missing values
+            tolerance: Staleness limit of carried values, for all datasets or
+                by dataset name (e.g. ``{'economic': '45D'}``)
+            windows: Only build the ``freq`` grid inside these (start, end) windows
             
         Returns:
             Dictionary of synchronized DataFrames
         """
-        synchronized = synchronize_timestamps(datasets, freq=freq, method=method)
+        synchronized = synchronize_timestamps(
+            datasets, freq=freq, method=method, tolerance=tolerance, windows=windows
+        )
         
-        self.logger.info(f"Synchronized {len(datasets)} datasets to {freq} frequency")
+        rows = max((len(df) for df in synchronized.values()), default=0)
+        self.logger.info(f"Synchronized {len(datasets)} datasets to {freq or 'native'} timestamps ({rows} rows)")
         return synchronized
     
     def create_analysis_dataset(
@@ -145,7 +333,10 @@ class DataPreprocessor:
         crypto_data: pd.DataFrame,
         stock_data: pd.DataFrame,
         economic_data: pd.DataFrame,
-        announcement_dates: pd.DataFrame = None
+        announcement_dates: pd.DataFrame = None,
+        lazy_lags: bool = False,
+        announcement_tolerance_days: int = 0,
+        staleness: Optional[Dict[str, str]] = None
     ) -> pd.DataFrame:
         """
         Create a comprehensive dataset for analysis.
@@ -155,6 +346,12 @@ class DataPreprocessor:
             stock_data: Stock market returns/prices  
             economic_data: Economic indicators
             announcement_dates: DataFrame with announcement dates
+            lazy_lags: Keep lagged variables in ``self.lag_tensor`` instead
+                of adding them as columns
+            announcement_tolerance_days: Days an announcement may be moved
+                forward to the next available row (e.g. weekend to Monday)
+            staleness: Maximum age of a forward-filled value by dataset
+                ('crypto', 'stocks', 'economic'), e.g. ``{'economic': '45D'}``
             
         Returns:
             Combined analysis dataset
@@ -164,6 +361,38 @@ class DataPreprocessor:
         stock_data = self._ensure_datetime_index(stock_data)
         economic_data = self._ensure_datetime_index(economic_data)
         
+        # Trace memory across all steps of the run, and stop tracing afterwards
+        if self.copy_free:
+            self.memory_budget.start()
+        try:
+            # One copy-on-write scope for the whole chain: intermediate frames
+            # share buffers, and only the final dataset is released
+            with pd.option_context('mode.copy_on_write', True) if self.copy_free else nullcontext():
+                analysis_data = self._build_analysis_dataset(
+                    crypto_data, stock_data, economic_data, announcement_dates,
+                    lazy_lags, announcement_tolerance_days, staleness
+                )
+            analysis_data = self._release(analysis_data, 'create_analysis_dataset')
+            
+            self.logger.info(f"Created analysis dataset with {len(analysis_data.columns)} features")
+            if self.copy_free:
+                self.memory_budget.log_summary(self.logger)
+            return analysis_data
+        finally:
+            if self.copy_free:
+                self.memory_budget.stop()
+    
+    def _build_analysis_dataset(
+        self,
+        crypto_data: pd.DataFrame,
+        stock_data: pd.DataFrame,
+        economic_data: pd.DataFrame,
+        announcement_dates: Optional[pd.DataFrame],
+        lazy_lags: bool,
+        announcement_tolerance_days: int,
+        staleness: Optional[Dict[str, str]]
+    ) -> pd.DataFrame:
+        """Steps of ``create_analysis_dataset`` (synchronize, combine, indicators, time features, lags)."""
         # Synchronize to daily frequency for main analysis
         datasets = {
             'crypto': crypto_data,
@@ -171,35 +400,38 @@ class DataPreprocessor:
             'economic': economic_data
         }
         
-        synchronized = self.synchronize_datasets(datasets, freq="1D", method="ffill")
+        with self._pipeline_step('synchronize_datasets'):
+            synchronized = self.synchronize_datasets(datasets, freq="1D", method="ffill", tolerance=staleness)
         
         # Combine into single DataFrame
-        analysis_data = pd.DataFrame()
-        
-        # Add crypto data with prefix
-        for col in synchronized['crypto'].columns:
-            analysis_data[f"crypto_{col}"] = synchronized['crypto'][col]
-        
-        # Add stock data with prefix
-        for col in synchronized['stocks'].columns:
-            analysis_data[f"stock_{col}"] = synchronized['stocks'][col]
-        
-        # Add economic data with prefix
-        for col in synchronized['economic'].columns:
-            analysis_data[f"econ_{col}"] = synchronized['economic'][col]
+        with self._pipeline_step('combine_datasets'):
+            analysis_data = pd.DataFrame()
+            
+            # Add crypto data with prefix
+            for col in synchronized['crypto'].columns:
+                analysis_data[f"crypto_{col}"] = synchronized['crypto'][col]
+            
+            # Add stock data with prefix
+            for col in synchronized['stocks'].columns:
+                analysis_data[f"stock_{col}"] = synchronized['stocks'][col]
+            
+            # Add economic data with prefix
+            for col in synchronized['economic'].columns:
+                analysis_data[f"econ_{col}"] = synchronized['economic'][col]
         
         # Add announcement indicators if provided
         if announcement_dates is not None:
             announcement_dates = self._ensure_datetime_index(announcement_dates)
-            analysis_data = self._add_announcement_indicators(analysis_data, announcement_dates)
+            analysis_data = self._add_announcement_indicators(
+                analysis_data, announcement_dates, tolerance_days=announcement_tolerance_days
+            )
         
         # Add time-based features
         analysis_data = self._add_time_features(analysis_data)
         
         # Add lagged variables
-        analysis_data = self._add_lagged_variables(analysis_data)
+        analysis_data = self._add_lagged_variables(analysis_data, lazy=lazy_lags)
         
-        self.logger.info(f"Created analysis dataset with {len(analysis_data.columns)} features")
         return analysis_data
     
     def _ensure_datetime_index(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -225,78 +457,148 @@ class DataPreprocessor:
     def _add_announcement_indicators(
         self,
         data: pd.DataFrame,
-        announcement_dates: pd.DataFrame
+        announcement_dates: pd.DataFrame,
+        tolerance_days: int = 0
     ) -> pd.DataFrame:
-        """Add binary indicators for announcement dates."""
-        result = data.copy()
+        """
+        Add binary indicators for announcement dates.
+        
+        All event types are handled in one pass: event dates are mapped to
+        row positions with a sorted lookup and scattered into an int8
+        (rows x event types) block.
         
-        # Create binary indicators for different types of announcements
-        if 'event' in announcement_dates.columns:
-            event_types = announcement_dates['event'].unique()
+        Args:
+            data: Dataset with a DatetimeIndex
+            announcement_dates: Announcements indexed by date with an 'event' column
+            tolerance_days: Events with no matching row are assigned to the
+                first row up to this many days later (e.g. 2 moves weekend
+                announcements to Monday on a trading-day index)
             
-            for event_type in event_types:
-                event_dates = announcement_dates[
-                    announcement_dates['event'] == event_type
-                ].index
-                
-                # Create binary indicator
-                indicator_name = f"announcement_{event_type.lower().replace(' ', '_')}"
-                result[indicator_name] = 0
-                
-                # Set to 1 on announcement dates
-                for date in event_dates:
-                    if date in result.index:
-                        result.loc[date, indicator_name] = 1
+        Returns:
+            Dataset with one ``announcement_{event}`` column per event type
+        """
+        if 'event' not in announcement_dates.columns:
+            return self._release(self._copy(data), 'add_announcement_indicators')
         
-        return result
+        with self._pipeline_step('add_announcement_indicators', data):
+            result = self._announcement_indicators(data, announcement_dates, tolerance_days)
+        return self._release(result, 'add_announcement_indicators')
+    
+    def _announcement_indicators(
+        self,
+        data: pd.DataFrame,
+        announcement_dates: pd.DataFrame,
+        tolerance_days: int
+    ) -> pd.DataFrame:
+        # Event type -> indicator column (types differing only in case/spaces share one)
+        codes, event_types = pd.factorize(announcement_dates['event'])
+        column_codes, names = pd.factorize(pd.Index(
+            [f"announcement_{str(event_type).lower().replace(' ', '_')}" for event_type in event_types]
+        ))
+        codes = np.where(codes >= 0, column_codes[np.maximum(codes, 0)], -1)
+        
+        # Sorted view of the row dates (stable, so duplicate labels keep row order)
+        row_dates = pd.DatetimeIndex(data.index).asi8
+        order = np.argsort(row_dates, kind='stable')
+        sorted_dates = row_dates[order]
+        event_dates = pd.DatetimeIndex(announcement_dates.index).asi8
+        
+        # First row on or after each event date, within the tolerance
+        left = np.searchsorted(sorted_dates, event_dates, side='left')
+        valid = (codes >= 0) & (left < len(sorted_dates))
+        matched = sorted_dates[np.minimum(left, len(sorted_dates) - 1)]
+        valid &= (matched - event_dates) <= pd.Timedelta(days=tolerance_days).value
+        
+        # Every row carrying the matched date gets the indicator
+        left, matched, event_codes = left[valid], matched[valid], codes[valid]
+        counts = np.searchsorted(sorted_dates, matched, side='right') - left
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = order[np.repeat(left, counts) + offsets]
+        
+        flags = np.zeros((len(data), len(names)), dtype=np.int8)
+        flags[rows, np.repeat(event_codes, counts)] = 1
+        
+        indicators = pd.DataFrame(flags, index=data.index, columns=list(names), copy=False)
+        return self._append_columns(data, indicators)
     
     def _add_time_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Add time-based features."""
-        result = data.copy()
-        
-        # Day of week (Monday=0, Sunday=6)
-        result['day_of_week'] = data.index.dayofweek
-        
-        # Month
-        result['month'] = data.index.month
-        
-        # Quarter
-        result['quarter'] = data.index.quarter
-        
-        # Year
-        result['year'] = data.index.year
-        
-        # Weekend indicator
-        result['is_weekend'] = (data.index.dayofweek >= 5).astype(int)
-        
-        return result
+        with self._pipeline_step('add_time_features', data):
+            # One preallocated block for all calendar columns
+            block = np.empty((len(data), 5), dtype=np.int32)
+            
+            # Day of week (Monday=0, Sunday=6)
+            block[:, 0] = data.index.dayofweek
+            
+            # Month
+            block[:, 1] = data.index.month
+            
+            # Quarter
+            block[:, 2] = data.index.quarter
+            
+            # Year
+            block[:, 3] = data.index.year
+            
+            # Weekend indicator
+            block[:, 4] = block[:, 0] >= 5
+            
+            time_features = pd.DataFrame(
+                block, index=data.index,
+                columns=['day_of_week', 'month', 'quarter', 'year', 'is_weekend'], copy=False
+            )
+            result = self._append_columns(data, time_features)
+        return self._release(result, 'add_time_features')
     
     def _add_lagged_variables(
         self,
         data: pd.DataFrame,
-        lags: List[int] = [1, 2, 3, 5]
+        lags: List[int] = [1, 2, 3, 5],
+        lazy: bool = False
     ) -> pd.DataFrame:
-        """Add lagged variables for relevant columns."""
-        result = data.copy()
-        
-        # Add lags for return and volatility columns
-        lag_columns = [col for col in data.columns 
-                      if any(keyword in col.lower() 
-                            for keyword in ['return', 'volatility', 'rate'])]
-        
-        for col in lag_columns:
-            for lag in lags:
-                result[f"{col}_lag{lag}"] = data[col].shift(lag)
+        """
+        Add lagged variables for relevant columns.
         
-        return result
+        The lags of numeric columns are kept in ``self.lag_tensor``, a
+        strided read-only view over the series. With ``lazy`` no lag columns
+        are added for them; consumers take named lags from the tensor when
+        they need them. Non-numeric columns cannot be held in the tensor and
+        are always lagged as columns.
+        """
+        with self._pipeline_step('add_lagged_variables', data):
+            # Add lags for return and volatility columns
+            lag_columns = [col for col in data.columns 
+                          if any(keyword in col.lower() 
+                                for keyword in ['return', 'volatility', 'rate'])]
+            numeric = set(data.select_dtypes(include=[np.number]).columns)
+            
+            self.lag_tensor = LagTensor(data[[col for col in lag_columns if col in numeric]], lags)
+            shifted = pd.DataFrame({
+                f"{col}_lag{lag}": data[col].shift(lag)
+                for col in lag_columns if col not in numeric
+                for lag in self.lag_tensor.lags
+            }, index=data.index)
+            if lazy:
+                self.logger.info(
+                    f"Lag view for {len(self.lag_tensor.columns)} columns x {len(self.lag_tensor.lags)} lags "
+                    f"({self.lag_tensor.nbytes / 1024**2:.1f} MB, no lag columns materialized)"
+                )
+                result = self._append_columns(data, shifted) if len(shifted.columns) else data
+            else:
+                new_columns = self.lag_tensor.to_frame()
+                if len(shifted.columns):
+                    names = [f"{col}_lag{lag}" for col in lag_columns for lag in self.lag_tensor.lags]
+                    new_columns = pd.concat([new_columns, shifted], axis=1)[names]
+                result = self._append_columns(data, new_columns)
+        return self._release(result, 'add_lagged_variables')
     
     def prepare_event_study_data(
         self,
         price_data: pd.DataFrame,
         announcement_times: List[datetime],
         pre_window_minutes: int = 60,
-        post_window_minutes: int = 60
-    ) -> Dict[str, pd.DataFrame]:
+        post_window_minutes: int = 60,
+        as_panel: bool = False
+    ) -> Union[Dict[str, pd.DataFrame], EventPanel]:
         """
         Prepare data for event study analysis.
         
@@ -305,10 +607,40 @@ class DataPreprocessor:
             announcement_times: List of announcement times
             pre_window_minutes: Minutes before announcement
             post_window_minutes: Minutes after announcement
+            as_panel: Return one EventPanel (events x minute slots x series),
+                gathered in a single pass, instead of a dictionary of
+                per-event frames; ``panel.log_returns()`` gives the window returns
             
         Returns:
-            Dictionary with event study data
+            Dictionary with event study data, or an EventPanel
         """
+        if as_panel:
+            with self._pipeline_step('prepare_event_study_data', price_data):
+                panel = EventPanel.by_time(
+                    price_data, announcement_times,
+                    pre=pd.Timedelta(minutes=pre_window_minutes),
+                    post=pd.Timedelta(minutes=post_window_minutes),
+                    unit='1min'
+                )
+            self.logger.info(f"Prepared event panel {panel.shape} for {len(panel)} events")
+            return panel
+        
+        with self._pipeline_step('prepare_event_study_data', price_data):
+            event_data = self._event_windows(
+                price_data, announcement_times, pre_window_minutes, post_window_minutes
+            )
+        
+        self.logger.info(f"Prepared event study data for {len(event_data)} events")
+        return event_data
+    
+    def _event_windows(
+        self,
+        price_data: pd.DataFrame,
+        announcement_times: List[datetime],
+        pre_window_minutes: int,
+        post_window_minutes: int
+    ) -> Dict[str, Dict]:
+        """Slice and transform the price window around each announcement."""
         event_data = {}
         
         for i, announce_time in enumerate(announcement_times):
@@ -318,7 +650,7 @@ class DataPreprocessor:
             
             # Extract data for this event window
             mask = (price_data.index >= start_time) & (price_data.index <= end_time)
-            event_window_data = price_data.loc[mask].copy()
+            event_window_data = self._copy(price_data.loc[mask])
             
             if not event_window_data.empty:
                 # Calculate minutes relative to announcement
@@ -342,5 +674,4 @@ class DataPreprocessor:
                     'announcement_time': announce_time
                 }
         
-        self.logger.info(f"Prepared event study data for {len(event_data)} events")
         return event_data
\ No newline at end of file
@@ -4,12 +4,25 @@ Feature engineering module for creating analysis variables.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from datetime import datetime
 import logging
+import sys
 from scipy import stats
 from pathlib import Path
 
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.helpers import locate_sorted
+from utils.parallel import run_column_sharded
+from utils.rolling import rolling_moments, rolling_quantile, rolling_rank
+from utils.returns_panel import ReturnsPanel
+from .feature_registry import FeatureRegistry
+from .incremental_features import IncrementalFeatureState, RETURN_STATS
+from .interactions import VirtualInteractions
+
 # Setup enhanced logging if available
 logger = logging.getLogger(__name__)
 
@@ -34,10 +47,48 @@ def setup_enhanced_logging():
 # Initialize logger
 logger = setup_enhanced_logging()
 
+
+def _return_feature_block(returns: np.ndarray, windows: List[int]) -> np.ndarray:
+    """Per asset: return, then (mean, std, skew, kurt, sum) per window."""
+    moments = rolling_moments(returns, windows, min_periods=1, stats=RETURN_STATS)
+    n_rows, n_assets = returns.shape
+    block = np.empty((n_rows, n_assets, 1 + len(windows) * len(RETURN_STATS)))
+    block[:, :, 0] = returns
+    block[:, :, 1:] = moments.reshape(n_rows, n_assets, -1)
+    return block
+
+
+def _volatility_feature_block(returns: np.ndarray, windows: List[int]) -> np.ndarray:
+    """Per asset and window: (realized vol, exponential vol, jump indicator)."""
+    rolling_var = rolling_moments(returns, windows, min_periods=1, stats=('var',))[..., 0]
+    block = np.empty(rolling_var.shape + (3,))
+    block[..., 0] = np.sqrt(rolling_var * 252)
+    
+    returns_frame = pd.DataFrame(returns)
+    for w_idx, window in enumerate(windows):
+        # Exponential smoothing volatility
+        alpha = 2 / (window + 1)
+        block[:, :, w_idx, 1] = returns_frame.ewm(alpha=alpha).std().to_numpy() * np.sqrt(252)
+    
+    # Jump indicators (large moves)
+    with np.errstate(invalid='ignore'):
+        block[..., 2] = np.abs(returns)[:, :, None] > np.sqrt(rolling_var) * 3
+    return block
+
+
 class FeatureEngineer:
     """Class for creating features for analysis."""
     
-    def __init__(self, log_level: str = "INFO"):
+    def __init__(self, log_level: str = "INFO", n_jobs: int = 1):
+        """
+        Args:
+            log_level: Logging level
+            n_jobs: Worker processes for per-asset return and volatility
+                features (1 runs in-process, -1 uses all cores)
+        """
+        self.n_jobs = n_jobs
+        self.interactions: Optional[VirtualInteractions] = None
+        
         # Use the global logger or create a new one
         self.logger = logger
         self.logger.info("FeatureEngineer initialized")
@@ -186,6 +237,18 @@ class FeatureEngineer:
         surprises = pd.DataFrame(all_surprises, index=actual_data.index)
         return surprises
     
+    def _proxy_surprise_prefix(self) -> str:
+        """Column prefix for proxy surprises ('proxy_surprise_' unless disabled in config)."""
+        # Check config for marking policy
+        try:
+            from utils.config import Config
+            config = Config()
+            mark_proxy = config.get('analysis', {}).get('mark_proxy_surprises', True)
+        except:
+            mark_proxy = True  # Default to marking
+        
+        return "proxy_surprise_" if mark_proxy else ""
+    
     def _create_surprise_from_historical(self, actual_data: pd.DataFrame) -> pd.DataFrame:
         """
         Create surprises using historical mean as expected value.
@@ -199,18 +262,10 @@ class FeatureEngineer:
         # Use dictionary to collect all features, then create DataFrame once
         all_surprises = {}
         
-        # Check config for marking policy
-        try:
-            from utils.config import Config
-            config = Config()
-            mark_proxy = config.get('analysis', {}).get('mark_proxy_surprises', True)
-        except:
-            mark_proxy = True  # Default to marking
-        
         # Set prefix based on marking policy
-        prefix = "proxy_surprise_" if mark_proxy else ""
+        prefix = self._proxy_surprise_prefix()
         
-        if mark_proxy:
+        if prefix:
             self.logger.warning(
                 "Creating PROXY surprises from historical means. "
                 "These are NOT forecast-based surprises. "
@@ -251,7 +306,8 @@ class FeatureEngineer:
     def create_return_features(
         self,
         price_data: pd.DataFrame,
-        windows: List[int] = [1, 5, 10, 20]
+        windows: List[int] = [1, 5, 10, 20],
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> pd.DataFrame:
         """
         Create return-based features.
@@ -259,33 +315,41 @@ class FeatureEngineer:
         Args:
             price_data: DataFrame with price data
             windows: List of window sizes for features
+            returns_panel: Shared returns panel; None computes the log
+                returns on a local panel
             
         Returns:
             DataFrame with return features
         """
-        # Use a dictionary to collect all features, then create DataFrame once
-        all_features = {}
-        
-        for col in price_data.columns:
-            prices = price_data[col]
-            valid_count = prices.notna().sum()
-            
-            if valid_count > max(windows):
-                # Log returns on the full index to maintain alignment
-                returns = np.log(prices / prices.shift(1)).replace([np.inf, -np.inf], np.nan)
-                all_features[f"{col}_return"] = returns
-                
-                # Rolling return statistics (retain full index)
-                for window in windows:
-                    rolling_view = returns.rolling(window, min_periods=1)
-                    all_features[f"{col}_return_mean_{window}d"] = rolling_view.mean()
-                    all_features[f"{col}_volatility_{window}d"] = rolling_view.std()
-                    all_features[f"{col}_skewness_{window}d"] = rolling_view.skew()
-                    all_features[f"{col}_kurtosis_{window}d"] = rolling_view.kurt()
-                    all_features[f"{col}_cumret_{window}d"] = rolling_view.sum()
-        
-        # Create DataFrame efficiently from dictionary
-        features = pd.DataFrame(all_features, index=price_data.index)
+        # Assets with enough history for the longest window
+        valid_counts = price_data.notna().sum()
+        selected = [col for col in price_data.columns if valid_counts[col] > max(windows)]
+        if not selected:
+            return pd.DataFrame(index=price_data.index)
+        
+        # Log returns on the full index to maintain alignment
+        panel = ReturnsPanel.for_data(price_data, returns_panel)
+        returns = panel.log(selected, skip_gaps=False).to_numpy()
+        returns = np.where(np.isinf(returns), np.nan, returns)
+        
+        # Per asset: return, then (mean, volatility, skewness, kurtosis, cumret) per window
+        block = run_column_sharded(
+            _return_feature_block, returns, (1 + len(windows) * len(RETURN_STATS),),
+            n_jobs=self.n_jobs, kernel_args=(windows,)
+        )
+        n_rows = len(returns)
+        
+        names = ['mean', 'volatility', 'skewness', 'kurtosis', 'cumret']
+        columns = []
+        for col in selected:
+            columns.append(f"{col}_return")
+            for window in windows:
+                columns.extend(
+                    f"{col}_return_{name}_{window}d" if name == 'mean' else f"{col}_{name}_{window}d"
+                    for name in names
+                )
+        
+        features = pd.DataFrame(block.reshape(n_rows, -1), index=price_data.index, columns=columns)
         return features
     
     def create_volatility_features(
@@ -306,36 +370,92 @@ class FeatureEngineer:
         # Use a dictionary to collect all features, then create DataFrame once
         all_features = {}
         
-        for col in returns_data.columns:
-            returns = returns_data[col]
-            valid_count = returns.notna().sum()
-            
-            if valid_count > max(windows):
-                for window in windows:
-                    rolling_view = returns.rolling(window, min_periods=1)
-                    # Realized volatility
-                    realized_vol = np.sqrt(rolling_view.var() * 252)
-                    all_features[f"{col}_realized_vol_{window}d"] = realized_vol
-                    
-                    # Exponential smoothing volatility
-                    alpha = 2 / (window + 1)
-                    exp_vol = returns.ewm(alpha=alpha).std() * np.sqrt(252)
-                    all_features[f"{col}_exp_vol_{window}d"] = exp_vol
-                    
-                    # Jump indicators (large moves)
-                    threshold = rolling_view.std() * 3
-                    jump_indicator = (np.abs(returns) > threshold).astype(int)
-                    all_features[f"{col}_jump_{window}d"] = jump_indicator
+        # Assets with enough history for the longest window
+        valid_counts = returns_data.notna().sum()
+        selected = [col for col in returns_data.columns if valid_counts[col] > max(windows)]
+        if not selected:
+            return pd.DataFrame(index=returns_data.index)
+        
+        returns = returns_data[selected].to_numpy(dtype=float)
+        
+        # (realized vol, exponential vol, jump) per asset and window, sharded by asset
+        block = run_column_sharded(
+            _volatility_feature_block, returns, (len(windows), 3),
+            n_jobs=self.n_jobs, kernel_args=(windows,)
+        )
+        
+        for a_idx, col in enumerate(selected):
+            for w_idx, window in enumerate(windows):
+                all_features[f"{col}_realized_vol_{window}d"] = block[:, a_idx, w_idx, 0]
+                all_features[f"{col}_exp_vol_{window}d"] = block[:, a_idx, w_idx, 1]
+                all_features[f"{col}_jump_{window}d"] = block[:, a_idx, w_idx, 2].astype(int)
         
         # Create DataFrame efficiently from dictionary
         features = pd.DataFrame(all_features, index=returns_data.index)
         
         return features
     
+    def start_incremental_features(
+        self,
+        price_data: pd.DataFrame,
+        return_windows: List[int] = [1, 5, 10, 20],
+        volatility_windows: List[int] = [5, 10, 20, 60]
+    ) -> pd.DataFrame:
+        """
+        Create return and volatility features for a price history and keep
+        the rolling state needed to extend them with ``append_prices``.
+
+        Args:
+            price_data: DataFrame with price data
+            return_windows: Window sizes for return features
+            volatility_windows: Window sizes for volatility features
+
+        Returns:
+            DataFrame with return features followed by volatility features
+        """
+        self.incremental_state = IncrementalFeatureState.from_history(
+            price_data, return_windows, volatility_windows
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.log(price_data / price_data.shift(1)).replace([np.inf, -np.inf], np.nan)
+
+        features = pd.concat([
+            self.create_return_features(price_data, return_windows),
+            self.create_volatility_features(log_returns, volatility_windows)
+        ], axis=1)
+        self.logger.info(
+            f"Incremental feature state primed on {len(price_data)} rows "
+            f"({self.incremental_state.return_assets.sum()} return assets, "
+            f"{self.incremental_state.volatility_assets.sum()} volatility assets)"
+        )
+        return features
+
+    def append_prices(self, new_prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Update return and volatility features with newly appended price rows.
+
+        Each row costs O(assets x windows) instead of a full recompute; the
+        values match recomputing over the extended history up to
+        floating-point rounding.
+
+        Args:
+            new_prices: New price rows, in date order, after the primed history
+
+        Returns:
+            DataFrame with the feature rows for ``new_prices``
+        """
+        if getattr(self, 'incremental_state', None) is None:
+            raise ValueError("Call start_incremental_features before append_prices")
+        return self.incremental_state.append(new_prices)
+
     def create_market_regime_features(
         self,
         market_data: pd.DataFrame,
-        volatility_threshold: float = 0.015
+        volatility_threshold: float = 0.015,
+        volatility_quantile: Optional[float] = None,
+        percentile_window: int = 252,
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> pd.DataFrame:
         """
         Create market regime indicators based on market volatility and trends.
@@ -343,6 +463,12 @@ class FeatureEngineer:
         Args:
             market_data: DataFrame with market data
             volatility_threshold: Threshold for high/low volatility regime (daily return std)
+            volatility_quantile: If set, the high/low volatility threshold is
+                this rolling quantile of the S&P 500 volatility over
+                ``percentile_window`` days instead of ``volatility_threshold``
+            percentile_window: Window for volatility percentile ranks and quantiles
+            returns_panel: Shared returns panel; None computes the log
+                returns on a local panel
             
         Returns:
             DataFrame with regime features
@@ -350,24 +476,34 @@ class FeatureEngineer:
         # Use dictionary to collect all features, then create DataFrame once
         all_features = {}
         
+        # 20-day volatility and its rolling percentile rank for every asset at once
+        panel = ReturnsPanel.for_data(market_data, returns_panel)
+        log_returns = panel.log(market_data.columns, skip_gaps=False).to_numpy()
+        rolling_vols = rolling_moments(log_returns, [20], min_periods=20, stats=('std',))[:, :, 0, 0]
+        vol_percentiles = rolling_rank(rolling_vols, percentile_window, pct=True)
+        
         # Market trend regime (using S&P 500 if available)
         sp500_cols = [col for col in market_data.columns 
                      if any(indicator in col.lower() for indicator in ['sp500', 'gspc', '^gspc'])]
         
         if sp500_cols:
             sp500_col = sp500_cols[0]
+            sp500_idx = market_data.columns.get_loc(sp500_col)
             sp500_prices = market_data[sp500_col]
             
-            # Calculate returns for volatility regime
-            sp500_returns = np.log(sp500_prices / sp500_prices.shift(1))
-            rolling_vol = sp500_returns.rolling(20).std()
+            # Realized volatility for the volatility regime
+            rolling_vol = pd.Series(rolling_vols[:, sp500_idx], index=market_data.index)
             
             # Volatility-based regime (using realized volatility instead of VIX)
+            if volatility_quantile is not None:
+                volatility_threshold = rolling_quantile(
+                    rolling_vols[:, [sp500_idx]], percentile_window, [volatility_quantile]
+                )[:, 0, 0]
             all_features['high_volatility_regime'] = (rolling_vol > volatility_threshold).astype(int)
             all_features['low_volatility_regime'] = (rolling_vol <= volatility_threshold).astype(int)
             
             # Volatility percentile
-            all_features['volatility_percentile'] = rolling_vol.rolling(252).rank(pct=True)
+            all_features['volatility_percentile'] = vol_percentiles[:, sp500_idx]
             
             # Bull/bear market based on 200-day MA
             ma_200 = sp500_prices.rolling(200).mean()
@@ -377,6 +513,10 @@ class FeatureEngineer:
             # Trend strength
             all_features['trend_strength'] = (sp500_prices - ma_200) / ma_200
         
+        # Volatility percentile per asset
+        for a_idx, col in enumerate(market_data.columns):
+            all_features[f"{col}_volatility_percentile"] = vol_percentiles[:, a_idx]
+        
         # Create DataFrame efficiently from dictionary
         features = pd.DataFrame(all_features, index=market_data.index)
         return features
@@ -384,38 +524,30 @@ class FeatureEngineer:
     def create_interaction_features(
         self,
         surprise_data: pd.DataFrame,
-        regime_data: pd.DataFrame
-    ) -> pd.DataFrame:
+        regime_data: pd.DataFrame,
+        virtual: bool = False
+    ) -> Union[pd.DataFrame, VirtualInteractions]:
         """
         Create interaction features between surprises and market regimes.
         
         Args:
             surprise_data: DataFrame with surprise measures
             regime_data: DataFrame with regime indicators
+            virtual: Return the interactions as (surprise, regime) pairs to be
+                expanded later (e.g. in a regression design matrix) instead of
+                materializing every product column
             
         Returns:
-            DataFrame with interaction features
+            DataFrame with interaction features, or VirtualInteractions
         """
-        # Use dictionary to collect all features, then create DataFrame once
-        all_features = {}
-        
         # Get surprise columns
         surprise_cols = [col for col in surprise_data.columns if 'surprise' in col]
         regime_cols = [col for col in regime_data.columns if 'regime' in col or 'market' in col]
         
-        # Create interactions
-        for surprise_col in surprise_cols:
-            for regime_col in regime_cols:
-                if surprise_col in surprise_data.columns and regime_col in regime_data.columns:
-                    interaction_name = f"{surprise_col}_x_{regime_col}"
-                    interaction = surprise_data[surprise_col].mul(
-                        regime_data[regime_col], fill_value=np.nan
-                    )
-                    all_features[interaction_name] = interaction
-        
-        # Create DataFrame efficiently from dictionary
-        features = pd.DataFrame(all_features, index=surprise_data.index)
-        return features
+        interactions = VirtualInteractions(surprise_data[surprise_cols], regime_data[regime_cols])
+        if virtual:
+            return interactions
+        return interactions.to_frame()
     
     def create_event_window_features(
         self,
@@ -427,11 +559,16 @@ class FeatureEngineer:
         """
         Create event window indicators.
         
+        All event offsets are mapped to rows with a single sorted lookup on the
+        unique (normalized) dates of the index, and the indicators are written
+        with one scatter, so the cost is O((events x window) log N + N).
+        
         Args:
             data: DataFrame with time series data (must have DatetimeIndex)
             event_times: List of event times
-            pre_window: Days before event
-            post_window: Days after event
+            pre_window: Days before event (flagged together as ``pre_event``)
+            post_window: Days after event (one ``post_event_{i}d`` column per day;
+                ``post_event_1d``..``post_event_3d`` are always present)
             
         Returns:
             DataFrame with event window indicators
@@ -439,9 +576,8 @@ class FeatureEngineer:
         Note:
             P1 FIX: Properly normalizes dates for comparison to avoid timezone/time-of-day issues
         """
-        features = pd.DataFrame(index=data.index, columns=[
-            'pre_event', 'event_day', 'post_event_1d', 'post_event_2d', 'post_event_3d'
-        ], data=0)
+        n_post_columns = max(post_window, 3)
+        columns = ['pre_event', 'event_day'] + [f'post_event_{i}d' for i in range(1, n_post_columns + 1)]
         
         # P1 FIX: Normalize data index to date-only for daily comparison
         # This avoids issues when comparing event_time.date() to a DatetimeIndex
@@ -449,47 +585,51 @@ class FeatureEngineer:
             normalized_index = data.index.normalize()  # Set all times to midnight
         else:
             normalized_index = pd.DatetimeIndex(data.index)
-        
-        for event_time in event_times:
-            # Convert event_time to normalized datetime
-            if hasattr(event_time, 'date'):
-                event_date = pd.Timestamp(event_time.date())
-            else:
-                event_date = pd.Timestamp(event_time)
-            event_date = event_date.normalize()  # Ensure midnight
-            
-            # Pre-event window
-            for i in range(1, pre_window + 1):
-                pre_date = event_date - pd.Timedelta(days=i)
-                # Use normalized index for comparison
-                mask = normalized_index == pre_date
-                if mask.any():
-                    features.loc[mask, 'pre_event'] = 1
-            
-            # Event day
-            mask = normalized_index == event_date
-            if mask.any():
-                features.loc[mask, 'event_day'] = 1
-            
-            # Post-event windows
-            for i in range(1, post_window + 1):
-                post_date = event_date + pd.Timedelta(days=i)
-                mask = normalized_index == post_date
-                if mask.any():
-                    if i == 1:
-                        features.loc[mask, 'post_event_1d'] = 1
-                    elif i == 2:
-                        features.loc[mask, 'post_event_2d'] = 1
-                    elif i == 3:
-                        features.loc[mask, 'post_event_3d'] = 1
-        
-        return features
+        if normalized_index.tz is not None:
+            normalized_index = normalized_index.tz_localize(None)
+        
+        if len(event_times) == 0 or len(normalized_index) == 0:
+            return pd.DataFrame(0, index=data.index, columns=columns)
+        
+        # Unique sorted days and the row -> day mapping
+        unique_days, row_to_day = np.unique(normalized_index.values, return_inverse=True)
+        
+        # Normalized event dates
+        event_dates = pd.DatetimeIndex([
+            pd.Timestamp(event_time.date()) if hasattr(event_time, 'date') else pd.Timestamp(event_time)
+            for event_time in event_times
+        ]).normalize().values
+        
+        # Day offsets and the indicator column each offset writes to
+        offsets = np.concatenate([
+            -np.arange(1, pre_window + 1),
+            [0],
+            np.arange(1, post_window + 1)
+        ])
+        offset_columns = np.concatenate([
+            np.zeros(pre_window, dtype=np.intp),
+            [1],
+            np.arange(2, post_window + 2)
+        ]).astype(np.intp)
+        
+        # (events x offsets) target dates located in one lookup
+        targets = event_dates[:, None] + offsets[None, :].astype('timedelta64[D]')
+        positions, found = locate_sorted(unique_days, targets)
+        column_index = np.broadcast_to(offset_columns, targets.shape)
+        
+        # Scatter onto unique days, then expand to rows
+        day_flags = np.zeros((len(unique_days), len(columns)), dtype=np.int64)
+        day_flags[positions[found], column_index[found]] = 1
+        
+        return pd.DataFrame(day_flags[row_to_day.ravel()], index=data.index, columns=columns)
     
     def create_comprehensive_features(
         self,
         price_data: pd.DataFrame,
         economic_data: pd.DataFrame,
-        announcement_times: List[datetime] = None
+        announcement_times: List[datetime] = None,
+        virtual_interactions: bool = False,
+        returns_panel: Optional[ReturnsPanel] = None
     ) -> pd.DataFrame:
         """
         Create comprehensive feature set for analysis.
@@ -498,24 +638,29 @@ class FeatureEngineer:
             price_data: DataFrame with price data
             economic_data: DataFrame with economic indicators
             announcement_times: List of announcement times
+            virtual_interactions: Keep surprise x regime interactions virtual
+                (stored in ``self.interactions``) instead of adding a column
+                per pair to the feature matrix
+            returns_panel: Shared returns panel of the run; the log returns
+                behind the return, volatility and regime features are read
+                from it (None builds one over ``price_data``)
             
         Returns:
             DataFrame with all features
         """
         self.logger.info("Starting comprehensive feature creation...")
         all_features = pd.DataFrame(index=price_data.index)
+        panel = ReturnsPanel.for_data(price_data, returns_panel)
         
         # Return features
         self.logger.info("Creating return features...")
-        return_features = self.create_return_features(price_data)
+        return_features = self.create_return_features(price_data, returns_panel=panel)
         all_features = all_features.join(return_features, how='outer')
         self.logger.info(f"Added {len(return_features.columns)} return features")
         
         # Volatility features  
         self.logger.info("Creating volatility features...")
-        returns_data = pd.DataFrame()
-        for col in price_data.columns:
-            returns_data[col] = np.log(price_data[col] / price_data[col].shift(1))
+        returns_data = panel.log(price_data.columns, skip_gaps=False)
         
         volatility_features = self.create_volatility_features(returns_data)
         all_features = all_features.join(volatility_features, how='outer')
@@ -529,15 +674,22 @@ class FeatureEngineer:
         
         # Market regime features
         self.logger.info("Creating market regime features...")
-        regime_features = self.create_market_regime_features(price_data)
+        regime_features = self.create_market_regime_features(price_data, returns_panel=panel)
         all_features = all_features.join(regime_features, how='outer')
         self.logger.info(f"Added {len(regime_features.columns)} regime features")
         
         # Interaction features
         self.logger.info("Creating interaction features...")
-        interaction_features = self.create_interaction_features(surprise_features, regime_features)
-        all_features = all_features.join(interaction_features, how='outer')
-        self.logger.info(f"Added {len(interaction_features.columns)} interaction features")
+        if virtual_interactions:
+            self.interactions = self.create_interaction_features(surprise_features, regime_features, virtual=True)
+            self.logger.info(
+                f"Registered {len(self.interactions)} virtual interaction terms "
+                f"({self.interactions.nbytes / 1024**2:.1f} MB held)"
+            )
+        else:
+            interaction_features = self.create_interaction_features(surprise_features, regime_features)
+            all_features = all_features.join(interaction_features, how='outer')
+            self.logger.info(f"Added {len(interaction_features.columns)} interaction features")
         
         # Event window features
         if announcement_times:
@@ -571,12 +723,24 @@ class FeatureEngineer:
         
         return all_features
     
-    def create_analysis_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def create_analysis_features(
+        self,
+        data: pd.DataFrame,
+        feature_patterns: Optional[List[str]] = None,
+        virtual_interactions: bool = False,
+        returns_panel: Optional[ReturnsPanel] = None
+    ) -> pd.DataFrame:
         """
         Create analysis features from cleaned data.
         
         Args:
             data: Cleaned DataFrame with price and economic data
+            feature_patterns: Feature names or glob patterns to build through
+                the lazy FeatureRegistry; None builds the full feature set
+            virtual_interactions: Keep surprise x regime interactions out of
+                the feature matrix (see ``create_comprehensive_features``)
+            returns_panel: Shared returns panel of the run (built over
+                ``data`` when None)
             
         Returns:
             DataFrame with engineered features
@@ -600,18 +764,29 @@ class FeatureEngineer:
         
         price_data = data[price_columns] if price_columns else pd.DataFrame(index=data.index)
         economic_data = data[economic_columns] if economic_columns else pd.DataFrame(index=data.index)
+        returns_panel = ReturnsPanel.for_data(price_data, returns_panel)
         
         self.logger.info(f"Identified {len(price_columns)} price columns and {len(economic_columns)} economic columns")
         self.logger.debug(f"Price columns: {price_columns[:5]}{'...' if len(price_columns) > 5 else ''}")
         self.logger.debug(f"Economic columns: {economic_columns[:5]}{'...' if len(economic_columns) > 5 else ''}")
         
+        # Build only the requested features
+        if feature_patterns:
+            self.logger.info(f"Materializing requested features: {feature_patterns}")
+            self.feature_registry = FeatureRegistry(self, price_data, economic_data, returns_panel=returns_panel)
+            features = self.feature_registry.get(feature_patterns)
+            self.logger.info(
+                f"Built {len(features.columns)} of {len(self.feature_registry.feature_names)} available features"
+            )
         # Create comprehensive features
-        if not price_data.empty:
+        elif not price_data.empty:
             self.logger.info("Creating comprehensive features from price and economic data...")
             features = self.create_comprehensive_features(
                 price_data=price_data,
                 economic_data=economic_data,
-                announcement_times=None  # Could be enhanced to include actual announcement times
+                announcement_times=None,  # Could be enhanced to include actual announcement times
+                virtual_interactions=virtual_interactions,
+                returns_panel=returns_panel
             )
         else:
             # If no price data, just create surprise measures from economic data
@@ -0,0 +1,263 @@
+"""
+Redundant-feature pruning for the engineered feature matrix.
+
+Many engineered features are near-duplicates of each other (e.g.
+``cumret_Nd`` is ``N x return_mean_Nd``, and overlapping windows of the same
+statistic move together). ``FeaturePruner`` groups features whose absolute
+pairwise-complete correlation reaches a threshold and keeps one
+representative per group, so regression, event-study and quality stages
+work on a much smaller matrix.
+
+Correlations are computed block by block against the representatives chosen
+so far, so the full dense (features x features) correlation matrix is never
+materialized. The resulting manifest (kept and dropped features, groups) is
+cached as JSON keyed by a fingerprint of the feature matrix and settings,
+so re-runs on the same data skip the correlation pass.
+
+Example:
+    pruner = FeaturePruner(threshold=0.98, cache_path="data/processed/pruning.json")
+    pruned = pruner.fit_transform(features, keep=prices.columns)
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Any
+from fnmatch import fnmatchcase
+from pathlib import Path
+import hashlib
+import json
+import logging
+
+
+def pairwise_complete_corr(
+    x: np.ndarray,
+    y: np.ndarray,
+    min_periods: int = 1
+) -> np.ndarray:
+    """
+    Pearson correlations between the columns of two arrays, each pair using
+    only the rows where both values are present (like ``DataFrame.corr``).
+
+    Args:
+        x: 2-D array (rows x p); NaN marks missing values
+        y: 2-D array (rows x q); NaN marks missing values
+        min_periods: Minimum overlapping observations for a non-NaN result
+
+    Returns:
+        Array (p x q) of correlations; NaN where the overlap is too short or
+        either column is constant over it
+    """
+    x_valid = ~np.isnan(x)
+    y_valid = ~np.isnan(y)
+    x_filled = np.where(x_valid, x, 0.0)
+    y_filled = np.where(y_valid, y, 0.0)
+    x_mask = x_valid.astype(float)
+    y_mask = y_valid.astype(float)
+
+    n = x_mask.T @ y_mask
+    sum_x = x_filled.T @ y_mask
+    sum_y = x_mask.T @ y_filled
+    sum_xx = (x_filled * x_filled).T @ y_mask
+    sum_yy = x_mask.T @ (y_filled * y_filled)
+    sum_xy = x_filled.T @ y_filled
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x * sum_x / n
+        var_y = sum_yy - sum_y * sum_y / n
+        # Relative tolerance guards against rounding noise on constant overlaps
+        degenerate = (var_x <= 1e-12 * np.maximum(sum_xx, 1e-300)) | (var_y <= 1e-12 * np.maximum(sum_yy, 1e-300))
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr = np.where((n >= max(min_periods, 2)) & ~degenerate, np.clip(corr, -1.0, 1.0), np.nan)
+    return corr
+
+
+class FeaturePruner:
+    """Reduce groups of highly correlated features to one representative each."""
+
+    def __init__(
+        self,
+        threshold: float = 0.98,
+        min_periods: int = 30,
+        block_size: int = 256,
+        protect: Optional[List[str]] = None,
+        cache_path: Optional[str] = None
+    ):
+        """
+        Args:
+            threshold: Absolute correlation at or above which two features are
+                treated as redundant
+            min_periods: Minimum overlapping observations for a correlation
+            block_size: Number of features correlated per block
+            protect: Glob patterns of features that are never pruned (and
+                never used as representatives)
+            cache_path: JSON file for the pruning manifest; None disables caching
+        """
+        self.logger = logging.getLogger(f"{__name__}.FeaturePruner")
+        self.threshold = threshold
+        self.min_periods = min_periods
+        self.block_size = block_size
+        self.protect = list(protect or [])
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.manifest: Optional[Dict[str, Any]] = None
+
+    def _is_protected(self, column: str) -> bool:
+        return any(fnmatchcase(str(column), pattern) for pattern in self.protect)
+
+    def _fingerprint(self, features: pd.DataFrame, keep: List[str]) -> str:
+        """Hash of the feature matrix (names, index, values) and pruning settings."""
+        digest = hashlib.sha256()
+        settings = {
+            'threshold': self.threshold,
+            'min_periods': self.min_periods,
+            'protect': self.protect,
+            'keep': keep
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update(json.dumps([str(col) for col in features.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(features, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _load_cached(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return None
+        try:
+            with open(self.cache_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable pruning manifest {self.cache_path}: {e}")
+            return None
+        return manifest if manifest.get('fingerprint') == fingerprint else None
+
+    def _save(self, manifest: Dict[str, Any]) -> None:
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        self.logger.info(f"Pruning manifest saved to {self.cache_path}")
+
+    def _group(self, values: np.ndarray) -> np.ndarray:
+        """
+        Leader clustering: visit features by decreasing number of valid
+        observations; each feature joins the first representative it is
+        correlated with, otherwise it becomes a representative itself.
+
+        Returns:
+            Array mapping every column to the column index of its representative
+        """
+        n_rows, n_features = values.shape
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+
+        # Standardize to keep the power sums well conditioned
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+            centered = np.where(valid, values - means, np.nan)
+            scales = np.sqrt(np.nansum(centered * centered, axis=0) / np.maximum(counts, 1))
+        standardized = centered / np.where(scales > 0, scales, 1.0)
+
+        order = np.argsort(-counts, kind='stable')
+        representative = np.arange(n_features)
+        leaders = np.empty(0, dtype=int)
+
+        for start in range(0, n_features, self.block_size):
+            block = order[start:start + self.block_size]
+            block_values = standardized[:, block]
+            absorbed = np.full(len(block), -1)
+
+            # Against representatives chosen in earlier blocks
+            for lead_start in range(0, len(leaders), self.block_size):
+                lead = leaders[lead_start:lead_start + self.block_size]
+                corr = pairwise_complete_corr(block_values, standardized[:, lead], self.min_periods)
+                hits = np.abs(np.nan_to_num(corr)) >= self.threshold
+                newly = hits.any(axis=1) & (absorbed < 0)
+                absorbed[newly] = lead[hits.argmax(axis=1)[newly]]
+
+            # Within the block, in priority order
+            internal = np.abs(np.nan_to_num(pairwise_complete_corr(block_values, block_values, self.min_periods)))
+            block_leaders = []
+            for i in range(len(block)):
+                if absorbed[i] >= 0:
+                    continue
+                hits = np.flatnonzero(internal[i, block_leaders] >= self.threshold) if block_leaders else []
+                if len(hits):
+                    absorbed[i] = block[block_leaders[hits[0]]]
+                else:
+                    block_leaders.append(i)
+
+            representative[block] = np.where(absorbed >= 0, absorbed, block)
+            leaders = np.concatenate([leaders, block[block_leaders]])
+
+        return representative
+
+    def fit(self, features: pd.DataFrame, keep: Optional[Iterable[str]] = None) -> "FeaturePruner":
+        """
+        Find redundant feature groups (or load them from the cache).
+
+        Args:
+            features: Engineered feature matrix
+            keep: Columns that are never pruned (and never used as
+                representatives), e.g. the raw price columns the features
+                were built from
+
+        Returns:
+            self, with ``manifest`` populated
+        """
+        keep = sorted({str(col) for col in keep}) if keep is not None else []
+        fingerprint = self._fingerprint(features, keep)
+        cached = self._load_cached(fingerprint)
+        if cached is not None:
+            self.manifest = cached
+            self.logger.info(
+                f"Loaded cached pruning manifest: keeping {len(cached['kept'])} of {cached['n_features']} features"
+            )
+            return self
+
+        numeric = features.select_dtypes(include=[np.number])
+        kept_columns = set(keep)
+        candidates = [
+            col for col in numeric.columns if str(col) not in kept_columns and not self._is_protected(col)
+        ]
+        self.logger.info(
+            f"Pruning {len(candidates)} candidate features "
+            f"(threshold={self.threshold}, block_size={self.block_size})"
+        )
+
+        values = numeric[candidates].to_numpy(dtype=float)
+        values[~np.isfinite(values)] = np.nan
+        representative = self._group(values) if candidates else np.empty(0, dtype=int)
+
+        groups: Dict[str, List[str]] = {}
+        for member, leader in enumerate(representative):
+            if member != leader:
+                groups.setdefault(str(candidates[leader]), []).append(str(candidates[member]))
+        dropped = {member for members in groups.values() for member in members}
+
+        self.manifest = {
+            'fingerprint': fingerprint,
+            'threshold': self.threshold,
+            'min_periods': self.min_periods,
+            'n_features': len(features.columns),
+            'kept': [str(col) for col in features.columns if str(col) not in dropped],
+            'dropped': [str(col) for col in features.columns if str(col) in dropped],
+            'groups': groups
+        }
+        self.logger.info(
+            f"Pruned {len(dropped)} redundant features in {len(groups)} groups; "
+            f"keeping {len(self.manifest['kept'])} of {len(features.columns)}"
+        )
+        self._save(self.manifest)
+        return self
+
+    def transform(self, features: pd.DataFrame) -> pd.DataFrame:
+        """Drop the redundant features recorded in the manifest."""
+        if self.manifest is None:
+            raise ValueError("FeaturePruner must be fitted before transform")
+        dropped = set(self.manifest['dropped'])
+        return features[[col for col in features.columns if str(col) not in dropped]]
+
+    def fit_transform(self, features: pd.DataFrame, keep: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Fit on ``features`` (never pruning ``keep``) and return the pruned matrix."""
+        return self.fit(features, keep=keep).transform(features)
@@ -0,0 +1,428 @@
+"""
+Lazy feature registry for on-demand feature materialization.
+
+``FeatureEngineer.create_comprehensive_features`` builds every return,
+volatility, surprise, regime, interaction and event feature up front. The
+registry instead describes each feature family (its inputs, parameters and
+the feature names it can produce) and only computes the features that are
+requested by name or glob pattern, together with whatever they depend on.
+Computed columns are cached, so later requests reuse them.
+
+Example:
+    registry = FeatureRegistry(engineer, price_data, economic_data)
+    features = registry.get(['stocks_sp500_return', '*_realized_vol_20d'])
+"""
+
+import pandas as pd
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Any, Hashable, Iterable, Union
+from datetime import datetime
+from fnmatch import fnmatchcase
+import logging
+
+
+class FeatureFamily(ABC):
+    """
+    A group of features computed together from shared inputs.
+
+    Subclasses enumerate the features they can produce as a mapping from
+    feature name to a computation key (e.g. the source column), and build
+    the features for a set of keys on request.
+    """
+
+    name = 'family'
+
+    def __init__(self, inputs: List[str], **params):
+        """
+        Args:
+            inputs: Registry inputs or families this family reads from
+            **params: Parameters passed to the underlying builder
+        """
+        self.inputs = inputs
+        self.params = params
+
+    @abstractmethod
+    def enumerate(self, registry: "FeatureRegistry") -> Dict[str, Hashable]:
+        """Return ``{feature_name: computation_key}`` without computing anything."""
+        pass
+
+    @abstractmethod
+    def build(self, registry: "FeatureRegistry", keys: List[Hashable]) -> pd.DataFrame:
+        """Compute (at least) the features belonging to ``keys``."""
+        pass
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(inputs={self.inputs}, params={self.params})"
+
+
+class PerColumnFamily(FeatureFamily):
+    """Family whose features are computed independently per source column."""
+
+    def eligible(self, registry: "FeatureRegistry", column: str) -> bool:
+        return True
+
+    @abstractmethod
+    def column_features(self, registry: "FeatureRegistry", column: str) -> List[str]:
+        pass
+
+    @abstractmethod
+    def build_columns(self, registry: "FeatureRegistry", data: pd.DataFrame) -> pd.DataFrame:
+        pass
+
+    def enumerate(self, registry: "FeatureRegistry") -> Dict[str, Hashable]:
+        source = registry.input(self.inputs[0])
+        catalog = {}
+        for column in source.columns:
+            if self.eligible(registry, column):
+                for feature in self.column_features(registry, column):
+                    catalog[feature] = column
+        return catalog
+
+    def build(self, registry: "FeatureRegistry", keys: List[Hashable]) -> pd.DataFrame:
+        source = registry.input(self.inputs[0])
+        return self.build_columns(registry, source[list(keys)])
+
+
+class ReturnFeatures(PerColumnFamily):
+    """Log returns and rolling return moments per price series."""
+
+    name = 'returns'
+
+    def __init__(self, windows: List[int] = [1, 5, 10, 20]):
+        super().__init__(['prices'], windows=list(windows))
+
+    def eligible(self, registry, column):
+        return registry.valid_counts('prices')[column] > max(self.params['windows'])
+
+    def column_features(self, registry, column):
+        features = [f"{column}_return"]
+        for window in self.params['windows']:
+            features.extend([
+                f"{column}_return_mean_{window}d",
+                f"{column}_volatility_{window}d",
+                f"{column}_skewness_{window}d",
+                f"{column}_kurtosis_{window}d",
+                f"{column}_cumret_{window}d"
+            ])
+        return features
+
+    def build_columns(self, registry, data):
+        return registry.engineer.create_return_features(
+            data, windows=self.params['windows'], returns_panel=registry.returns_panel
+        )
+
+
+class VolatilityFeatures(PerColumnFamily):
+    """Realized, exponentially smoothed and jump volatility per return series."""
+
+    name = 'volatility'
+
+    def __init__(self, windows: List[int] = [5, 10, 20, 60]):
+        super().__init__(['log_returns'], windows=list(windows))
+
+    def eligible(self, registry, column):
+        return registry.valid_counts('log_returns')[column] > max(self.params['windows'])
+
+    def column_features(self, registry, column):
+        features = []
+        for window in self.params['windows']:
+            features.extend([
+                f"{column}_realized_vol_{window}d",
+                f"{column}_exp_vol_{window}d",
+                f"{column}_jump_{window}d"
+            ])
+        return features
+
+    def build_columns(self, registry, data):
+        return registry.engineer.create_volatility_features(data, windows=self.params['windows'])
+
+
+class SurpriseFeatures(PerColumnFamily):
+    """Proxy surprise measures per economic series."""
+
+    name = 'surprise'
+
+    def __init__(self):
+        super().__init__(['economic'])
+
+    def column_features(self, registry, column):
+        prefix = registry.surprise_prefix
+        return [
+            f"{prefix}{column}_surprise",
+            f"{prefix}{column}_normalized_surprise",
+            f"{prefix}{column}_sign",
+            f"{prefix}{column}_abs_surprise"
+        ]
+
+    def build_columns(self, registry, data):
+        return registry.engineer.create_surprise_measures(data)
+
+
+class RegimeFeatures(FeatureFamily):
+    """Market regime indicators (S&P 500 based) and per-asset volatility percentiles."""
+
+    name = 'regime'
+
+    def __init__(
+        self,
+        volatility_threshold: float = 0.015,
+        volatility_quantile: Optional[float] = None,
+        percentile_window: int = 252
+    ):
+        super().__init__(
+            ['prices'],
+            volatility_threshold=volatility_threshold,
+            volatility_quantile=volatility_quantile,
+            percentile_window=percentile_window
+        )
+
+    def enumerate(self, registry):
+        # Building on zero rows yields the column set without any computation
+        empty = registry.input('prices').iloc[:0]
+        names = registry.engineer.create_market_regime_features(empty, **self.params).columns
+        return {name: None for name in names}
+
+    def build(self, registry, keys):
+        return registry.engineer.create_market_regime_features(
+            registry.input('prices'), returns_panel=registry.returns_panel, **self.params
+        )
+
+
+class InteractionFeatures(FeatureFamily):
+    """Surprise x regime interactions, materialized per requested pair."""
+
+    name = 'interaction'
+
+    def __init__(self):
+        super().__init__(['surprise', 'regime'])
+
+    def enumerate(self, registry):
+        surprise_cols = [name for name in registry.family_features('surprise') if 'surprise' in name]
+        regime_cols = [name for name in registry.family_features('regime')
+                       if 'regime' in name or 'market' in name]
+        return {
+            f"{surprise_col}_x_{regime_col}": (surprise_col, regime_col)
+            for surprise_col in surprise_cols
+            for regime_col in regime_cols
+        }
+
+    def build(self, registry, keys):
+        surprise_cols = list(dict.fromkeys(key[0] for key in keys))
+        regime_cols = list(dict.fromkeys(key[1] for key in keys))
+        surprise_data = registry.get(surprise_cols)
+        regime_data = registry.get(regime_cols)
+
+        features = {}
+        for surprise_col, regime_col in keys:
+            features[f"{surprise_col}_x_{regime_col}"] = surprise_data[surprise_col].mul(
+                regime_data[regime_col], fill_value=np.nan
+            )
+        return pd.DataFrame(features, index=registry.index)
+
+
+class EventWindowFeatures(FeatureFamily):
+    """Pre/event/post window indicators for the registry's announcement times."""
+
+    name = 'event'
+
+    def __init__(self, pre_window: int = 1, post_window: int = 3):
+        super().__init__(['announcement_times'], pre_window=pre_window, post_window=post_window)
+
+    def enumerate(self, registry):
+        if not registry.announcement_times:
+            return {}
+        columns = ['pre_event', 'event_day'] + [
+            f'post_event_{i}d' for i in range(1, max(self.params['post_window'], 3) + 1)
+        ]
+        return {name: None for name in columns}
+
+    def build(self, registry, keys):
+        return registry.engineer.create_event_window_features(
+            pd.DataFrame(index=registry.index),
+            registry.announcement_times,
+            **self.params
+        )
+
+
+class FeatureRegistry:
+    """
+    Catalog of feature families with lazy, cached materialization.
+
+    Features are addressed by name or by glob pattern (``fnmatch`` syntax,
+    e.g. ``'crypto_*_volatility_20d'``). Only the families and source
+    columns behind the requested names are computed.
+    """
+
+    def __init__(
+        self,
+        engineer,
+        price_data: pd.DataFrame,
+        economic_data: Optional[pd.DataFrame] = None,
+        announcement_times: Optional[List[datetime]] = None,
+        families: Optional[List[FeatureFamily]] = None,
+        returns_panel=None
+    ):
+        """
+        Args:
+            engineer: FeatureEngineer providing the family builders
+            price_data: DataFrame with price series
+            economic_data: DataFrame with economic indicators
+            announcement_times: Event times for event window features
+            families: Families to register (defaults mirror
+                ``create_comprehensive_features``)
+            returns_panel: Shared ReturnsPanel the log returns are read from
+                (None computes them from ``price_data``)
+        """
+        self.engineer = engineer
+        self.returns_panel = returns_panel
+        self.logger = logging.getLogger(f"{__name__}.FeatureRegistry")
+        self.announcement_times = list(announcement_times) if announcement_times else []
+
+        if economic_data is None:
+            economic_data = pd.DataFrame(index=price_data.index)
+        self.index = price_data.index
+        if not economic_data.index.equals(price_data.index):
+            self.index = price_data.index.union(economic_data.index)
+
+        self._inputs: Dict[str, pd.DataFrame] = {'prices': price_data, 'economic': economic_data}
+        self._valid_counts: Dict[str, pd.Series] = {}
+        self._surprise_prefix: Optional[str] = None
+
+        self._families: Dict[str, FeatureFamily] = {}
+        self._catalog: Optional[Dict[str, tuple]] = None
+        self._cache: Dict[str, pd.Series] = {}
+        self.n_builds = 0
+
+        if families is None:
+            families = [
+                ReturnFeatures(),
+                VolatilityFeatures(),
+                SurpriseFeatures(),
+                RegimeFeatures(),
+                InteractionFeatures(),
+                EventWindowFeatures()
+            ]
+        for family in families:
+            self.register(family)
+
+    def register(self, family: FeatureFamily) -> None:
+        """Add (or replace) a feature family."""
+        self._families[family.name] = family
+        self._catalog = None
+
+    def input(self, name: str) -> pd.DataFrame:
+        """Return a registry input, deriving ``log_returns`` on first use."""
+        if name not in self._inputs:
+            if name == 'log_returns':
+                prices = self._inputs['prices']
+                if self.returns_panel is not None:
+                    self._inputs[name] = self.returns_panel.include(prices).log(prices.columns, skip_gaps=False)
+                else:
+                    self._inputs[name] = np.log(prices / prices.shift(1))
+            else:
+                raise KeyError(f"Unknown registry input: {name}")
+        return self._inputs[name]
+
+    def valid_counts(self, name: str) -> pd.Series:
+        """Non-missing observations per column of an input (cached)."""
+        if name not in self._valid_counts:
+            self._valid_counts[name] = self.input(name).notna().sum()
+        return self._valid_counts[name]
+
+    @property
+    def surprise_prefix(self) -> str:
+        if self._surprise_prefix is None:
+            self._surprise_prefix = self.engineer._proxy_surprise_prefix()
+        return self._surprise_prefix
+
+    @property
+    def catalog(self) -> Dict[str, tuple]:
+        """``{feature_name: (family_name, key)}`` for every available feature."""
+        if self._catalog is None:
+            catalog = {}
+            for family_name, family in self._families.items():
+                for feature, key in family.enumerate(self).items():
+                    catalog.setdefault(feature, (family_name, key))
+            self._catalog = catalog
+        return self._catalog
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.catalog)
+
+    def family_features(self, family_name: str) -> List[str]:
+        """Names of the features a family can produce."""
+        if family_name not in self._families:
+            return []
+        return list(self._families[family_name].enumerate(self))
+
+    def resolve(self, patterns: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Expand names and glob patterns to catalog feature names.
+
+        Args:
+            patterns: Feature name, pattern, or list of them
+
+        Returns:
+            Matching feature names in request order, without duplicates
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+
+        resolved = {}
+        for pattern in patterns:
+            if pattern in self.catalog:
+                resolved[pattern] = None
+                continue
+            matches = [name for name in self.catalog if fnmatchcase(name, pattern)]
+            if not matches:
+                self.logger.warning(f"No features match '{pattern}'")
+            resolved.update(dict.fromkeys(matches))
+        return list(resolved)
+
+    def get(self, patterns: Union[str, Iterable[str]]) -> pd.DataFrame:
+        """
+        Materialize the requested features (computing only what is missing).
+
+        Args:
+            patterns: Feature name, pattern, or list of them
+
+        Returns:
+            DataFrame with the requested features on the registry index
+        """
+        names = self.resolve(patterns)
+        missing = [name for name in names if name not in self._cache]
+
+        # Group the missing features by family and computation key
+        pending: Dict[str, Dict[Hashable, None]] = {}
+        for name in missing:
+            family_name, key = self.catalog[name]
+            pending.setdefault(family_name, {})[key] = None
+
+        for family_name, keys in pending.items():
+            built = self._families[family_name].build(self, list(keys))
+            self.n_builds += 1
+            if not built.index.equals(self.index):
+                built = built.reindex(self.index)
+            for column in built.columns:
+                if column in self.catalog:
+                    self._cache.setdefault(column, built[column])
+            self.logger.debug(f"Built {len(built.columns)} '{family_name}' features for {len(keys)} keys")
+
+        return pd.DataFrame({name: self._cache[name] for name in names}, index=self.index, columns=names)
+
+    @property
+    def cached_features(self) -> List[str]:
+        return list(self._cache)
+
+    def summary(self) -> Dict[str, Any]:
+        """Available vs materialized feature counts per family."""
+        summary = {}
+        for family_name in self._families:
+            available = [name for name, (family, _) in self.catalog.items() if family == family_name]
+            summary[family_name] = {
+                'available': len(available),
+                'materialized': sum(name in self._cache for name in available)
+            }
+        return summary
@@ -0,0 +1,329 @@
+"""
+Incremental (online) updates of rolling return and volatility features.
+
+Appending a trading day used to mean recomputing every rolling feature over
+the full history. ``IncrementalFeatureState`` keeps, per asset, the state
+those features need:
+
+- the last price (for the next log return),
+- a ring buffer of the last ``max(window)`` returns,
+- running sums of centered powers (count, x, x^2, x^3, x^4) for every window,
+  periodically re-synchronised from the ring buffer to bound rounding drift,
+- the run length of identical values (pandas' uniform-window rule),
+- the exponentially weighted mean/variance recursion used by
+  ``Series.ewm(alpha).std()``.
+
+Each appended row updates all features in O(assets x windows) time. The
+output columns and values match ``FeatureEngineer.create_return_features``
+and ``create_volatility_features`` run over the full history, up to
+floating-point rounding.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+src_path = Path(__file__).parent.parent
+sys.path.insert(0, str(src_path))
+
+from utils.rolling import moments_from_sums
+
+RETURN_STATS = ('mean', 'std', 'skew', 'kurt', 'sum')
+
+
+class IncrementalFeatureState:
+    """Rolling state for return and volatility features, updated row by row."""
+
+    def __init__(
+        self,
+        assets: List[str],
+        return_windows: List[int] = [1, 5, 10, 20],
+        volatility_windows: List[int] = [5, 10, 20, 60],
+        resync_every: int = 252
+    ):
+        """
+        Args:
+            assets: Price columns tracked by the state
+            return_windows: Windows of the return features
+            volatility_windows: Windows of the volatility features
+            resync_every: Appends between exact re-computations of the
+                running sums from the ring buffer
+        """
+        self.logger = logging.getLogger(f"{__name__}.IncrementalFeatureState")
+        self.assets = list(assets)
+        self.return_windows = list(return_windows)
+        self.volatility_windows = list(volatility_windows)
+        self.resync_every = resync_every
+
+        n_assets = len(self.assets)
+        self.windows = np.array(sorted(set(self.return_windows) | set(self.volatility_windows)))
+        self._window_pos = {int(window): i for i, window in enumerate(self.windows)}
+        self.max_window = int(self.windows.max())
+
+        # Assets that produce each feature family (fixed when the state is primed)
+        self.return_assets = np.ones(n_assets, dtype=bool)
+        self.volatility_assets = np.ones(n_assets, dtype=bool)
+
+        # Return and rolling-window state
+        self.last_price = np.full(n_assets, np.nan)
+        self.center = np.zeros(n_assets)
+        self.ring = np.full((n_assets, self.max_window), np.nan)
+        self.head = 0
+        self.sums = np.zeros((5, n_assets, len(self.windows)))
+        self.last_valid = np.full(n_assets, np.nan)
+        self.same_run = np.zeros(n_assets)
+
+        # EWM variance recursion (pandas ewmcov with adjust=True, bias=False)
+        shape = (n_assets, len(self.volatility_windows))
+        self.alphas = np.array([2 / (window + 1) for window in self.volatility_windows])
+        self.ewm_mean = np.full(shape, np.nan)
+        self.ewm_cov = np.zeros(shape)
+        self.ewm_sum_wt = np.ones(shape)
+        self.ewm_sum_wt2 = np.ones(shape)
+        self.ewm_old_wt = np.ones(shape)
+        self.ewm_nobs = np.zeros(shape)
+
+        self.n_updates = 0
+
+    @classmethod
+    def from_history(
+        cls,
+        price_data: pd.DataFrame,
+        return_windows: List[int] = [1, 5, 10, 20],
+        volatility_windows: List[int] = [5, 10, 20, 60],
+        resync_every: int = 252
+    ) -> "IncrementalFeatureState":
+        """
+        Prime the state from a price history.
+
+        Asset eligibility follows the batch feature functions (more valid
+        observations than the longest window) and is fixed from here on.
+        """
+        state = cls(price_data.columns, return_windows, volatility_windows, resync_every)
+        prices = price_data.to_numpy(dtype=float)
+        returns = state._log_returns(prices)
+
+        state.return_assets = price_data.notna().sum().to_numpy() > max(state.return_windows)
+        state.volatility_assets = (~np.isnan(returns)).sum(axis=0) > max(state.volatility_windows)
+
+        valid = ~np.isnan(returns)
+        counts = valid.sum(axis=0)
+        state.center = np.where(counts > 0, np.where(valid, returns, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+
+        # Replay the recursive parts (EWM and identical-value runs)
+        for row in returns:
+            state._update_recursions(row)
+
+        if len(prices):
+            state.last_price = prices[-1].copy()
+
+        # Fill the ring buffer with the most recent returns (oldest first)
+        recent = returns[-state.max_window:]
+        state.ring[:, :len(recent)] = recent.T
+        state.head = len(recent) % state.max_window
+        state._resync()
+        return state
+
+    @staticmethod
+    def _log_returns(prices: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices[1:] / prices[:-1])
+        returns = np.vstack([np.full((1, prices.shape[1]), np.nan), returns])
+        returns[np.isinf(returns)] = np.nan
+        return returns
+
+    @property
+    def return_columns(self) -> List[str]:
+        names = ['mean', 'volatility', 'skewness', 'kurtosis', 'cumret']
+        columns = []
+        for asset, active in zip(self.assets, self.return_assets):
+            if active:
+                columns.append(f"{asset}_return")
+                for window in self.return_windows:
+                    columns.extend(
+                        f"{asset}_return_{name}_{window}d" if name == 'mean' else f"{asset}_{name}_{window}d"
+                        for name in names
+                    )
+        return columns
+
+    @property
+    def volatility_columns(self) -> List[str]:
+        columns = []
+        for asset, active in zip(self.assets, self.volatility_assets):
+            if active:
+                for window in self.volatility_windows:
+                    columns.extend([
+                        f"{asset}_realized_vol_{window}d",
+                        f"{asset}_exp_vol_{window}d",
+                        f"{asset}_jump_{window}d"
+                    ])
+        return columns
+
+    def _update_recursions(self, returns: np.ndarray) -> None:
+        """Advance the EWM variance and identical-value run by one row."""
+        valid = ~np.isnan(returns)
+
+        # Run length of identical valid values
+        repeat = valid & (returns == self.last_valid)
+        self.same_run = np.where(valid, np.where(repeat, self.same_run + 1, 1), self.same_run)
+        self.last_valid = np.where(valid, returns, self.last_valid)
+
+        # EWM recursion, vectorized over assets and windows
+        x = returns[:, None]
+        obs = np.broadcast_to(valid[:, None], self.ewm_mean.shape)
+        has_mean = ~np.isnan(self.ewm_mean)
+        decay = 1 - self.alphas
+
+        self.ewm_sum_wt = np.where(has_mean, self.ewm_sum_wt * decay, self.ewm_sum_wt)
+        self.ewm_sum_wt2 = np.where(has_mean, self.ewm_sum_wt2 * decay * decay, self.ewm_sum_wt2)
+        self.ewm_old_wt = np.where(has_mean, self.ewm_old_wt * decay, self.ewm_old_wt)
+
+        update = has_mean & obs
+        old_mean = self.ewm_mean
+        with np.errstate(invalid='ignore'):
+            new_mean = np.where(
+                old_mean != x,
+                (self.ewm_old_wt * old_mean + x) / (self.ewm_old_wt + 1.0),
+                old_mean
+            )
+            new_cov = (
+                self.ewm_old_wt * (self.ewm_cov + (old_mean - new_mean) * (old_mean - new_mean))
+                + (x - new_mean) * (x - new_mean)
+            ) / (self.ewm_old_wt + 1.0)
+
+        self.ewm_mean = np.where(update, new_mean, np.where(~has_mean & obs, x, old_mean))
+        self.ewm_cov = np.where(update, new_cov, self.ewm_cov)
+        self.ewm_sum_wt = np.where(update, self.ewm_sum_wt + 1.0, self.ewm_sum_wt)
+        self.ewm_sum_wt2 = np.where(update, self.ewm_sum_wt2 + 1.0, self.ewm_sum_wt2)
+        self.ewm_old_wt = np.where(update, self.ewm_old_wt + 1.0, self.ewm_old_wt)
+        self.ewm_nobs = self.ewm_nobs + obs
+
+    def _ewm_std(self) -> np.ndarray:
+        """Current EWM standard deviation (bias-corrected), NaN where undefined."""
+        numerator = self.ewm_sum_wt * self.ewm_sum_wt
+        denominator = numerator - self.ewm_sum_wt2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(
+                (self.ewm_nobs >= 1) & (denominator > 0),
+                numerator / denominator * self.ewm_cov,
+                np.nan
+            )
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    def _centered_powers(self, values: np.ndarray) -> np.ndarray:
+        """Stack (valid, x, x^2, x^3, x^4) of centered values; NaNs contribute 0."""
+        valid = ~np.isnan(values)
+        center = self.center.reshape((-1,) + (1,) * (values.ndim - 1))
+        centered = np.where(valid, values - center, 0.0)
+        squared = centered * centered
+        return np.stack([valid.astype(float), centered, squared, squared * centered, squared * squared])
+
+    def _resync(self) -> None:
+        """Recompute the running window sums exactly from the ring buffer."""
+        # Most recent return first
+        recent = self.ring[:, (self.head - 1 - np.arange(self.max_window)) % self.max_window]
+        powers = self._centered_powers(recent)
+        cumulative = np.cumsum(powers, axis=2)
+        self.sums = cumulative[:, :, self.windows - 1]
+
+    def update(self, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Advance the state by one row of prices.
+
+        Args:
+            prices: Prices for ``self.assets`` (NaN for missing)
+
+        Returns:
+            Dictionary with the row's 'returns', 'moments' (assets x windows
+            x RETURN_STATS), 'variance' (assets x windows) and 'ewm_std'
+            (assets x volatility windows)
+        """
+        prices = np.asarray(prices, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices / self.last_price)
+        returns[np.isinf(returns)] = np.nan
+        self.last_price = prices
+
+        # Running window sums: add the new return, drop the one leaving each window
+        leaving = self.ring[:, (self.head - self.windows) % self.max_window]
+        self.sums += self._centered_powers(returns)[:, :, None] - self._centered_powers(leaving)
+        self.ring[:, self.head] = returns
+        self.head = (self.head + 1) % self.max_window
+
+        self._update_recursions(returns)
+
+        self.n_updates += 1
+        if self.resync_every and self.n_updates % self.resync_every == 0:
+            self._resync()
+
+        n_assets, n_windows = len(self.assets), len(self.windows)
+        moments = np.empty((n_assets, n_windows, len(RETURN_STATS)))
+        variance = np.empty((n_assets, n_windows))
+        for w_idx, window in enumerate(self.windows):
+            window_stats = moments_from_sums(
+                self.sums[:, :, w_idx], self.center, self.same_run, int(window),
+                stats=RETURN_STATS + ('var',)
+            )
+            moments[:, w_idx, :] = window_stats[:-1].T
+            variance[:, w_idx] = window_stats[-1]
+
+        return {
+            'returns': returns,
+            'moments': moments,
+            'variance': variance,
+            'ewm_std': self._ewm_std()
+        }
+
+    def append(self, new_prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append rows of prices and return their feature rows.
+
+        Args:
+            new_prices: New price rows (columns matched to the tracked assets;
+                untracked columns are ignored, missing ones treated as NaN)
+
+        Returns:
+            DataFrame indexed like ``new_prices`` with the return features
+            followed by the volatility features
+        """
+        prices = new_prices.reindex(columns=self.assets).to_numpy(dtype=float)
+        n_rows = len(prices)
+
+        return_idx = np.flatnonzero(self.return_assets)
+        vol_idx = np.flatnonzero(self.volatility_assets)
+        return_pos = [self._window_pos[window] for window in self.return_windows]
+        vol_pos = [self._window_pos[window] for window in self.volatility_windows]
+
+        return_block = np.empty((n_rows, len(return_idx), 1 + len(return_pos) * len(RETURN_STATS)))
+        realized = np.empty((n_rows, len(vol_idx), len(vol_pos)))
+        exp_vol = np.empty_like(realized)
+        jumps = np.empty(realized.shape, dtype=int)
+
+        for i, row in enumerate(prices):
+            result = self.update(row)
+            returns = result['returns']
+
+            return_block[i, :, 0] = returns[return_idx]
+            return_block[i, :, 1:] = result['moments'][return_idx][:, return_pos, :].reshape(len(return_idx), -1)
+
+            variance = result['variance'][vol_idx][:, vol_pos]
+            realized[i] = np.sqrt(variance * 252)
+            exp_vol[i] = result['ewm_std'][vol_idx] * np.sqrt(252)
+            with np.errstate(invalid='ignore'):
+                jumps[i] = np.abs(returns[vol_idx])[:, None] > np.sqrt(variance) * 3
+
+        features = {}
+        for column, values in zip(self.return_columns, return_block.reshape(n_rows, -1).T):
+            features[column] = values
+        vol_columns = iter(self.volatility_columns)
+        for a_idx in range(len(vol_idx)):
+            for w_idx in range(len(vol_pos)):
+                features[next(vol_columns)] = realized[:, a_idx, w_idx]
+                features[next(vol_columns)] = exp_vol[:, a_idx, w_idx]
+                features[next(vol_columns)] = jumps[:, a_idx, w_idx]
+
+        return pd.DataFrame(features, index=new_prices.index)
@@ -0,0 +1,137 @@
+"""
+Virtual surprise x regime interaction features.
+
+Materializing every surprise x regime product creates S x R columns. A
+``VirtualInteractions`` object instead keeps the S surprise and R regime
+columns once, plus the (surprise, regime) index pairs that define the
+interaction terms, so memory stays O(S + R) (plus two integers per term).
+Products are expanded only when needed, e.g. as a broadcasted block inside
+a regression design matrix.
+
+Example:
+    interactions = engineer.create_interaction_features(surprises, regimes, virtual=True)
+    block = interactions.select('*_x_bull_market').product_block()
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Iterable, List, Optional, Union
+from fnmatch import fnmatchcase
+
+
+class VirtualInteractions:
+    """Surprise x regime interactions stored as column index pairs."""
+
+    def __init__(
+        self,
+        surprise_data: pd.DataFrame,
+        regime_data: pd.DataFrame,
+        pairs: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            surprise_data: Surprise columns (defines the row index)
+            regime_data: Regime/market columns, aligned to the surprise index
+            pairs: Array (n_terms x 2) of (surprise, regime) column positions;
+                None pairs every surprise with every regime column
+        """
+        self.surprise_data = surprise_data
+        self.regime_data = regime_data.reindex(surprise_data.index)
+        self.surprise_columns = list(surprise_data.columns)
+        self.regime_columns = list(regime_data.columns)
+
+        if pairs is None:
+            s_idx, r_idx = np.meshgrid(
+                np.arange(len(self.surprise_columns)), np.arange(len(self.regime_columns)), indexing='ij'
+            )
+            pairs = np.column_stack([s_idx.ravel(), r_idx.ravel()])
+        self.pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    @property
+    def index(self) -> pd.Index:
+        return self.surprise_data.index
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the interaction terms, ``{surprise}_x_{regime}``."""
+        return [
+            f"{self.surprise_columns[s]}_x_{self.regime_columns[r]}"
+            for s, r in self.pairs
+        ]
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def select(self, terms: Union[str, Iterable[str], None] = None) -> "VirtualInteractions":
+        """
+        Subset of the interaction terms.
+
+        Args:
+            terms: Term names or glob patterns (e.g. ``'*_x_bull_market'``);
+                None keeps every term
+
+        Returns:
+            VirtualInteractions sharing the same surprise and regime columns
+        """
+        if terms is None:
+            return self
+        patterns = [terms] if isinstance(terms, str) else list(terms)
+        keep = [
+            i for i, name in enumerate(self.columns)
+            if any(fnmatchcase(name, pattern) for pattern in patterns)
+        ]
+        return VirtualInteractions(self.surprise_data, self.regime_data, self.pairs[keep])
+
+    def product_block(self, index: Optional[pd.Index] = None) -> np.ndarray:
+        """
+        Expand the interaction terms as one broadcasted product block.
+
+        Args:
+            index: Rows to expand (labels of the surprise index); None uses all rows
+
+        Returns:
+            Float array (rows x n_terms)
+        """
+        surprises = self.surprise_data if index is None else self.surprise_data.reindex(index)
+        regimes = self.regime_data if index is None else self.regime_data.reindex(index)
+        surprise_values = surprises.to_numpy(dtype=float)
+        regime_values = regimes.to_numpy(dtype=float)
+        return surprise_values[:, self.pairs[:, 0]] * regime_values[:, self.pairs[:, 1]]
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Materialize the interaction terms as a DataFrame.
+
+        Without ``index``, products of two integer columns keep an integer
+        dtype, as column-by-column multiplication would.
+        """
+        rows = self.index if index is None else index
+        block = self.product_block(index)
+        if index is not None:
+            return pd.DataFrame(block, index=rows, columns=self.columns)
+
+        surprise_dtypes = self.surprise_data.dtypes.to_numpy()
+        regime_dtypes = self.regime_data.dtypes.to_numpy()
+        columns = {}
+        for k, (name, (s, r)) in enumerate(zip(self.columns, self.pairs)):
+            dtype = np.result_type(surprise_dtypes[s], regime_dtypes[r])
+            columns[name] = block[:, k].astype(dtype) if dtype.kind in 'iu' else block[:, k]
+        return pd.DataFrame(columns, index=rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the virtual representation."""
+        return int(
+            self.surprise_data.memory_usage(index=False, deep=False).sum()
+            + self.regime_data.memory_usage(index=False, deep=False).sum()
+            + self.pairs.nbytes
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"VirtualInteractions(n_terms={len(self)}, surprises={len(self.surprise_columns)}, "
+            f"regimes={len(self.regime_columns)})"
+        )
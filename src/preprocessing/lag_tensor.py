@@ -0,0 +1,122 @@
+"""
+Lagged variables as a strided, read-only view.
+
+Adding ``L`` lags of ``C`` series as columns multiplies the dataset's
+memory by ``L``. ``LagTensor`` instead holds the series once (with
+``max_lag`` leading NaN rows) and exposes every lag as a view into that
+buffer: ``tensor`` is a (dates x columns x lags) array built with
+``numpy.lib.stride_tricks.as_strided`` whose lag axis steps backwards
+through the rows, so no lagged value is ever copied. Named columns such as
+``spy_return_lag3`` are materialized only when a consumer asks for them.
+
+Example:
+    lags = LagTensor(data[['spy_return', 'btc_return']], lags=range(1, 21))
+    lags.tensor.shape            # (dates, 2, 20), no copy
+    lags['spy_return_lag3']      # one Series
+    lags.to_frame('*_lag1')      # selected named columns
+"""
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from typing import Iterable, List, Union
+from fnmatch import fnmatchcase
+
+
+class LagTensor:
+    """Read-only strided view of lagged series (dates x columns x lags)."""
+
+    def __init__(self, data: pd.DataFrame, lags: Iterable[int] = (1, 2, 3, 5)):
+        """
+        Args:
+            data: Numeric series to lag (columns)
+            lags: Positive lags in rows
+        """
+        self.lags = sorted(set(int(lag) for lag in lags))
+        if not self.lags or self.lags[0] < 1:
+            raise ValueError(f"Lags must be positive integers, got {list(lags)}")
+        self.index = data.index
+        self.columns = list(data.columns)
+        self.max_lag = self.lags[-1]
+
+        # One buffer: max_lag NaN rows followed by the series
+        n_rows = len(data)
+        self._buffer = np.full((self.max_lag + n_rows, len(self.columns)), np.nan)
+        self._buffer[self.max_lag:] = data.to_numpy(dtype=float)
+        self._buffer.flags.writeable = False
+
+    @property
+    def tensor(self) -> np.ndarray:
+        """
+        Read-only view of shape (dates, columns, max_lag); ``tensor[t, c, j]``
+        is column ``c`` lagged by ``j + 1`` rows.
+        """
+        row_stride, col_stride = self._buffer.strides
+        start = self._buffer[self.max_lag - 1:]
+        return as_strided(
+            start,
+            shape=(len(self.index), len(self.columns), self.max_lag),
+            strides=(row_stride, col_stride, -row_stride),
+            writeable=False
+        )
+
+    def lag(self, lag: int) -> np.ndarray:
+        """Read-only (dates x columns) view of all columns lagged by ``lag`` rows."""
+        if not 1 <= lag <= self.max_lag:
+            raise ValueError(f"Lag {lag} outside 1..{self.max_lag}")
+        start = self.max_lag - lag
+        return self._buffer[start:start + len(self.index)]
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the lagged variables, ``{column}_lag{lag}``."""
+        return [f"{col}_lag{lag}" for col in self.columns for lag in self.lags]
+
+    def _locate(self, name: str):
+        column, _, lag = name.rpartition('_lag')
+        if column not in self.columns or not lag.isdigit() or int(lag) not in self.lags:
+            raise KeyError(name)
+        return self.columns.index(column), int(lag)
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self._locate(name)
+            return True
+        except KeyError:
+            return False
+
+    def __getitem__(self, name: str) -> pd.Series:
+        col_idx, lag = self._locate(name)
+        return pd.Series(self.lag(lag)[:, col_idx], index=self.index, name=name)
+
+    def to_frame(self, names: Union[str, Iterable[str], None] = None) -> pd.DataFrame:
+        """
+        Materialize lagged variables as named columns.
+
+        Args:
+            names: Variable names or glob patterns; None materializes all
+
+        Returns:
+            DataFrame with one column per selected (column, lag)
+        """
+        if names is None:
+            selected = self.names
+        else:
+            patterns = [names] if isinstance(names, str) else list(names)
+            selected = [name for name in self.names if any(fnmatchcase(name, p) for p in patterns)]
+
+        # Fill one preallocated block, one lag at a time
+        block = np.empty((len(self.index), len(selected)))
+        located = [self._locate(name) for name in selected]
+        for lag in {lag for _, lag in located}:
+            positions = [k for k, (_, item_lag) in enumerate(located) if item_lag == lag]
+            block[:, positions] = self.lag(lag)[:, [located[k][0] for k in positions]]
+        return pd.DataFrame(block, index=self.index, columns=selected, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the buffer behind every lag."""
+        return self._buffer.nbytes
+
+    def __repr__(self) -> str:
+        return f"LagTensor(columns={len(self.columns)}, lags={self.lags}, rows={len(self.index)})"
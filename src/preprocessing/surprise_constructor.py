@@ -11,7 +11,7 @@ Key improvements:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 import logging
 
@@ -55,50 +55,51 @@ class SurpriseConstructor:
             'metadata': {}
         }
         
-        # Process each indicator separately
-        indicators = announcements['indicator'].unique()
+        if announcements.empty:
+            return results
         
-        for indicator in indicators:
-            indicator_data = announcements[announcements['indicator'] == indicator].copy()
-            indicator_data = indicator_data.sort_values('date')
+        # Order rows by indicator (first appearance) then date so that every
+        # indicator is processed in the same vectorized pass
+        indicators = announcements['indicator'].unique()
+        data = announcements.assign(
+            _indicator_code=pd.Categorical(announcements['indicator'], categories=indicators).codes
+        ).sort_values(['_indicator_code', 'date'], kind='mergesort')
+        
+        # Attempt survey-based surprises for indicators with any forecast
+        if 'forecast' in data.columns:
+            has_forecast = data['forecast'].notna().groupby(data['_indicator_code']).transform('any')
+            survey_input = data[has_forecast.to_numpy()]
             
-            # Attempt survey-based surprise first
-            if 'forecast' in indicator_data.columns and indicator_data['forecast'].notna().any():
-                survey_surprise = self._construct_survey_surprise(
-                    indicator_data,
-                    indicator,
+            if not survey_input.empty:
+                survey_surprise = self._build_survey_surprises(
+                    survey_input,
                     standardization_window,
                     min_obs_for_standardization
                 )
                 
                 if not survey_surprise.empty:
-                    results['survey_based'] = pd.concat([
-                        results['survey_based'],
-                        survey_surprise
-                    ])
+                    results['survey_based'] = survey_surprise
                     
-                    self.logger.info(
-                        f"Created survey-based surprises for {indicator}: "
-                        f"{len(survey_surprise)} observations"
-                    )
-            
-            # Construct proxy surprise as fallback
-            proxy_surprise = self._construct_proxy_surprise(
-                indicator_data,
-                indicator,
-                standardization_window,
-                min_obs_for_standardization
-            )
+                    for indicator, n_obs in survey_surprise['indicator'].value_counts(sort=False).items():
+                        self.logger.info(
+                            f"Created survey-based surprises for {indicator}: "
+                            f"{n_obs} observations"
+                        )
+        
+        # Construct proxy surprises as fallback
+        proxy_surprise = self._build_proxy_surprises(
+            data,
+            standardization_window,
+            min_obs_for_standardization
+        )
+        
+        if not proxy_surprise.empty:
+            results['proxy_based'] = proxy_surprise
             
-            if not proxy_surprise.empty:
-                results['proxy_based'] = pd.concat([
-                    results['proxy_based'],
-                    proxy_surprise
-                ])
-                
+            for indicator, n_obs in proxy_surprise['indicator'].value_counts(sort=False).items():
                 self.logger.info(
                     f"Created proxy surprises for {indicator}: "
-                    f"{len(proxy_surprise)} observations"
+                    f"{n_obs} observations"
                 )
         
         # Combine with clear flags
@@ -120,160 +121,212 @@ class SurpriseConstructor:
         min_obs: int
     ) -> pd.DataFrame:
         """
-        Construct surprise using consensus forecasts.
+        Construct surprise using consensus forecasts for a single indicator.
         
         Surprise = (Actual - Forecast) / σ(Actual - Forecast)
         """
-        # Calculate raw surprise
-        data = data.copy()
-        data['raw_surprise'] = data['actual'] - data['forecast']
+        data = data.assign(indicator=indicator).sort_values('date', kind='mergesort')
+        return self._build_survey_surprises(data, window, min_obs)
+    
+    def _construct_proxy_surprise(
+        self,
+        data: pd.DataFrame,
+        indicator: str,
+        window: int,
+        min_obs: int
+    ) -> pd.DataFrame:
+        """
+        Construct proxy surprise using statistical expectation for a single indicator.
+        
+        Proxy Forecast = Rolling Mean (lagged)
+        Surprise = (Actual - Proxy Forecast) / σ(Actual - Proxy Forecast)
+        """
+        data = data.assign(indicator=indicator).sort_values('date', kind='mergesort')
+        return self._build_proxy_surprises(data, window, min_obs)
+    
+    def _lagged_rolling_stats(
+        self,
+        values: pd.Series,
+        groups: np.ndarray,
+        window: int,
+        min_obs: int
+    ) -> pd.DataFrame:
+        """
+        Left-closed rolling mean, std and count within each group.
+        
+        The statistics on row t use rows t-window .. t-1 of the same group, so
+        the current observation never enters its own standardization.
+        
+        Args:
+            values: Values ordered by group, then date
+            groups: Group label for each row (contiguous blocks)
+            window: Number of prior observations in the window
+            min_obs: Minimum prior observations for a non-NaN mean/std
+            
+        Returns:
+            DataFrame (positional index) with 'mean', 'std' and 'count'
+        """
+        positional = pd.Series(values.to_numpy(dtype=float), index=np.arange(len(values)))
+        shifted = positional.groupby(groups, sort=False).shift(1)
+        rolling = shifted.groupby(groups, sort=False).rolling(
+            window=window,
+            min_periods=max(1, min(min_obs, window))
+        )
+        
+        stats = pd.DataFrame({
+            'mean': rolling.mean().droplevel(0).sort_index(),
+            'std': rolling.std().droplevel(0).sort_index(),
+            'count': rolling.count().droplevel(0).sort_index()
+        })
+        stats.loc[stats['count'] < min_obs, ['mean', 'std']] = np.nan
+        return stats
+    
+    def _standardize(
+        self,
+        valid_data: pd.DataFrame,
+        window: int,
+        min_obs: int,
+        source: str,
+        extra_columns: List[str]
+    ) -> pd.DataFrame:
+        """Rolling z-score of ``raw_surprise`` within each indicator."""
+        groups = valid_data['indicator'].to_numpy()
+        stats = self._lagged_rolling_stats(valid_data['raw_surprise'], groups, window, min_obs)
+        
+        keep = ((stats['count'] >= min_obs) & (stats['std'] > 0)).to_numpy()
+        if not keep.any():
+            return pd.DataFrame()
+        
+        raw = valid_data['raw_surprise'].to_numpy(dtype=float)[keep]
+        mean = stats['mean'].to_numpy()[keep]
+        std = stats['std'].to_numpy()[keep]
+        kept = valid_data[keep]
+        
+        columns = {
+            'date': kept['date'].to_numpy(),
+            'indicator': kept['indicator'].to_numpy(),
+            'surprise': (raw - mean) / std,
+            'raw_surprise': raw
+        }
+        for column in extra_columns:
+            columns[column] = kept[column].to_numpy()
+        columns.update({
+            'standardization_mean': mean,
+            'standardization_std': std,
+            'n_historical_obs': stats['count'].to_numpy()[keep].astype(int),
+            'source': source
+        })
+        
+        return pd.DataFrame(columns).set_index('date')
+    
+    def _build_survey_surprises(
+        self,
+        data: pd.DataFrame,
+        window: int,
+        min_obs: int
+    ) -> pd.DataFrame:
+        """
+        Survey-based surprises for one or many indicators in a single pass.
+        
+        Args:
+            data: Announcements with 'indicator', 'date', 'actual', 'forecast',
+                ordered by indicator then date
+            window: Rolling standardization window (observations)
+            min_obs: Minimum prior observations for standardization
+        """
+        data = data.assign(raw_surprise=data['actual'] - data['forecast'])
         
         # Remove missing values
-        valid_data = data[data['raw_surprise'].notna()].copy()
+        valid_data = data[data['raw_surprise'].notna()]
         
-        if len(valid_data) < min_obs:
+        # Drop indicators with too few valid surprises
+        n_valid = valid_data.groupby('indicator', sort=False)['raw_surprise'].size()
+        for indicator in n_valid.index[n_valid < min_obs]:
             self.logger.warning(
                 f"Insufficient data for {indicator} survey surprise: "
-                f"{len(valid_data)} < {min_obs}"
+                f"{n_valid[indicator]} < {min_obs}"
             )
-            return pd.DataFrame()
-        
-        # Calculate rolling standardization using pre-sample window
-        # For each date t, use data from t-window to t-1 for standardization
-        standardized_surprises = []
+        valid_data = valid_data[valid_data['indicator'].isin(n_valid.index[n_valid >= min_obs])]
         
-        for idx in range(len(valid_data)):
-            if idx < min_obs:
-                # Skip until we have enough historical data
-                continue
-            
-            # Use previous window observations for standardization
-            start_idx = max(0, idx - window)
-            historical_surprises = valid_data['raw_surprise'].iloc[start_idx:idx]
-            
-            if len(historical_surprises) >= min_obs:
-                # Standardize current surprise using historical distribution
-                mean = historical_surprises.mean()
-                std = historical_surprises.std()
-                
-                if std > 0:
-                    current_surprise = valid_data['raw_surprise'].iloc[idx]
-                    z_score = (current_surprise - mean) / std
-                    
-                    standardized_surprises.append({
-                        'date': valid_data.iloc[idx]['date'],
-                        'indicator': indicator,
-                        'surprise': z_score,
-                        'raw_surprise': current_surprise,
-                        'standardization_mean': mean,
-                        'standardization_std': std,
-                        'n_historical_obs': len(historical_surprises),
-                        'source': 'survey_forecast'
-                    })
-        
-        if not standardized_surprises:
+        if valid_data.empty:
             return pd.DataFrame()
         
-        result_df = pd.DataFrame(standardized_surprises)
-        result_df = result_df.set_index('date')
+        result_df = self._standardize(valid_data, window, min_obs, 'survey_forecast', [])
+        if result_df.empty:
+            return result_df
         
         # Store metadata
-        self.surprise_metadata[f'{indicator}_survey'] = {
-            'indicator': indicator,
-            'source': 'consensus_forecast',
-            'n_obs': len(result_df),
-            'standardization_window': window,
-            'mean_surprise': float(result_df['surprise'].mean()),
-            'std_surprise': float(result_df['surprise'].std()),
-            'min_date': str(result_df.index.min()),
-            'max_date': str(result_df.index.max())
-        }
+        for indicator, group in result_df.groupby('indicator', sort=False):
+            self.surprise_metadata[f'{indicator}_survey'] = {
+                'indicator': indicator,
+                'source': 'consensus_forecast',
+                'n_obs': len(group),
+                'standardization_window': window,
+                'mean_surprise': float(group['surprise'].mean()),
+                'std_surprise': float(group['surprise'].std()),
+                'min_date': str(group.index.min()),
+                'max_date': str(group.index.max())
+            }
         
         return result_df
     
-    def _construct_proxy_surprise(
+    def _build_proxy_surprises(
         self,
         data: pd.DataFrame,
-        indicator: str,
         window: int,
         min_obs: int
     ) -> pd.DataFrame:
         """
-        Construct proxy surprise using statistical expectation.
+        Proxy surprises for one or many indicators in a single pass.
         
-        Proxy Forecast = Rolling Mean (lagged)
-        Surprise = (Actual - Proxy Forecast) / σ(Actual - Proxy Forecast)
+        Args:
+            data: Announcements with 'indicator', 'date', 'actual', ordered by
+                indicator then date
+            window: Rolling standardization window (observations)
+            min_obs: Minimum prior observations for standardization
         """
-        data = data.copy()
+        # Indicators with too few announcements are skipped
+        n_rows = data.groupby('indicator', sort=False)['actual'].transform('size')
+        data = data[(n_rows >= min_obs).to_numpy()]
         
-        if len(data) < min_obs:
+        if data.empty:
             return pd.DataFrame()
         
-        # Calculate rolling mean as proxy forecast (lagged to avoid look-ahead bias)
-        data['proxy_forecast'] = data['actual'].rolling(
-            window=12,
-            min_periods=min_obs
-        ).mean().shift(1)
+        # Rolling mean as proxy forecast (lagged to avoid look-ahead bias)
+        proxy_stats = self._lagged_rolling_stats(data['actual'], data['indicator'].to_numpy(), 12, min_obs)
+        data = data.assign(proxy_forecast=proxy_stats['mean'].to_numpy())
         
         # Calculate raw proxy surprise
         data['raw_surprise'] = data['actual'] - data['proxy_forecast']
         
         # Remove missing values
-        valid_data = data[data['raw_surprise'].notna()].copy()
+        valid_data = data[data['raw_surprise'].notna()]
+        n_valid = valid_data.groupby('indicator', sort=False)['raw_surprise'].transform('size')
+        valid_data = valid_data[(n_valid >= min_obs).to_numpy()]
         
-        if len(valid_data) < min_obs:
+        if valid_data.empty:
             return pd.DataFrame()
         
-        # Standardize using rolling window
-        standardized_surprises = []
-        
-        for idx in range(len(valid_data)):
-            if idx < min_obs:
-                continue
-            
-            start_idx = max(0, idx - window)
-            historical_surprises = valid_data['raw_surprise'].iloc[start_idx:idx]
-            
-            if len(historical_surprises) >= min_obs:
-                mean = historical_surprises.mean()
-                std = historical_surprises.std()
-                
-                if std > 0:
-                    current_surprise = valid_data['raw_surprise'].iloc[idx]
-                    z_score = (current_surprise - mean) / std
-                    
-                    standardized_surprises.append({
-                        'date': valid_data.iloc[idx]['date'],
-                        'indicator': indicator,
-                        'surprise': z_score,
-                        'raw_surprise': current_surprise,
-                        'proxy_forecast': valid_data.iloc[idx]['proxy_forecast'],
-                        'actual': valid_data.iloc[idx]['actual'],
-                        'standardization_mean': mean,
-                        'standardization_std': std,
-                        'n_historical_obs': len(historical_surprises),
-                        'source': 'statistical_proxy'
-                    })
-        
-        if not standardized_surprises:
-            return pd.DataFrame()
-        
-        result_df = pd.DataFrame(standardized_surprises)
-        result_df = result_df.set_index('date')
+        result_df = self._standardize(
+            valid_data, window, min_obs, 'statistical_proxy', ['proxy_forecast', 'actual']
+        )
+        if result_df.empty:
+            return result_df
         
         # Store metadata
-        self.surprise_metadata[f'{indicator}_proxy'] = {
-            'indicator': indicator,
-            'source': 'rolling_mean_proxy',
-            'proxy_window': 12,
-            'n_obs': len(result_df),
-            'standardization_window': window,
-            'mean_surprise': float(result_df['surprise'].mean()),
-            'std_surprise': float(result_df['surprise'].std()),
-            'min_date': str(result_df.index.min()),
-            'max_date': str(result_df.index.max()),
-            'warning': 'Proxy-based surprise - use with caution'
-        }
+        for indicator, group in result_df.groupby('indicator', sort=False):
+            self.surprise_metadata[f'{indicator}_proxy'] = {
+                'indicator': indicator,
+                'source': 'rolling_mean_proxy',
+                'proxy_window': 12,
+                'n_obs': len(group),
+                'standardization_window': window,
+                'mean_surprise': float(group['surprise'].mean()),
+                'std_surprise': float(group['surprise'].std()),
+                'min_date': str(group.index.min()),
+                'max_date': str(group.index.max()),
+                'warning': 'Proxy-based surprise - use with caution'
+            }
         
         return result_df
     
@@ -304,18 +357,14 @@ class SurpriseConstructor:
             
             # Only add proxy where survey doesn't exist
             if not survey_surprises.empty:
-                # Filter out overlapping (indicator, date) pairs
-                survey_keys = set(
-                    (row['indicator'], idx) 
-                    for idx, row in survey_surprises.iterrows()
+                # Anti-join on (indicator, date) keys
+                survey_keys = pd.MultiIndex.from_arrays(
+                    [survey_surprises['indicator'], survey_surprises.index]
                 )
-                
-                proxy_filtered = proxy_copy[
-                    ~proxy_copy.apply(
-                        lambda row: (row['indicator'], row.name) in survey_keys,
-                        axis=1
-                    )
-                ]
+                proxy_keys = pd.MultiIndex.from_arrays(
+                    [proxy_copy['indicator'], proxy_copy.index]
+                )
+                proxy_filtered = proxy_copy[~proxy_keys.isin(survey_keys)]
                 
                 combined = pd.concat([combined, proxy_filtered])
             else:
@@ -323,11 +372,10 @@ class SurpriseConstructor:
         
         # Add warning column for proxy surprises
         if not combined.empty:
-            combined['data_quality_note'] = combined.apply(
-                lambda row: 'Use with caution - statistical proxy' 
-                if row['surprise_type'] == 'proxy' 
-                else 'Survey-based - reliable',
-                axis=1
+            combined['data_quality_note'] = np.where(
+                combined['surprise_type'] == 'proxy',
+                'Use with caution - statistical proxy',
+                'Survey-based - reliable'
             )
         
         return combined.sort_index()
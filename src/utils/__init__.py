@@ -13,6 +13,17 @@ from .helpers import (
     clean_outliers,
     save_results
 )
+from .stage_handoff import StageHandoff, HandoffLedger
+from .memory_budget import MemoryBudget
+from .rolling import rolling_moments, rolling_rank, rolling_quantile
+from .parallel import run_column_sharded
+from .returns_panel import ReturnsPanel
+from .event_panel import EventPanel
+from .outliers import handle_outliers, OutlierMask
+from .asof import align_asof, window_index
+from .calendars import TradingCalendar, get_calendar, calendar_for, calendar_for_column
+from .realized import realized_measures, add_realized_measures
+from .missing_data import MissingDataProfile
 
 __all__ = [
     'config',
@@ -23,5 +34,25 @@ __all__ = [
     'synchronize_timestamps',
     'create_event_windows',
     'clean_outliers',
-    'save_results'
+    'save_results',
+    'StageHandoff',
+    'HandoffLedger',
+    'MemoryBudget',
+    'rolling_moments',
+    'rolling_rank',
+    'rolling_quantile',
+    'run_column_sharded',
+    'ReturnsPanel',
+    'EventPanel',
+    'handle_outliers',
+    'OutlierMask',
+    'align_asof',
+    'window_index',
+    'TradingCalendar',
+    'get_calendar',
+    'calendar_for',
+    'calendar_for_column',
+    'realized_measures',
+    'add_realized_measures',
+    'MissingDataProfile'
 ]
\ No newline at end of file
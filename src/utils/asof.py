@@ -0,0 +1,198 @@
+"""
+As-of alignment of datasets observed on different timestamps.
+
+Reindexing every dataset onto a dense ``pd.date_range`` (e.g. one row per
+minute across years of daily and monthly data) creates rows for every grid
+point whether or not anything was observed. The as-of engine instead aligns
+datasets on the union of their native timestamps: each target timestamp
+takes, per column, the last valid observation at or before it (or the next
+one, for ``direction='forward'``), provided it is not older than the
+dataset's staleness limit. Memory therefore scales with the number of real
+observations. Dense grids are built only for explicitly requested windows.
+
+Example:
+    aligned = align_asof(
+        {'stocks': stocks, 'economic': economic},
+        tolerance={'economic': '45D'}
+    )
+    around_fomc = align_asof(datasets, index=window_index(fomc_windows, '1min'))
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+
+Tolerance = Union[None, str, pd.Timedelta, Dict[str, Union[None, str, pd.Timedelta]]]
+
+
+def _as_datetime_index(index: pd.Index) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    if not index.is_monotonic_increasing:
+        raise ValueError("As-of alignment needs a sorted DatetimeIndex")
+    return index
+
+
+def asof_positions(
+    source: pd.DatetimeIndex,
+    targets: pd.DatetimeIndex,
+    direction: str = 'backward'
+) -> np.ndarray:
+    """
+    Row of ``source`` each target takes its value from (-1 if none).
+
+    Args:
+        source: Sorted timestamps of the observations
+        targets: Timestamps to align to
+        direction: 'backward' (last row at or before) or 'forward' (first
+            row at or after)
+    """
+    source_ns = source.as_unit('ns').asi8
+    target_ns = targets.as_unit('ns').asi8
+    if direction == 'backward':
+        return np.searchsorted(source_ns, target_ns, side='right') - 1
+    if direction == 'forward':
+        rows = np.searchsorted(source_ns, target_ns, side='left')
+        return np.where(rows < len(source_ns), rows, -1)
+    raise ValueError(f"Direction must be 'backward' or 'forward', got '{direction}'")
+
+
+def asof_join(
+    data: pd.DataFrame,
+    targets: pd.DatetimeIndex,
+    tolerance: Union[None, str, pd.Timedelta] = None,
+    direction: str = 'backward'
+) -> pd.DataFrame:
+    """
+    Values of ``data`` as of each target timestamp, column by column.
+
+    Each column uses its own last (or next) *valid* observation, so a NaN in
+    one column does not hide an older value, as with a forward fill.
+
+    Args:
+        data: Observations on a sorted DatetimeIndex
+        targets: Timestamps to align to
+        tolerance: Maximum age of the observation used (None: unlimited)
+        direction: 'backward' or 'forward'
+
+    Returns:
+        DataFrame indexed by ``targets`` (NaN where no observation qualifies)
+    """
+    source = _as_datetime_index(data.index)
+    targets = pd.DatetimeIndex(targets)
+    n_rows = len(data)
+    rows = asof_positions(source, targets, direction)
+
+    # Per column, the last (next) valid row at or before (after) every row
+    valid = data.notna().to_numpy()
+    if direction == 'backward':
+        valid_rows = np.maximum.accumulate(np.where(valid, np.arange(n_rows)[:, None], -1), axis=0)
+    else:
+        valid_rows = np.minimum.accumulate(
+            np.where(valid, np.arange(n_rows)[:, None], n_rows)[::-1], axis=0
+        )[::-1]
+        valid_rows = np.where(valid_rows < n_rows, valid_rows, -1)
+
+    positions = np.full((len(targets), data.shape[1]), -1, dtype=np.int64)
+    found = rows >= 0
+    positions[found] = valid_rows[rows[found]]
+
+    if tolerance is not None and n_rows:
+        source_ns = source.as_unit('ns').asi8
+        age = np.abs(targets.as_unit('ns').asi8[:, None] - source_ns[np.clip(positions, 0, None)])
+        positions[age > pd.Timedelta(tolerance).value] = -1
+
+    missing = positions < 0
+    safe = np.clip(positions, 0, None)
+    numeric = np.array([dtype.kind in 'fiub' for dtype in data.dtypes], dtype=bool)
+
+    # Numeric columns in one gather; other columns one by one
+    values = {j: np.full(len(targets), np.nan) for j in range(data.shape[1])}
+    if n_rows and numeric.any():
+        numeric_columns = np.flatnonzero(numeric)
+        block = data.iloc[:, numeric_columns].to_numpy(dtype=float)
+        gathered = np.take_along_axis(block, safe[:, numeric_columns], axis=0)
+        gathered[missing[:, numeric_columns]] = np.nan
+        values.update(zip(numeric_columns, gathered.T))
+    if n_rows:
+        for j in np.flatnonzero(~numeric):
+            column = data.iloc[:, j].to_numpy().astype(object)[safe[:, j]]
+            column[missing[:, j]] = np.nan
+            values[j] = column
+
+    result = pd.DataFrame(values, index=targets)
+    result.columns = data.columns
+    return result
+
+
+def common_span(data_dict: Dict[str, pd.DataFrame]) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Latest start and earliest end across the non-empty datasets (None if all are empty)."""
+    spans = [(df.index.min(), df.index.max()) for df in data_dict.values() if not df.empty]
+    if not spans:
+        return None
+    return max(start for start, _ in spans), min(end for _, end in spans)
+
+
+def native_index(
+    data_dict: Dict[str, pd.DataFrame],
+    span: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None
+) -> pd.DatetimeIndex:
+    """Sorted union of the datasets' own timestamps, optionally limited to ``span``."""
+    indexes = [pd.DatetimeIndex(df.index) for df in data_dict.values() if not df.empty]
+    if not indexes:
+        return pd.DatetimeIndex([])
+    values = np.unique(np.concatenate([index.as_unit('ns').asi8 for index in indexes]))
+    index = pd.DatetimeIndex(values.view('datetime64[ns]'))
+    if indexes[0].tz is not None:
+        index = index.tz_localize('UTC').tz_convert(indexes[0].tz)
+    if span is not None:
+        index = index[(index >= span[0]) & (index <= span[1])]
+    return index
+
+
+def window_index(
+    windows: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    freq: str = '1min'
+) -> pd.DatetimeIndex:
+    """Dense grid at ``freq`` covering only the given (start, end) windows."""
+    grids = [pd.date_range(start, end, freq=freq) for start, end in windows]
+    if not grids:
+        return pd.DatetimeIndex([])
+    return grids[0].append(grids[1:]).unique().sort_values()
+
+
+def align_asof(
+    data_dict: Dict[str, pd.DataFrame],
+    index: Optional[pd.DatetimeIndex] = None,
+    tolerance: Tolerance = None,
+    span: str = 'common',
+    direction: str = 'backward'
+) -> Dict[str, pd.DataFrame]:
+    """
+    Align several datasets on one sparse index with as-of lookups.
+
+    Args:
+        data_dict: Dictionary of DataFrames with sorted datetime indices
+        index: Target timestamps; None uses the union of the datasets'
+            native timestamps
+        tolerance: Staleness limit for all datasets, or a dictionary of
+            limits by dataset name (missing names are unlimited)
+        span: 'common' keeps native timestamps within the span covered by
+            every dataset, 'union' keeps them all (ignored with ``index``)
+        direction: 'backward' (last observation) or 'forward' (next one)
+
+    Returns:
+        Dictionary of DataFrames sharing the target index
+    """
+    if index is None:
+        if span not in ('common', 'union'):
+            raise ValueError(f"Span must be 'common' or 'union', got '{span}'")
+        index = native_index(data_dict, common_span(data_dict) if span == 'common' else None)
+
+    aligned = {}
+    for name, df in data_dict.items():
+        limit = tolerance.get(name) if isinstance(tolerance, dict) else tolerance
+        if df.empty:
+            aligned[name] = df.reindex(index)
+        else:
+            aligned[name] = asof_join(df, index, tolerance=limit, direction=direction)
+    return aligned
@@ -0,0 +1,232 @@
+"""
+Precomputed trading calendars for equities (NYSE), crypto and FX.
+
+Event and estimation windows used to be measured with calendar-day
+``pd.Timedelta``s, and business-day alignment took whatever dates the equity
+download happened to contain. A ``TradingCalendar`` holds the sessions of
+one asset class over a fixed span, together with two arrays indexed by
+calendar day: the position of the first session on or after the day and
+of the last session on or before it. "N trading days after date D" is then
+two array lookups (day -> session position -> session), vectorized over any
+number of dates.
+
+Calendars are built once per process and shared through ``get_calendar``
+(``calendar_for``/``calendar_for_column`` pick the calendar of an asset
+class or of a dataset-prefixed panel column such as ``crypto_BTC-USD``):
+
+- ``'nyse'``: weekdays except NYSE holidays (New Year's Day, Martin Luther
+  King Jr. Day from 1998, Washington's Birthday, Good Friday, Memorial Day,
+  Juneteenth from 2022, Independence Day, Labor Day, Thanksgiving,
+  Christmas) and unscheduled closures;
+- ``'crypto'``: every calendar day;
+- ``'fx'``: weekdays except January 1 and December 25.
+
+Example:
+    nyse = get_calendar('nyse')
+    nyse.offset(announcement_dates, 5)          # 5 sessions after each event
+    starts, ends = nyse.window(announcement_dates, pre=3, post=3)
+"""
+
+import pandas as pd
+import numpy as np
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USPresidentsDay, USMemorialDay,
+    USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+from pandas.tseries.offsets import DateOffset
+from dateutil.relativedelta import MO
+from typing import Dict, Optional, Tuple, Union
+
+DateLike = Union[str, pd.Timestamp, np.datetime64, pd.DatetimeIndex, np.ndarray, list]
+
+CALENDAR_START = pd.Timestamp('1990-01-01')
+CALENDAR_END = pd.Timestamp('2035-12-31')
+
+# Asset classes (as classified by the collectors) trading outside NYSE sessions
+ASSET_CLASS_CALENDARS = {
+    'cryptocurrency': 'crypto',
+    'crypto': 'crypto',
+    'fx_index': 'fx',
+    'fx': 'fx'
+}
+
+# Calendar setting that gives every asset the calendar of its asset class
+BY_ASSET_CLASS = 'by_asset_class'
+
+# NYSE closures outside the holiday rules (national days of mourning, 9/11, Hurricane Sandy)
+NYSE_SPECIAL_CLOSURES = pd.to_datetime([
+    '1994-04-27', '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30', '2018-12-05',
+    '2025-01-09'
+])
+
+_DAY_NS = 86_400_000_000_000
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """NYSE full-day holidays (a Saturday New Year's Day is not observed)."""
+
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        Holiday('Martin Luther King Jr. Day', month=1, day=1, start_date='1998-01-01',
+                offset=DateOffset(weekday=MO(3))),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+def _session_dates(name: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    days = pd.date_range(start, end, freq='D')
+    if name == 'crypto':
+        return days
+    weekdays = days[days.dayofweek < 5]
+    if name == 'fx':
+        return weekdays[~(((weekdays.month == 1) & (weekdays.day == 1)) |
+                          ((weekdays.month == 12) & (weekdays.day == 25)))]
+    if name == 'nyse':
+        holidays = NYSEHolidayCalendar().holidays(start, end).union(NYSE_SPECIAL_CLOSURES)
+        return weekdays[~weekdays.isin(holidays)]
+    raise ValueError(f"Unknown trading calendar '{name}'; expected 'nyse', 'crypto' or 'fx'")
+
+
+class TradingCalendar:
+    """Sessions of one asset class with O(1) day -> session position lookups."""
+
+    def __init__(
+        self,
+        name: str,
+        start: pd.Timestamp = CALENDAR_START,
+        end: pd.Timestamp = CALENDAR_END
+    ):
+        """
+        Args:
+            name: 'nyse', 'crypto' or 'fx'
+            start: First calendar day covered
+            end: Last calendar day covered
+        """
+        self.name = name
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+        self.sessions = _session_dates(name, self.start, self.end)
+
+        # Per calendar day: first session on/after it and last session on/before it
+        session_days = (self.sessions.as_unit('ns').asi8 - self.start.value) // _DAY_NS
+        n_days = (self.end - self.start).days + 1
+        self._next = np.searchsorted(session_days, np.arange(n_days), side='left')
+        self._previous = np.searchsorted(session_days, np.arange(n_days), side='right') - 1
+        self._is_session = np.zeros(n_days, dtype=bool)
+        self._is_session[session_days] = True
+
+    def _days(self, dates: DateLike) -> np.ndarray:
+        """Calendar-day numbers of ``dates`` relative to ``start`` (wall time for tz-aware dates)."""
+        if not isinstance(dates, pd.DatetimeIndex):
+            dates = pd.DatetimeIndex(np.atleast_1d(pd.to_datetime(dates)))
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        days = (dates.as_unit('ns').asi8 - self.start.value) // _DAY_NS
+        if len(days) and (days.min() < 0 or days.max() >= len(self._next)):
+            raise ValueError(
+                f"Dates outside the {self.name} calendar span "
+                f"{self.start.date()} to {self.end.date()}"
+            )
+        return days
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def is_session(self, dates: DateLike) -> np.ndarray:
+        """Boolean array, True where the date is a session."""
+        return self._is_session[self._days(dates)]
+
+    def session_position(self, dates: DateLike, direction: str = 'forward') -> np.ndarray:
+        """
+        Position in ``sessions`` of each date's session.
+
+        Args:
+            dates: Dates (time of day is ignored)
+            direction: 'forward' (first session on or after the date) or
+                'backward' (last session on or before it)
+        """
+        if direction == 'forward':
+            return self._next[self._days(dates)]
+        if direction == 'backward':
+            return self._previous[self._days(dates)]
+        raise ValueError(f"Direction must be 'forward' or 'backward', got '{direction}'")
+
+    def _at(self, positions: np.ndarray) -> pd.DatetimeIndex:
+        if len(positions) and (positions.min() < 0 or positions.max() >= len(self.sessions)):
+            raise ValueError(f"Offset runs past the {self.name} calendar span")
+        return self.sessions[positions]
+
+    def offset(self, dates: DateLike, n: int) -> pd.DatetimeIndex:
+        """
+        The session ``n`` sessions after (``n < 0``: before) each date's session.
+
+        A date that is not a session belongs to the next session, so
+        ``offset(saturday, 0)`` is the following Monday and
+        ``offset(saturday, -1)`` the preceding Friday (on the NYSE calendar).
+        """
+        return self._at(self.session_position(dates) + int(n))
+
+    def window(
+        self,
+        dates: DateLike,
+        pre: int,
+        post: int
+    ) -> Tuple[pd.DatetimeIndex, pd.DatetimeIndex]:
+        """
+        Windows from ``pre`` sessions before to ``post`` sessions after each date's session.
+
+        Returns:
+            (start sessions, end sessions); ends are the last instant of the
+            end session, so the windows include intraday rows of that day
+        """
+        positions = self.session_position(dates)
+        starts = self._at(positions - int(pre))
+        ends = self._at(positions + int(post)) + pd.Timedelta(1, 'D') - pd.Timedelta(1, 'ns')
+        return starts, ends
+
+    def sessions_in(self, start: DateLike, end: DateLike) -> pd.DatetimeIndex:
+        """Sessions from ``start`` to ``end`` inclusive."""
+        first = self.session_position(start, 'forward')[0]
+        last = self.session_position(end, 'backward')[0]
+        return self.sessions[first:last + 1]
+
+    def count(self, start: DateLike, end: DateLike) -> int:
+        """Number of sessions from ``start`` to ``end`` inclusive."""
+        return len(self.sessions_in(start, end))
+
+    def __repr__(self) -> str:
+        return (
+            f"TradingCalendar('{self.name}', sessions={len(self.sessions)}, "
+            f"span={self.start.date()}..{self.end.date()})"
+        )
+
+
+_CALENDARS: Dict[str, TradingCalendar] = {}
+
+
+def get_calendar(name: Union[str, TradingCalendar] = 'nyse') -> TradingCalendar:
+    """Shared calendar by name ('nyse', 'crypto', 'fx'), built on first use."""
+    if isinstance(name, TradingCalendar):
+        return name
+    key = str(name).lower()
+    if key not in _CALENDARS:
+        _CALENDARS[key] = TradingCalendar(key)
+    return _CALENDARS[key]
+
+
+def calendar_for(asset_class: Optional[str]) -> TradingCalendar:
+    """Calendar of an asset class (crypto and FX have their own; everything else trades on NYSE)."""
+    return get_calendar(ASSET_CLASS_CALENDARS.get(str(asset_class).lower(), 'nyse'))
+
+
+def calendar_for_column(column: str) -> TradingCalendar:
+    """Calendar of a panel column named ``{dataset}_{symbol}`` (e.g. ``crypto_BTC-USD``)."""
+    return calendar_for(str(column).split('_', 1)[0])
@@ -0,0 +1,215 @@
+"""
+Dense (events x relative time x series) panels of event windows.
+
+Slicing one window per event with a boolean mask over the full index, and
+copying it into its own DataFrame, costs O(events x rows) comparisons and
+leaves thousands of small frames behind. ``EventPanel`` instead computes
+the row position of every (event, relative slot) with one vectorized
+``searchsorted`` and fills a single (events x slots x series) block with one
+gather. Label arrays (event times, relative slots, series names, row dates)
+and a validity mask travel with the block.
+
+Two ways to place the slots:
+
+- ``EventPanel.by_rows``: slot ``k`` is the ``k``-th row after the event
+  row (the first row at or after the event), i.e. trading days;
+- ``EventPanel.by_time``: slot ``k`` is the first row in
+  ``[event + k * unit, event + (k + 1) * unit)``, i.e. calendar days,
+  hours or minutes relative to the event.
+
+Example:
+    panel = EventPanel.by_rows(returns, event_dates, pre=5, post=5)
+    panel.values.shape             # (events, 11, series)
+    panel.mean()                   # average by relative day
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Optional, Sequence, Union
+
+
+class EventPanel:
+    """Event windows of several series gathered into one dense block."""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        events: pd.DatetimeIndex,
+        relative: np.ndarray,
+        series: Sequence[str],
+        dates: np.ndarray,
+        in_window: np.ndarray
+    ):
+        """
+        Args:
+            values: Float block (events x slots x series), NaN outside the data
+            events: Event times (one per row of the block)
+            relative: Relative slot labels (one per slot)
+            series: Series names (one per last-axis entry)
+            dates: datetime64 array (events x slots) of the gathered rows
+                (local wall time), NaT where the slot has no row
+            in_window: Boolean array (events x slots), True where a row exists
+        """
+        self.values = values
+        self.events = pd.DatetimeIndex(events)
+        self.relative = np.asarray(relative)
+        self.series = list(series)
+        self.dates = dates
+        self.in_window = in_window
+
+    @staticmethod
+    def _prepare(data: pd.DataFrame, events) -> tuple:
+        if not isinstance(data.index, pd.DatetimeIndex) or not data.index.is_monotonic_increasing:
+            raise ValueError("Event panels need a sorted DatetimeIndex")
+        events = pd.DatetimeIndex(events)
+        if events.tz is None and data.index.tz is not None:
+            events = events.tz_localize(data.index.tz)
+        elif events.tz is not None and data.index.tz is None:
+            events = events.tz_convert(None)
+        elif events.tz is not None:
+            events = events.tz_convert(data.index.tz)
+        numeric = data.select_dtypes(include=[np.number, bool])
+        return numeric, events
+
+    @classmethod
+    def _gather(
+        cls,
+        data: pd.DataFrame,
+        events: pd.DatetimeIndex,
+        relative: np.ndarray,
+        rows: np.ndarray,
+        in_window: np.ndarray
+    ) -> "EventPanel":
+        source = data.to_numpy(dtype=float)
+        safe_rows = np.where(in_window, rows, 0)
+        if len(data):
+            values = source[safe_rows]
+            index = data.index.tz_localize(None) if data.index.tz is not None else data.index
+            dates = index.as_unit('ns').to_numpy()[safe_rows]
+        else:
+            values = np.empty(rows.shape + (source.shape[1],))
+            dates = np.empty(rows.shape, dtype='datetime64[ns]')
+        values[~in_window] = np.nan
+        dates[~in_window] = np.datetime64('NaT')
+        return cls(values, events, relative, data.columns, dates, in_window)
+
+    @classmethod
+    def by_rows(cls, data: pd.DataFrame, events, pre: int, post: int) -> "EventPanel":
+        """
+        Windows of ``pre`` rows before to ``post`` rows after each event row.
+
+        Args:
+            data: Series (columns) on a sorted DatetimeIndex
+            events: Event times; the event row is the first row at or after it
+            pre: Rows before the event row
+            post: Rows after the event row
+
+        Returns:
+            EventPanel with slots ``-pre..post``
+        """
+        data, events = cls._prepare(data, events)
+        relative = np.arange(-int(pre), int(post) + 1)
+        n_rows = len(data)
+
+        event_rows = data.index.searchsorted(events, side='left')
+        rows = event_rows[:, None] + relative[None, :]
+        in_window = (event_rows[:, None] < n_rows) & (rows >= 0) & (rows < n_rows)
+        return cls._gather(data, events, relative, rows, in_window)
+
+    @classmethod
+    def by_time(
+        cls,
+        data: pd.DataFrame,
+        events,
+        pre: Union[str, pd.Timedelta],
+        post: Union[str, pd.Timedelta],
+        unit: Union[str, pd.Timedelta] = '1D'
+    ) -> "EventPanel":
+        """
+        Windows from ``pre`` before to ``post`` after each event, in ``unit`` slots.
+
+        Args:
+            data: Series (columns) on a sorted DatetimeIndex
+            events: Event times (slot 0 starts at the event)
+            pre: Time before the event
+            post: Time after the event
+            unit: Slot width; slot ``k`` holds the first row in
+                ``[event + k * unit, event + (k + 1) * unit)``
+
+        Returns:
+            EventPanel with slots ``-(pre // unit)..(post // unit)``
+        """
+        data, events = cls._prepare(data, events)
+        unit = pd.Timedelta(unit)
+        relative = np.arange(-(pd.Timedelta(pre) // unit), pd.Timedelta(post) // unit + 1)
+        n_rows = len(data)
+
+        index_ns = data.index.as_unit('ns').asi8
+        starts = events.as_unit('ns').asi8[:, None] + relative[None, :] * unit.value
+        rows = np.searchsorted(index_ns, starts, side='left')
+        in_window = rows < n_rows
+        in_window[in_window] = index_ns[rows[in_window]] < starts[in_window] + unit.value
+        return cls._gather(data, events, relative, rows, in_window)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean block (events x slots x series): a row exists and the value is not NaN."""
+        return ~np.isnan(self.values)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def window(self, event: int) -> pd.DataFrame:
+        """One event's window (relative slot x series), rows without data dropped."""
+        keep = self.in_window[event]
+        frame = pd.DataFrame(
+            self.values[event][keep], index=pd.Index(self.relative[keep], name='relative'),
+            columns=self.series
+        )
+        frame['date'] = self.dates[event][keep]
+        return frame
+
+    def log_returns(self) -> "EventPanel":
+        """Log returns between consecutive slots within each window (first slot dropped)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.log(self.values[:, 1:] / self.values[:, :-1])
+        return EventPanel(
+            values, self.events, self.relative[1:], self.series,
+            self.dates[:, 1:], self.in_window[:, 1:] & self.in_window[:, :-1]
+        )
+
+    def mean(self) -> pd.DataFrame:
+        """Average across events by relative slot, ignoring missing values."""
+        counts = self.valid.sum(axis=0)
+        totals = np.where(self.valid, self.values, 0.0).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(counts > 0, totals / counts, np.nan)
+        return pd.DataFrame(means, index=pd.Index(self.relative, name='relative'), columns=self.series)
+
+    def to_long(self, series: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Tidy table of the valid cells (event, relative, date, series, value),
+        e.g. for export.
+        """
+        columns = self.series if series is None else list(series)
+        positions = [self.series.index(col) for col in columns]
+        values = self.values[:, :, positions]
+        e_idx, r_idx, s_idx = np.nonzero(~np.isnan(values))
+        return pd.DataFrame({
+            'event': self.events[e_idx],
+            'relative': self.relative[r_idx],
+            'date': self.dates[e_idx, r_idx],
+            'series': np.asarray(columns, dtype=object)[s_idx],
+            'value': values[e_idx, r_idx, s_idx]
+        })
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.values.nbytes + self.dates.nbytes + self.in_window.nbytes)
+
+    def __repr__(self) -> str:
+        return f"EventPanel(events={len(self.events)}, slots={len(self.relative)}, series={len(self.series)})"
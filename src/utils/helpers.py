@@ -9,6 +9,9 @@ from datetime import datetime, timezone
 import logging
 from pathlib import Path
 
+from .outliers import OUTLIER_METHODS, outlier_bounds, apply_outlier_policy, handle_outliers
+from .asof import align_asof, common_span, native_index, window_index
+
 def get_timezone_policy() -> str:
     """
     Get timezone policy from config or return default.
@@ -161,54 +164,55 @@ def calculate_realized_volatility(
 
 def synchronize_timestamps(
     data_dict: dict, 
-    freq: str = "1min",
-    method: str = "ffill"
+    freq: Optional[str] = None,
+    method: str = "ffill",
+    tolerance=None,
+    windows: Optional[List[Tuple[datetime, datetime]]] = None
 ) -> dict:
     """
     Synchronize timestamps across multiple datasets.
     
+    Datasets are aligned with as-of lookups (see ``utils.asof``) over the
+    span they all cover. Without ``freq`` or ``windows`` the common index is
+    the union of the datasets' own timestamps, so memory scales with the
+    observations rather than with the span.
+    
     Args:
         data_dict: Dictionary of DataFrames with datetime indices
-        freq: Target frequency for synchronization
+        freq: Target frequency of a dense grid over the common span (or over
+            ``windows``); None keeps the native timestamps
         method: Method for handling missing values ('ffill', 'bfill', 'interpolate')
+        tolerance: Staleness limit of the value carried to a timestamp
+            ('ffill'/'bfill'), for all datasets or by dataset name
+        windows: (start, end) windows to build a dense grid for, at ``freq``
+            (default one minute), instead of the whole span
         
     Returns:
         Dictionary of synchronized DataFrames
     """
-    # Find common time range
-    start_times = []
-    end_times = []
-    
-    for df in data_dict.values():
-        if not df.empty:
-            start_times.append(df.index.min())
-            end_times.append(df.index.max())
-    
-    if not start_times:
+    span = common_span(data_dict)
+    if span is None:
         return data_dict
     
-    common_start = max(start_times)
-    common_end = min(end_times)
+    # Common time index
+    if windows is not None:
+        windows = [(max(start, span[0]), min(end, span[1])) for start, end in windows]
+        common_index = window_index([w for w in windows if w[0] <= w[1]], freq or "1min")
+    elif freq is not None:
+        common_index = pd.date_range(start=span[0], end=span[1], freq=freq)
+    else:
+        common_index = native_index(data_dict, span)
     
-    # Create common time index
-    common_index = pd.date_range(
-        start=common_start,
-        end=common_end,
-        freq=freq
-    )
+    if method in ("ffill", "bfill"):
+        direction = "backward" if method == "ffill" else "forward"
+        return align_asof(data_dict, index=common_index, tolerance=tolerance, direction=direction)
     
-    # Reindex all DataFrames
     synchronized_data = {}
     for name, df in data_dict.items():
         reindexed = df.reindex(common_index)
-        
-        if method == "ffill":
-            reindexed = reindexed.fillna(method="ffill")
-        elif method == "bfill":
-            reindexed = reindexed.fillna(method="bfill")
-        elif method == "interpolate":
+        if method == "interpolate":
+            # Linear in row position on the common index
             reindexed = reindexed.interpolate()
-        
         synchronized_data[name] = reindexed
     
     return synchronized_data
@@ -247,47 +251,75 @@ def create_event_windows(
             end_time = announce_time + pd.Timedelta(post_window)
         
         windows.append((start_time, end_time))
-    
+
     return windows
 
+def locate_sorted(
+    sorted_values: np.ndarray,
+    targets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate exact matches of many targets in a sorted array with one lookup.
+
+    Args:
+        sorted_values: Sorted 1-D array (e.g. unique datetime64 days)
+        targets: Array of values to locate (any shape)
+
+    Returns:
+        Tuple of (positions, found) arrays shaped like ``targets``; positions
+        are only meaningful where ``found`` is True
+    """
+    sorted_values = np.asarray(sorted_values)
+    targets = np.asarray(targets)
+
+    positions = np.searchsorted(sorted_values, targets, side='left')
+    found = np.zeros(targets.shape, dtype=bool)
+    if len(sorted_values) > 0:
+        in_range = positions < len(sorted_values)
+        found[in_range] = sorted_values[positions[in_range]] == targets[in_range]
+
+    return positions, found
+
 def clean_outliers(
-    data: pd.Series, 
+    data: Union[pd.Series, pd.DataFrame], 
     method: str = "iqr",
-    threshold: float = 3.0
-) -> pd.Series:
+    threshold: float = 3.0,
+    window: int = 21,
+    policy: str = "drop"
+) -> Union[pd.Series, pd.DataFrame]:
     """
-    Clean outliers from data series.
+    Clean outliers from a data series or a whole panel.
     
     Args:
-        data: Data series to clean
-        method: Outlier detection method ('iqr', 'zscore', 'modified_zscore')
+        data: Data series to clean, or a DataFrame whose numeric columns
+            are cleaned together in one vectorized pass
+        method: Outlier detection method ('iqr', 'zscore', 'modified_zscore',
+            'rolling_mad', 'hampel')
         threshold: Threshold for outlier detection
+        window: Window length for the rolling methods
+        policy: 'drop' (series only: keep the non-missing inliers), 'clip',
+            'nan' or 'flag'
         
     Returns:
-        Cleaned data series
+        Cleaned data series or DataFrame
     """
-    if method == "iqr":
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - threshold * IQR
-        upper_bound = Q3 + threshold * IQR
-        mask = (data >= lower_bound) & (data <= upper_bound)
-        
-    elif method == "zscore":
-        z_scores = np.abs((data - data.mean()) / data.std())
-        mask = z_scores <= threshold
-        
-    elif method == "modified_zscore":
-        median = data.median()
-        mad = np.median(np.abs(data - median))
-        modified_z_scores = 0.6745 * (data - median) / mad
-        mask = np.abs(modified_z_scores) <= threshold
-        
-    else:
-        raise ValueError("Method must be 'iqr', 'zscore', or 'modified_zscore'")
+    if method not in OUTLIER_METHODS:
+        raise ValueError("Method must be 'iqr', 'zscore', 'modified_zscore', 'rolling_mad' or 'hampel'")
+    
+    if isinstance(data, pd.DataFrame):
+        if policy == "drop":
+            policy = "nan"
+        cleaned, _ = handle_outliers(data, method, threshold, window, policy)
+        return cleaned
+    
+    values = data.to_numpy(dtype=float)[:, None]
+    lower, upper = outlier_bounds(values, method, threshold, window)
+    if policy == "drop":
+        mask = (values >= lower) & (values <= upper)
+        return data[mask[:, 0]]
     
-    return data[mask]
+    treated, _ = apply_outlier_policy(values, lower, upper, policy)
+    return pd.Series(treated[:, 0], index=data.index, name=data.name)
 
 def save_results(
     data: Union[pd.DataFrame, pd.Series, dict],
@@ -0,0 +1,107 @@
+"""
+Per-step memory accounting for data pipelines.
+
+``MemoryBudget.step(name)`` wraps one pipeline step and records, from
+``tracemalloc``, the bytes the step left allocated and its transient peak
+above the level it started at (NumPy and pandas buffers are traced). A
+report then shows which steps copy data and how close the pipeline's peak
+stays to "one dataset plus the new columns".
+
+Example:
+    budget = MemoryBudget()
+    with budget.step('add_time_features', baseline=data):
+        data = add_time_features(data)
+    budget.log_summary(logger)
+"""
+
+import pandas as pd
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def frame_nbytes(data: Any) -> int:
+    """Shallow memory footprint of a DataFrame/Series/array (0 if unknown)."""
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=True, deep=False).sum())
+    if isinstance(data, pd.Series):
+        return int(data.memory_usage(index=True, deep=False))
+    return int(getattr(data, 'nbytes', 0))
+
+
+class MemoryBudget:
+    """Record of the bytes allocated and the peak memory of each pipeline step."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracemalloc if it is not already tracing."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracemalloc if this budget started it."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    @contextmanager
+    def step(self, name: str, baseline: Any = None) -> Iterator[Dict[str, Any]]:
+        """
+        Measure one step.
+
+        Tracing started by the step itself is stopped when it ends; call
+        ``start``/``stop`` around a run of steps to trace them all at once.
+
+        Args:
+            name: Step name
+            baseline: Input of the step, whose size is recorded for reference
+
+        Yields:
+            The record being filled (callers may add keys, e.g. 'n_new_columns')
+        """
+        started_here = not tracemalloc.is_tracing()
+        self.start()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        entry = {'step': name, 'input_bytes': frame_nbytes(baseline)}
+        try:
+            yield entry
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            entry['bytes_allocated'] = int(current - start_current)
+            entry['peak_bytes'] = int(peak - start_current)
+            self.records.append(entry)
+            if started_here:
+                self.stop()
+
+    @property
+    def peak_bytes(self) -> int:
+        return max((entry['peak_bytes'] for entry in self.records), default=0)
+
+    def report(self) -> pd.DataFrame:
+        """Return the budget as a DataFrame (one row per step)."""
+        columns = ['step', 'input_bytes', 'bytes_allocated', 'peak_bytes']
+        report = pd.DataFrame(self.records)
+        return report.reindex(columns=columns + [col for col in report.columns if col not in columns])
+
+    def log_summary(self, log: Optional[logging.Logger] = None) -> None:
+        """Log the bytes allocated and the peak of every recorded step."""
+        log = log or logger
+        if not self.records:
+            log.info("No pipeline steps recorded")
+            return
+
+        for entry in self.records:
+            log.info(
+                f"Step {entry['step']}: input {entry['input_bytes'] / 1024**2:.2f} MB, "
+                f"allocated {entry['bytes_allocated'] / 1024**2:.2f} MB, "
+                f"peak {entry['peak_bytes'] / 1024**2:.2f} MB"
+            )
+        log.info(f"Largest step peak above its starting memory: {self.peak_bytes:,} bytes")
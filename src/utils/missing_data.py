@@ -0,0 +1,254 @@
+"""
+Single-pass missing-data profile and bulk fill policies for panels.
+
+The data-quality report and the cleaning step both need per-column missing
+statistics. ``MissingDataProfile`` computes them once from the validity
+mask of the panel: the runs of missing rows of every column come from one
+``diff`` of the (transposed, padded) mask, so missing rates, gap counts and
+lengths, the gap-length histogram and each column's structural start (first
+valid date; missing rows before it are the series not existing yet, not
+gaps) take a few vectorized passes however many columns there are.
+
+The profile then applies fill policies to groups of columns in bulk:
+``'ffill'`` (optionally limited), ``'interpolate'`` (linear, inside gaps
+only) and ``'drop'``, reusing the mask and the last/next valid positions
+instead of calling pandas column by column.
+
+Example:
+    profile = MissingDataProfile(panel)
+    panel = panel.drop(columns=profile.columns_above(50))
+    panel = profile.fill(panel, {'ffill': economic_cols}, limit=22)
+"""
+
+import fnmatch
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+FILL_POLICIES = ('ffill', 'interpolate', 'drop', 'none')
+
+# Lower edges of the gap-length histogram bins (in rows)
+GAP_BINS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class MissingDataProfile:
+    """Missing-data statistics of every column of a panel from one validity mask."""
+
+    def __init__(self, data: pd.DataFrame, gap_bins: Sequence[int] = GAP_BINS):
+        """
+        Args:
+            data: Panel (rows x columns)
+            gap_bins: Increasing lower edges of the gap-length histogram bins
+        """
+        self.index = data.index
+        self.columns = data.columns
+        self.valid = data.notna().to_numpy()
+        self.gap_bins = np.asarray(gap_bins, dtype=np.int64)
+        self._last_valid = None
+        self._next_valid = None
+
+        n_rows, n_cols = self.valid.shape
+        self.n_rows = n_rows
+        self.valid_count = self.valid.sum(axis=0)
+        self.missing_count = n_rows - self.valid_count
+
+        # Runs of missing rows, ordered by column then row
+        padded = np.zeros((n_cols, n_rows + 2), dtype=np.int8)
+        padded[:, 1:-1] = ~self.valid.T
+        steps = np.diff(padded, axis=1)
+        run_cols, run_starts = np.nonzero(steps == 1)
+        _, run_ends = np.nonzero(steps == -1)
+        run_lengths = run_ends - run_starts
+
+        # A run starting in the first row precedes the structural start
+        leading = run_starts == 0
+        self.leading_missing = np.zeros(n_cols, dtype=np.int64)
+        self.leading_missing[run_cols[leading]] = run_lengths[leading]
+        gap_cols, gap_lengths = run_cols[~leading], run_lengths[~leading]
+
+        self.n_runs = np.bincount(run_cols, minlength=n_cols)
+        self.n_gaps = np.bincount(gap_cols, minlength=n_cols)
+        self.longest_gap = np.zeros(n_cols, dtype=np.int64)
+        np.maximum.at(self.longest_gap, gap_cols, gap_lengths)
+
+        n_bins = len(self.gap_bins)
+        bins = np.searchsorted(self.gap_bins, gap_lengths, side='right') - 1
+        self.gap_histogram_counts = np.bincount(
+            gap_cols * n_bins + bins, minlength=n_cols * n_bins
+        ).reshape(n_cols, n_bins)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def matches(self, data: pd.DataFrame) -> bool:
+        """True if ``data`` has the profiled index and only profiled columns."""
+        return data.index.equals(self.index) and data.columns.isin(self.columns).all()
+
+    @property
+    def missing_pct(self) -> pd.Series:
+        """Percentage of missing rows per column."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.missing_count / self.n_rows * 100, index=self.columns)
+
+    @property
+    def structural_start(self) -> pd.Series:
+        """First valid index label per column (NaT/None for empty columns)."""
+        if not self.n_rows:
+            return pd.Series(None, index=self.columns, dtype=object)
+        starts = np.where(self.valid_count > 0, self.leading_missing, 0)
+        return pd.Series(self.index[starts], index=self.columns).where(self.valid_count > 0)
+
+    @property
+    def gap_histogram(self) -> pd.DataFrame:
+        """Number of gaps (after the structural start) per column and length bin."""
+        edges = list(self.gap_bins)
+        labels = [
+            str(low) if high - low == 1 else f"{low}-{high - 1}"
+            for low, high in zip(edges[:-1], edges[1:])
+        ] + [f"{edges[-1]}+"]
+        return pd.DataFrame(self.gap_histogram_counts, index=self.columns, columns=labels)
+
+    def columns_above(self, threshold_pct: float) -> List[str]:
+        """Columns with more than ``threshold_pct`` percent missing."""
+        return self.columns[self.missing_pct.to_numpy() > threshold_pct].tolist()
+
+    def columns_between(self, low_pct: float, high_pct: float) -> List[str]:
+        """Columns with more than ``low_pct`` and at most ``high_pct`` percent missing."""
+        pct = self.missing_pct.to_numpy()
+        return self.columns[(pct > low_pct) & (pct <= high_pct)].tolist()
+
+    def to_report(self) -> Dict[str, Any]:
+        """
+        Missing-data section of the quality report.
+
+        Keeps the keys of the former per-column analysis (``total_missing``,
+        ``missing_percentage`` and per-column ``missing_patterns`` with
+        ``max_consecutive``, ``avg_consecutive``, ``num_gaps``) and adds the
+        structural start, longest gap after it and gap-length histogram.
+        """
+        missing_pct = self.missing_pct
+        structural_start = self.structural_start
+        bin_labels = self.gap_histogram.columns
+        longest_run = np.maximum(self.longest_gap, self.leading_missing)
+        # Missing rows per run of (valid row + following missing rows), as before
+        groups = self.valid_count + (self.leading_missing > 0)
+
+        patterns = {}
+        for j in np.flatnonzero(self.missing_count > 0):
+            col = self.columns[j]
+            patterns[col] = {
+                'max_consecutive': int(longest_run[j]),
+                'avg_consecutive': float(self.missing_count[j] / groups[j]),
+                'num_gaps': int(self.n_runs[j]),
+                'leading_missing': int(self.leading_missing[j]),
+                'longest_gap': int(self.longest_gap[j]),
+                'gap_histogram': {
+                    label: int(count) for label, count in zip(bin_labels, self.gap_histogram_counts[j]) if count
+                }
+            }
+
+        return {
+            'total_missing': dict(zip(self.columns, self.missing_count.tolist())),
+            'missing_percentage': missing_pct.to_dict(),
+            'structural_start': structural_start.to_dict(),
+            'missing_patterns': patterns
+        }
+
+    def _positions(self) -> tuple:
+        """Last and next valid row at or around every cell (-1 / n_rows where none)."""
+        if self._last_valid is None:
+            rows = np.arange(self.n_rows)[:, None]
+            self._last_valid = np.maximum.accumulate(np.where(self.valid, rows, -1), axis=0)
+            self._next_valid = np.minimum.accumulate(
+                np.where(self.valid, rows, self.n_rows)[::-1], axis=0
+            )[::-1]
+        return self._last_valid, self._next_valid
+
+    def fill(
+        self,
+        data: pd.DataFrame,
+        policies: Dict[str, Sequence[str]],
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Apply fill policies to groups of columns, one block per policy.
+
+        Args:
+            data: Panel with the profiled index (and a subset of its columns);
+                values may have changed since profiling, missing cells may not
+            policies: Columns by policy: 'ffill' (carry the last valid value),
+                'interpolate' (linear in row position, inside gaps only),
+                'drop' (remove the columns) or 'none'
+            limit: Maximum consecutive missing rows filled after a valid value
+
+        Returns:
+            New DataFrame with the policies applied
+        """
+        unknown = set(policies) - set(FILL_POLICIES)
+        if unknown:
+            raise ValueError(f"Unknown fill policies {sorted(unknown)}; expected {FILL_POLICIES}")
+        if not self.matches(data):
+            raise ValueError("Data does not match the profiled index and columns")
+
+        result = data.copy()
+        last_valid, next_valid = self._positions()
+        rows = np.arange(self.n_rows)[:, None]
+
+        for policy in ('ffill', 'interpolate'):
+            columns = [col for col in policies.get(policy, []) if col in result.columns]
+            numeric = [col for col in columns if result[col].dtype.kind in 'fiub']
+            if policy == 'ffill':
+                other = [col for col in columns if col not in numeric]
+                if other:
+                    result[other] = result[other].ffill(limit=limit)
+            if not numeric:
+                continue
+
+            positions = self.columns.get_indexer(numeric)
+            values = result[numeric].to_numpy(dtype=float)
+            last = last_valid[:, positions]
+            missing = ~self.valid[:, positions] & (last >= 0)
+            if limit is not None:
+                missing &= rows - last <= int(limit)
+            previous = np.take_along_axis(values, np.clip(last, 0, None), axis=0)
+
+            if policy == 'ffill':
+                filled = np.where(missing, previous, values)
+            else:
+                after = next_valid[:, positions]
+                missing &= after < self.n_rows
+                following = np.take_along_axis(values, np.clip(after, 0, self.n_rows - 1), axis=0)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    weight = (rows - last) / (after - last)
+                filled = np.where(missing, previous + weight * (following - previous), values)
+
+            result[numeric] = pd.DataFrame(filled, index=result.index, columns=numeric)
+
+        dropped = [col for col in policies.get('drop', []) if col in result.columns]
+        return result.drop(columns=dropped)
+
+    def __repr__(self) -> str:
+        return (
+            f"MissingDataProfile(rows={self.n_rows}, columns={len(self.columns)}, "
+            f"missing={int(self.missing_count.sum())})"
+        )
+
+
+def match_policies(columns: Sequence[str], patterns: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Group columns by fill policy from glob patterns (first match wins, case-insensitive).
+
+    Args:
+        columns: Column names
+        patterns: Policy by column pattern, e.g. ``{'*economic*': 'ffill'}``
+
+    Returns:
+        Columns by policy
+    """
+    policies: Dict[str, List[str]] = {}
+    for col in columns:
+        for pattern, policy in (patterns or {}).items():
+            if fnmatch.fnmatch(str(col).lower(), pattern.lower()):
+                policies.setdefault(policy, []).append(col)
+                break
+    return policies
@@ -0,0 +1,250 @@
+"""
+Vectorized robust outlier detection for whole panels.
+
+Outlier bounds for every column of a (dates x series) block are computed in
+one pass, either from global per-column statistics (z-score, modified
+z-score, IQR) or from rolling windows (trailing median/MAD, or a centered
+Hampel filter). Rolling medians and MADs are exact: the windows are
+``sliding_window_view``s of the block, sorted once along the window axis
+(NaNs last), processed in row blocks sized from a byte budget so memory
+stays bounded however many columns the block has.
+
+A policy then acts on the values outside the bounds: ``'clip'`` them to the
+bounds, set them to ``'nan'``, or only ``'flag'`` them. Outliers are
+returned as an ``OutlierMask`` holding their (row, column) positions, which
+is compact when outliers are rare.
+
+Example:
+    cleaned, mask = handle_outliers(prices, method='hampel', window=21, policy='clip')
+    mask.counts()        # outliers per column
+"""
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, Tuple
+import warnings
+
+OUTLIER_METHODS = ('zscore', 'modified_zscore', 'iqr', 'rolling_mad', 'hampel')
+OUTLIER_POLICIES = ('flag', 'clip', 'nan')
+
+# MAD -> standard deviation under normality (1 / 0.6745)
+MAD_SCALE = 1.4826
+
+
+class OutlierMask:
+    """Positions of the outliers of a (dates x series) panel."""
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, index: pd.Index, columns: pd.Index):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.index = index
+        self.columns = columns
+
+    @classmethod
+    def from_dense(cls, mask: np.ndarray, index: pd.Index, columns: pd.Index) -> "OutlierMask":
+        rows, cols = np.nonzero(mask)
+        return cls(rows, cols, index, columns)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_array(self) -> np.ndarray:
+        """Dense boolean (dates x series) array."""
+        mask = np.zeros((len(self.index), len(self.columns)), dtype=bool)
+        mask[self.rows, self.cols] = True
+        return mask
+
+    def to_frame(self) -> pd.DataFrame:
+        """Dense boolean DataFrame."""
+        return pd.DataFrame(self.to_array(), index=self.index, columns=self.columns)
+
+    def counts(self) -> pd.Series:
+        """Number of outliers per column."""
+        return pd.Series(np.bincount(self.cols, minlength=len(self.columns)), index=self.columns)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.nbytes + self.cols.nbytes)
+
+    def __repr__(self) -> str:
+        return f"OutlierMask(outliers={len(self)}, shape=({len(self.index)}, {len(self.columns)}))"
+
+
+def _sorted_quantile(sorted_values: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """
+    Linear-interpolated quantile along the last axis of NaN-last sorted
+    values with ``counts`` valid entries (NaN where there are none).
+    """
+    position = np.clip(counts - 1, 0, None) * q
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    low_values = np.take_along_axis(sorted_values, low[..., None], axis=-1)[..., 0]
+    high_values = np.take_along_axis(sorted_values, high[..., None], axis=-1)[..., 0]
+    quantile = low_values + (high_values - low_values) * (position - low)
+    return np.where(counts > 0, quantile, np.nan)
+
+
+def _median_mad(windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Median, MAD and valid count along the last axis."""
+    windows = np.sort(windows, axis=-1)
+    counts = (~np.isnan(windows)).sum(axis=-1)
+    median = _sorted_quantile(windows, counts, 0.5)
+    deviations = np.sort(np.abs(windows - median[..., None]), axis=-1)
+    return median, _sorted_quantile(deviations, counts, 0.5), counts
+
+
+def _rolling_median_mad(
+    values: np.ndarray,
+    window: int,
+    centered: bool,
+    block_rows: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rolling median, MAD and valid count of every column (dates x series)."""
+    n_rows, n_cols = values.shape
+    before = window // 2 if centered else window - 1
+    padded = np.full((n_rows + window - 1, n_cols), np.nan)
+    padded[before:before + n_rows] = values
+
+    median = np.empty((n_rows, n_cols))
+    mad = np.empty((n_rows, n_cols))
+    counts = np.empty((n_rows, n_cols), dtype=np.int64)
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        windows = sliding_window_view(padded[start:stop + window - 1], window, axis=0)
+        median[start:stop], mad[start:stop], counts[start:stop] = _median_mad(windows)
+    return median, mad, counts
+
+
+def outlier_bounds(
+    values: np.ndarray,
+    method: str = 'hampel',
+    threshold: float = 3.0,
+    window: int = 21,
+    min_periods: Optional[int] = None,
+    block_rows: Optional[int] = None,
+    block_bytes: int = 64 * 1024**2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower and upper outlier bounds for every column of a (dates x series) array.
+
+    Args:
+        values: 2-D float array (NaN = missing)
+        method: 'zscore' (mean +/- threshold * std), 'modified_zscore'
+            (median +/- threshold * MAD / 0.6745), 'iqr' (quartiles +/-
+            threshold * IQR), 'rolling_mad' (trailing window median +/-
+            threshold * 1.4826 * MAD) or 'hampel' (the same over a centered window)
+        threshold: Width of the bounds in units of the method's scale
+        window: Window length in rows for the rolling methods
+        min_periods: Valid observations needed in a window (default
+            ``window // 2 + 1``); bounds are NaN (nothing flagged) below it
+        block_rows: Rows of windows sorted at once by the rolling methods
+            (default: as many as fit in ``block_bytes``)
+        block_bytes: Memory budget of one block of the rolling methods,
+            which hold about three float copies of its (rows x columns x
+            window) windows (sorted windows, deviations, sorted deviations)
+
+    Returns:
+        (lower, upper) arrays broadcastable against ``values``
+    """
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Method must be one of {OUTLIER_METHODS}, got '{method}'")
+    values = np.asarray(values, dtype=float)
+
+    if method == 'zscore':
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            center = np.nanmean(values, axis=0)
+            spread = threshold * np.nanstd(values, axis=0, ddof=1)
+        return center - spread, center + spread
+    if method == 'modified_zscore':
+        center, mad, _ = _median_mad(values.T)
+        spread = threshold * mad / 0.6745
+        return center - spread, center + spread
+    if method == 'iqr':
+        columns = np.sort(values.T, axis=-1)
+        counts = (~np.isnan(columns)).sum(axis=-1)
+        q1 = _sorted_quantile(columns, counts, 0.25)
+        q3 = _sorted_quantile(columns, counts, 0.75)
+        return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+
+    window = int(window)
+    if window < 2:
+        raise ValueError(f"Window must be at least 2 rows, got {window}")
+    min_periods = window // 2 + 1 if min_periods is None else int(min_periods)
+    if block_rows is None:
+        block_rows = int(block_bytes) // (max(values.shape[1], 1) * window * 8 * 3)
+    block_rows = max(int(block_rows), 1)
+    median, mad, counts = _rolling_median_mad(values, window, method == 'hampel', block_rows)
+    spread = threshold * MAD_SCALE * mad
+    enough = counts >= min_periods
+    return np.where(enough, median - spread, np.nan), np.where(enough, median + spread, np.nan)
+
+
+def apply_outlier_policy(
+    values: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    policy: str = 'nan'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply a policy to the values outside ``[lower, upper]``.
+
+    Args:
+        values: 2-D float array
+        lower: Lower bounds (broadcastable)
+        upper: Upper bounds (broadcastable)
+        policy: 'clip' to the bounds, 'nan' to set missing, 'flag' to keep
+
+    Returns:
+        (new values, dense boolean outlier mask)
+    """
+    if policy not in OUTLIER_POLICIES:
+        raise ValueError(f"Policy must be one of {OUTLIER_POLICIES}, got '{policy}'")
+    below = values < lower
+    above = values > upper
+    mask = below | above
+
+    if policy == 'clip':
+        values = np.where(below, lower, np.where(above, upper, values))
+    elif policy == 'nan':
+        values = np.where(mask, np.nan, values)
+    return values, mask
+
+
+def handle_outliers(
+    data: pd.DataFrame,
+    method: str = 'hampel',
+    threshold: float = 3.0,
+    window: int = 21,
+    policy: str = 'nan',
+    min_periods: Optional[int] = None
+) -> Tuple[pd.DataFrame, OutlierMask]:
+    """
+    Detect and treat outliers in every numeric column of a panel at once.
+
+    Args:
+        data: DataFrame (dates x series); non-numeric columns pass through
+        method: Detection method (see ``outlier_bounds``)
+        threshold: Width of the bounds
+        window: Window length for 'rolling_mad' and 'hampel'
+        policy: 'clip', 'nan' or 'flag' (see ``apply_outlier_policy``)
+        min_periods: Valid observations needed per rolling window
+
+    Returns:
+        (treated DataFrame, OutlierMask over the numeric columns)
+    """
+    numeric = data.select_dtypes(include=[np.number]).columns
+    values = data[numeric].to_numpy(dtype=float)
+    lower, upper = outlier_bounds(values, method, threshold, window, min_periods)
+    treated, mask = apply_outlier_policy(values, lower, upper, policy)
+
+    outliers = OutlierMask.from_dense(mask, data.index, numeric)
+    if policy == 'flag' or not mask.any():
+        return data, outliers
+
+    result = data.copy()
+    changed = numeric[mask.any(axis=0)]
+    positions = numeric.get_indexer(changed)
+    result[changed] = pd.DataFrame(treated[:, positions], index=data.index, columns=changed)
+    return result, outliers
@@ -0,0 +1,107 @@
+"""
+Process-parallel column kernels over shared memory.
+
+``run_column_sharded`` splits the columns (assets) of a (dates x assets)
+array into contiguous shards and runs a kernel on each shard in a process
+pool. The input is copied once into a shared-memory block that every worker
+maps, and each worker writes its results straight into its slice of a
+preallocated shared output block, so no arrays or DataFrames are pickled
+between processes.
+
+Kernels must be module-level functions (so they can be sent to workers by
+reference) that take the shard's (dates x shard_assets) input followed by
+``kernel_args`` and return an array of shape (dates, shard_assets, *trailing)
+whose values depend only on their own column.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, List, Sequence, Tuple
+import os
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """Number of worker processes for ``n_jobs`` (-1 or None means all cores)."""
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    return max(int(n_jobs), 1)
+
+
+def shard_columns(n_columns: int, n_shards: int) -> List[Tuple[int, int]]:
+    """Split ``range(n_columns)`` into at most ``n_shards`` contiguous (start, stop) ranges."""
+    n_shards = max(min(n_shards, n_columns), 1)
+    bounds = np.linspace(0, n_columns, n_shards + 1).astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _run_shard(
+    kernel: Callable,
+    in_name: str,
+    in_shape: Tuple[int, ...],
+    out_name: str,
+    out_shape: Tuple[int, ...],
+    start: int,
+    stop: int,
+    kernel_args: tuple
+) -> None:
+    """Worker: map the shared blocks, run the kernel on one shard, write in place."""
+    in_block = shared_memory.SharedMemory(name=in_name)
+    out_block = shared_memory.SharedMemory(name=out_name)
+    try:
+        values = np.ndarray(in_shape, dtype=np.float64, buffer=in_block.buf)
+        output = np.ndarray(out_shape, dtype=np.float64, buffer=out_block.buf)
+        output[:, start:stop] = kernel(values[:, start:stop], *kernel_args)
+        del values, output
+    finally:
+        in_block.close()
+        out_block.close()
+
+
+def run_column_sharded(
+    kernel: Callable,
+    values: np.ndarray,
+    trailing_shape: Sequence[int],
+    n_jobs: int = 1,
+    kernel_args: tuple = ()
+) -> np.ndarray:
+    """
+    Apply a per-column kernel to ``values``, sharding columns across processes.
+
+    Args:
+        kernel: Module-level function ``kernel(shard, *kernel_args)``
+        values: 2-D float array (dates x assets)
+        trailing_shape: Per-asset output shape after the (dates, assets) axes
+        n_jobs: Worker processes (1 runs in-process, -1 uses all cores)
+        kernel_args: Extra arguments passed to the kernel
+
+    Returns:
+        Float array of shape (dates, assets, *trailing_shape)
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    out_shape = values.shape + tuple(trailing_shape)
+    shards = shard_columns(values.shape[1], resolve_n_jobs(n_jobs))
+
+    if len(shards) <= 1:
+        return np.asarray(kernel(values, *kernel_args), dtype=np.float64).reshape(out_shape)
+
+    in_block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    out_block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(out_shape)) * 8, 1))
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=in_block.buf)[:] = values
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [
+                executor.submit(
+                    _run_shard, kernel, in_block.name, values.shape,
+                    out_block.name, out_shape, start, stop, kernel_args
+                )
+                for start, stop in shards
+            ]
+            for future in futures:
+                future.result()
+        return np.ndarray(out_shape, dtype=np.float64, buffer=out_block.buf).copy()
+    finally:
+        in_block.close()
+        in_block.unlink()
+        out_block.close()
+        out_block.unlink()
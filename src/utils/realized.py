@@ -0,0 +1,272 @@
+"""
+Daily realized measures of every symbol from intraday bars.
+
+``helpers.calculate_realized_volatility`` resamples one return series at a
+time. ``realized_measures`` takes the intraday panel (bars x symbols, e.g.
+the 1-minute closes of the intraday collector) and computes, for all symbols
+at once, one value per symbol and calendar day of the bars:
+
+- ``realized_variance``: sum of squared intraday log returns;
+- ``bipower_variation``: ``pi / 2`` times the sum of products of adjacent
+  absolute returns (robust to jumps);
+- ``realized_skewness``: ``sqrt(n) * sum(r**3) / RV**1.5``;
+- ``realized_kurtosis``: ``n * sum(r**4) / RV**2``;
+- ``parkinson_variance``: ``ln(H / L)**2 / (4 ln 2)`` from the day's range;
+- ``garman_klass_variance``: ``0.5 ln(H / L)**2 - (2 ln 2 - 1) ln(C / O)**2``.
+
+Returns never span two days (the overnight return is excluded), and a
+missing bar carries the symbol's last price of the day. With
+``subsample=k`` the return-based measures use every ``k``-th bar; by
+default they are averaged over the ``k`` possible starting bars
+(subsampled estimator), which uses all the data while damping
+microstructure noise. Daily sums are segment reductions (``reduceat``) over
+the day-sorted block, so the cost is a few passes over the panel however
+many symbols it holds.
+
+Example:
+    measures = realized_measures(minute_closes, high=minute_highs, low=minute_lows, subsample=5)
+    daily = add_realized_measures(daily, measures)    # adds '{symbol}_realized_variance', ...
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence, Union
+
+REALIZED_MEASURES = (
+    'realized_variance', 'bipower_variation', 'realized_skewness',
+    'realized_kurtosis', 'parkinson_variance', 'garman_klass_variance'
+)
+
+# Measures in units of variance (scaled by ``trading_periods`` when annualized)
+VARIANCE_MEASURES = (
+    'realized_variance', 'bipower_variation', 'parkinson_variance', 'garman_klass_variance'
+)
+
+
+def _bars_per_step(index: pd.DatetimeIndex, subsample: Union[int, str, pd.Timedelta]) -> int:
+    """Subsampling step in bars (a duration is divided by the median bar spacing)."""
+    if isinstance(subsample, (int, np.integer)):
+        step = int(subsample)
+    else:
+        spacing = np.diff(index.as_unit('ns').asi8)
+        spacing = spacing[spacing > 0]
+        if not len(spacing):
+            return 1
+        step = int(round(pd.Timedelta(subsample).value / np.median(spacing)))
+    if step < 1:
+        raise ValueError(f"Subsampling step must be at least one bar, got {subsample}")
+    return step
+
+
+def _day_sums(values: np.ndarray, days: np.ndarray, n_days: int) -> np.ndarray:
+    """Sum of the rows of ``values`` by (sorted) day code, zero for days without rows."""
+    sums = np.zeros((n_days,) + values.shape[1:])
+    if len(values):
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        sums[days[starts]] = np.add.reduceat(values, starts, axis=0)
+    return sums
+
+
+def _carry_within_day(values: np.ndarray, day_start_rows: np.ndarray) -> np.ndarray:
+    """Forward fill each column, without carrying a value into the next day."""
+    rows = np.arange(len(values))[:, None]
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), -1, rows), axis=0)
+    stale = last_valid < day_start_rows[:, None]
+    filled = values[np.clip(last_valid, 0, None), np.arange(values.shape[1])]
+    filled[stale] = np.nan
+    return filled
+
+
+def _first_valid_in_day(values: np.ndarray, day_start_rows: np.ndarray, day_end_rows: np.ndarray) -> np.ndarray:
+    """First non-NaN value of every column in each day (NaN if the day has none)."""
+    n_rows = len(values)
+    rows = np.arange(n_rows)[:, None]
+    next_valid = np.minimum.accumulate(np.where(np.isnan(values), n_rows, rows)[::-1], axis=0)[::-1]
+    first = next_valid[day_start_rows]
+    missing = first > day_end_rows[:, None]
+    result = values[np.clip(first, 0, n_rows - 1), np.arange(values.shape[1])]
+    result[missing] = np.nan
+    return result
+
+
+def _return_sums(
+    log_prices: np.ndarray,
+    day_codes: np.ndarray,
+    day_position: np.ndarray,
+    n_days: int,
+    step: int,
+    offset: int
+) -> Dict[str, np.ndarray]:
+    """Daily return counts and power sums of the bars at ``offset``, ``offset + step``, ..."""
+    keep = day_position % step == offset
+    prices = log_prices[keep]
+    days = day_codes[keep]
+
+    returns = prices[1:] - prices[:-1]
+    returns[days[1:] != days[:-1]] = np.nan
+    days = days[1:]
+    valid = ~np.isnan(returns)
+    r = np.where(valid, returns, 0.0)
+
+    # Adjacent absolute returns: the previous return is from the same day
+    adjacent = np.abs(r[1:]) * np.abs(r[:-1])
+    adjacent_valid = valid[1:] & valid[:-1] & (days[1:] == days[:-1])[:, None]
+
+    squares = r * r
+    return {
+        'n': _day_sums(valid.astype(float), days, n_days),
+        's2': _day_sums(squares, days, n_days),
+        's3': _day_sums(squares * r, days, n_days),
+        's4': _day_sums(squares * squares, days, n_days),
+        'bv': _day_sums(np.where(adjacent_valid, adjacent, 0.0), days[1:], n_days)
+    }
+
+
+def realized_measures(
+    close: pd.DataFrame,
+    open: Optional[pd.DataFrame] = None,
+    high: Optional[pd.DataFrame] = None,
+    low: Optional[pd.DataFrame] = None,
+    subsample: Union[int, str, pd.Timedelta] = 1,
+    average_offsets: bool = True,
+    measures: Optional[Sequence[str]] = None,
+    min_returns: int = 2,
+    annualize: bool = False,
+    trading_periods: int = 252
+) -> Dict[str, pd.DataFrame]:
+    """
+    Daily realized measures of every symbol of an intraday bar panel.
+
+    Args:
+        close: Bar closes (bars x symbols) on a sorted DatetimeIndex; days are
+            the calendar dates of the index (local wall time)
+        open: Bar opens for Garman-Klass (default: the day's first close)
+        high: Bar highs for the range estimators (default: closes)
+        low: Bar lows for the range estimators (default: closes)
+        subsample: Sampling step of the return-based measures, in bars or as
+            a duration (e.g. '5min')
+        average_offsets: Average the return-based measures over all
+            starting bars of the step; False samples from the first bar only
+        measures: Measures to compute (default ``REALIZED_MEASURES``)
+        min_returns: Returns a day needs per sampling for the return-based
+            measures (NaN below it)
+        annualize: Scale the variance measures by ``trading_periods``
+        trading_periods: Trading days per year for annualization
+
+    Returns:
+        Dictionary of DataFrames (days x symbols) by measure name
+    """
+    measures = list(REALIZED_MEASURES if measures is None else measures)
+    unknown = set(measures) - set(REALIZED_MEASURES)
+    if unknown:
+        raise ValueError(f"Unknown realized measures {sorted(unknown)}; expected {REALIZED_MEASURES}")
+    if not isinstance(close.index, pd.DatetimeIndex) or not close.index.is_monotonic_increasing:
+        raise ValueError("Realized measures need bars on a sorted DatetimeIndex")
+
+    close = close.select_dtypes(include=[np.number])
+    symbols = close.columns
+    if close.empty:
+        empty = pd.DatetimeIndex([], name='date')
+        return {name: pd.DataFrame(index=empty, columns=symbols, dtype=float) for name in measures}
+    index = close.index.tz_localize(None) if close.index.tz is not None else close.index
+    dates = index.normalize()
+    day_index, day_codes = np.unique(dates.as_unit('ns').asi8, return_inverse=True)
+    day_index = pd.DatetimeIndex(day_index.view('datetime64[ns]'), name='date')
+    n_days = len(day_index)
+    day_start_rows = np.flatnonzero(np.r_[True, day_codes[1:] != day_codes[:-1]])
+    day_end_rows = np.r_[day_start_rows[1:], len(day_codes)] - 1
+    day_position = np.arange(len(day_codes)) - day_start_rows[day_codes]
+
+    def bars(frame: Optional[pd.DataFrame]) -> Optional[np.ndarray]:
+        if frame is None:
+            return None
+        return frame.reindex(index=close.index, columns=symbols).to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_close = np.log(close.to_numpy(dtype=float))
+    log_close[~np.isfinite(log_close)] = np.nan
+    filled = _carry_within_day(log_close, day_start_rows[day_codes])
+
+    results = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if set(measures) & {'realized_variance', 'bipower_variation', 'realized_skewness', 'realized_kurtosis'}:
+            step = _bars_per_step(index, subsample)
+            offsets = range(step) if average_offsets else range(1)
+            totals = {name: np.zeros((n_days, len(symbols))) for name in
+                      ('realized_variance', 'bipower_variation', 'realized_skewness', 'realized_kurtosis')}
+            used = np.zeros((n_days, len(symbols)))
+            for offset in offsets:
+                sums = _return_sums(filled, day_codes, day_position, n_days, step, offset)
+                enough = sums['n'] >= max(int(min_returns), 1)
+                n, rv = sums['n'], sums['s2']
+                values = {
+                    'realized_variance': rv,
+                    'bipower_variation': np.pi / 2 * sums['bv'],
+                    'realized_skewness': np.sqrt(n) * sums['s3'] / rv ** 1.5,
+                    'realized_kurtosis': n * sums['s4'] / rv ** 2
+                }
+                for name, value in values.items():
+                    totals[name] += np.where(enough, value, 0.0)
+                used += enough
+            for name, total in totals.items():
+                if name in measures:
+                    results[name] = np.where(used > 0, total / used, np.nan)
+
+        if set(measures) & {'parkinson_variance', 'garman_klass_variance'}:
+            close_values = np.exp(log_close)
+            highs = bars(high) if high is not None else close_values
+            lows = bars(low) if low is not None else close_values
+            day_high = np.fmax.reduceat(highs, day_start_rows, axis=0) if len(highs) else highs
+            day_low = np.fmin.reduceat(lows, day_start_rows, axis=0) if len(lows) else lows
+            log_range = np.log(day_high / day_low)
+            if 'parkinson_variance' in measures:
+                results['parkinson_variance'] = log_range ** 2 / (4 * np.log(2))
+            if 'garman_klass_variance' in measures:
+                opens = bars(open) if open is not None else close_values
+                day_open = _first_valid_in_day(opens, day_start_rows, day_end_rows)
+                day_close = np.exp(filled[day_end_rows])
+                log_body = np.log(day_close / day_open)
+                results['garman_klass_variance'] = (
+                    0.5 * log_range ** 2 - (2 * np.log(2) - 1) * log_body ** 2
+                )
+
+    frames = {}
+    for name in measures:
+        values = results[name]
+        if annualize and name in VARIANCE_MEASURES:
+            values = values * trading_periods
+        values = np.where(np.isfinite(values), values, np.nan)
+        frames[name] = pd.DataFrame(values, index=day_index, columns=symbols)
+    return frames
+
+
+def add_realized_measures(
+    daily: pd.DataFrame,
+    measures: Dict[str, pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Join daily realized measures onto a daily panel as ``{symbol}_{measure}`` columns.
+
+    Measure days are matched to the panel's dates (time of day ignored);
+    panel days without bars get NaN.
+
+    Args:
+        daily: Daily panel on a DatetimeIndex
+        measures: Output of ``realized_measures``
+
+    Returns:
+        Copy of ``daily`` with the measure columns added (replaced if present)
+    """
+    panel_index = daily.index.tz_localize(None) if daily.index.tz is not None else daily.index
+    panel_days = pd.DatetimeIndex(panel_index).normalize()
+
+    blocks = []
+    for name, frame in measures.items():
+        block = frame.reindex(panel_days)
+        block.columns = [f"{symbol}_{name}" for symbol in frame.columns]
+        blocks.append(block.set_axis(daily.index))
+    if not blocks:
+        return daily.copy()
+
+    added = pd.concat(blocks, axis=1)
+    return pd.concat([daily.drop(columns=added.columns, errors='ignore'), added], axis=1)
@@ -0,0 +1,201 @@
+"""
+Shared, memoized returns for every stage of a run.
+
+Feature engineering, derived variables, the event study, the pooled
+regression and the statistical tests all start from the same prices, and
+each used to recompute returns with its own ``pct_change``/log loop. A
+``ReturnsPanel`` is built once per run over the price frame(s) and every
+consumer reads from it: each (kind, horizon, gap convention, column) series
+is computed on first request and served from the cache afterwards
+(``computations`` counts the evaluations, so a run can check that every
+series was computed exactly once).
+
+Two gap conventions cover the existing consumers:
+
+- ``skip_gaps=True``: returns between consecutive *valid* observations,
+  dated at the later one (``prices.dropna().pct_change().dropna()``), as the
+  analyzers and ``calculate_returns`` use;
+- ``skip_gaps=False``: returns between adjacent rows of the full index
+  (``prices / prices.shift(h)``), as the feature engineering uses.
+
+Example:
+    panel = ReturnsPanel(prices)
+    panel.simple(['spy'])              # DataFrame on the full index
+    panel.series('spy', kind='log')    # valid returns only
+    panel.valid_mask(horizon=5)        # defined and finite
+"""
+
+import pandas as pd
+import numpy as np
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+RETURN_KINDS = ('simple', 'log')
+
+
+class ReturnsPanel:
+    """Memoized simple/log, multi-horizon returns over a set of price columns."""
+
+    def __init__(self, prices: pd.DataFrame):
+        """
+        Args:
+            prices: Price series (columns) on a common index; the panel keeps
+                references to the columns, not copies
+        """
+        self.index = prices.index
+        self._prices: Dict[str, pd.Series] = {}
+        self._cache: Dict[Tuple[str, int, bool], Dict[str, np.ndarray]] = {}
+        self.computations: Counter = Counter()
+        self.include(prices)
+
+    @classmethod
+    def for_data(cls, data: pd.DataFrame, panel: Optional["ReturnsPanel"] = None) -> "ReturnsPanel":
+        """
+        The shared panel extended with ``data``'s columns, or a new panel over
+        ``data`` when no panel is shared (or it lives on another index).
+        """
+        if panel is not None and panel.index.equals(data.index):
+            return panel.include(data)
+        if panel is not None:
+            logger.debug("Shared returns panel is on a different index; building a local panel")
+        return cls(data)
+
+    def include(self, data: pd.DataFrame) -> "ReturnsPanel":
+        """
+        Register the price columns of ``data``.
+
+        Columns already registered with the same prices keep their cached
+        returns; a column whose prices differ from the registered ones
+        replaces them, and its cached returns are dropped.
+        """
+        if not data.index.equals(self.index):
+            raise ValueError("Price columns must share the panel's index")
+        for col in data.columns:
+            prices = data[col]
+            known = self._prices.get(col)
+            if known is None:
+                self._prices[col] = prices
+            elif known is not prices and not known.equals(prices):
+                self._prices[col] = prices
+                for cache in self._cache.values():
+                    cache.pop(col, None)
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._prices)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._prices
+
+    def _compute(self, column: str, kind: str, horizon: int, skip_gaps: bool) -> np.ndarray:
+        prices = self._prices[column].to_numpy(dtype=float)
+        returns = np.full(len(prices), np.nan)
+
+        if skip_gaps:
+            # Horizon counted in valid observations, dated at the later one
+            positions = np.flatnonzero(~np.isnan(prices))
+            valid = prices[positions]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = valid[horizon:] / valid[:-horizon]
+            target = positions[horizon:]
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = prices[horizon:] / prices[:-horizon]
+            target = slice(horizon, None)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[target] = np.log(ratio) if kind == 'log' else ratio - 1
+        returns.flags.writeable = False
+        self.computations[(kind, horizon, skip_gaps, column)] += 1
+        return returns
+
+    def _arrays(
+        self,
+        columns: Optional[Iterable[str]],
+        kind: str,
+        horizon: int,
+        skip_gaps: bool
+    ) -> Tuple[List[str], List[np.ndarray]]:
+        if kind not in RETURN_KINDS:
+            raise ValueError("Method must be 'log' or 'simple'")
+        if int(horizon) < 1:
+            raise ValueError(f"Horizon must be a positive integer, got {horizon}")
+        horizon = int(horizon)
+
+        columns = self.columns if columns is None else list(columns)
+        missing = [col for col in columns if col not in self._prices]
+        if missing:
+            raise KeyError(f"Columns not in the returns panel: {missing}")
+
+        cache = self._cache.setdefault((kind, horizon, bool(skip_gaps)), {})
+        for col in columns:
+            if col not in cache:
+                cache[col] = self._compute(col, kind, horizon, bool(skip_gaps))
+        return columns, [cache[col] for col in columns]
+
+    def returns(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        kind: str = 'simple',
+        horizon: int = 1,
+        skip_gaps: bool = True
+    ) -> pd.DataFrame:
+        """
+        Returns of the selected columns on the panel's full index.
+
+        Args:
+            columns: Price columns; None selects every registered column
+            kind: 'simple' or 'log'
+            horizon: Return horizon (observations, see ``skip_gaps``)
+            skip_gaps: Measure returns between consecutive valid observations
+                instead of adjacent rows
+
+        Returns:
+            DataFrame with NaN where the return is undefined (the first
+            ``horizon`` observations and, without ``skip_gaps``, around gaps);
+            non-finite ratios (zero prices) are kept as computed
+        """
+        columns, arrays = self._arrays(columns, kind, horizon, skip_gaps)
+        block = np.column_stack(arrays) if arrays else np.empty((len(self.index), 0))
+        return pd.DataFrame(block, index=self.index, columns=columns, copy=False)
+
+    def simple(self, columns: Optional[Iterable[str]] = None, horizon: int = 1, skip_gaps: bool = True) -> pd.DataFrame:
+        """Simple returns ``p_t / p_{t-h} - 1`` (see ``returns``)."""
+        return self.returns(columns, 'simple', horizon, skip_gaps)
+
+    def log(self, columns: Optional[Iterable[str]] = None, horizon: int = 1, skip_gaps: bool = True) -> pd.DataFrame:
+        """Log returns ``log(p_t / p_{t-h})`` (see ``returns``)."""
+        return self.returns(columns, 'log', horizon, skip_gaps)
+
+    def series(self, column: str, kind: str = 'simple', horizon: int = 1, skip_gaps: bool = True) -> pd.Series:
+        """
+        Defined returns of one column, dated at their observation.
+
+        With the defaults this equals ``prices.dropna().pct_change().dropna()``.
+        """
+        _, (values,) = self._arrays([column], kind, horizon, skip_gaps)
+        returns = pd.Series(values, index=self.index, name=column)
+        return returns[~np.isnan(values)]
+
+    def valid_mask(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        kind: str = 'simple',
+        horizon: int = 1,
+        skip_gaps: bool = True
+    ) -> pd.DataFrame:
+        """Boolean frame marking returns that are defined and finite."""
+        columns, arrays = self._arrays(columns, kind, horizon, skip_gaps)
+        mask = np.column_stack([np.isfinite(values) for values in arrays]) if arrays else \
+            np.empty((len(self.index), 0), dtype=bool)
+        return pd.DataFrame(mask, index=self.index, columns=columns, copy=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"ReturnsPanel(columns={len(self._prices)}, rows={len(self.index)}, "
+            f"cached_series={sum(len(cache) for cache in self._cache.values())})"
+        )
@@ -0,0 +1,266 @@
+"""
+Vectorized rolling-window kernels for panels of time series.
+
+``rolling_moments`` computes count, sum, mean, variance, standard deviation,
+skewness and kurtosis for every column of a (dates x assets) array and every
+requested window from one set of (block-local) prefix sums of powers. The cost is
+O(T x A) for the prefix sums plus O(T x A) per window, instead of one pandas
+rolling pass per column, window and statistic.
+
+``rolling_rank`` and ``rolling_quantile`` cover the order statistics (percentile
+rank of the latest value, medians, arbitrary quantiles). They run over all
+columns of the array in one call on pandas' skiplist kernels, which keep each
+window sorted with O(log window) insertions and deletions per step.
+
+Results follow pandas' ``Series.rolling(window, min_periods)`` semantics:
+NaNs are skipped, a statistic is NaN when the window holds fewer than
+``min_periods`` valid observations, the sample variance needs at least two
+observations, skewness three and kurtosis four, and windows whose valid
+values are all identical give a variance of 0, a skewness of 0 and an
+excess kurtosis of -3. Values agree with pandas up to floating-point
+rounding.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence
+
+MOMENT_STATS = ('count', 'sum', 'mean', 'var', 'std', 'skew', 'kurt')
+
+
+def _consecutive_same_count(values: np.ndarray, valid: np.ndarray, valid_cum: np.ndarray) -> np.ndarray:
+    """
+    Length of the run of identical valid values ending at the last valid
+    observation on or before each row (0 before the first valid value).
+
+    ``valid_cum`` holds the number of valid observations before each row,
+    with a leading zero row (shape rows + 1).
+    """
+    n_rows = values.shape[0]
+    rows = np.arange(n_rows)[:, None]
+
+    # Previous valid value for every row (forward fill shifted by one)
+    last_valid_row = np.where(valid, rows, -1)
+    np.maximum.accumulate(last_valid_row, axis=0, out=last_valid_row)
+    previous_valid_row = np.vstack([np.full((1, values.shape[1]), -1), last_valid_row[:-1]])
+    columns = np.arange(values.shape[1])[None, :]
+    previous_value = values[np.maximum(previous_valid_row, 0), columns]
+
+    run_start = valid & ((previous_valid_row < 0) | (values != previous_value))
+    run_start_row = np.where(run_start, rows, -1)
+    np.maximum.accumulate(run_start_row, axis=0, out=run_start_row)
+
+    start_cum = valid_cum[np.maximum(run_start_row, 0), columns]
+    return np.where(run_start_row >= 0, valid_cum[1:] - start_cum, 0)
+
+
+def rolling_moments(
+    values: np.ndarray,
+    windows: Sequence[int],
+    min_periods: int = 1,
+    stats: Sequence[str] = MOMENT_STATS
+) -> np.ndarray:
+    """
+    Rolling moments for all columns and windows in one pass.
+
+    Args:
+        values: 2-D array (dates x assets); NaN marks missing observations
+        windows: Window lengths in rows
+        min_periods: Minimum valid observations for a non-NaN result
+            (capped at each window length)
+        stats: Statistics to return, any of ``MOMENT_STATS``
+
+    Returns:
+        Array of shape (dates, assets, len(windows), len(stats))
+    """
+    unknown = [stat for stat in stats if stat not in MOMENT_STATS]
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics: {unknown}. Choose from {MOMENT_STATS}")
+
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_rows, n_cols = values.shape
+    # Filled as (windows, stats, dates, assets) for contiguous writes and
+    # returned as a (dates, assets, windows, stats) view
+    result = np.full((len(windows), len(stats), n_rows, n_cols), np.nan)
+    if n_rows == 0 or n_cols == 0:
+        return result.transpose(2, 3, 0, 1)
+
+    valid = ~np.isnan(values)
+
+    # Center each column on its mean to limit cancellation in the power sums
+    with np.errstate(invalid='ignore'):
+        counts = valid.sum(axis=0)
+        center = np.where(counts > 0, np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+    centered = np.where(valid, values - center, 0.0)
+
+    # Block-local prefix sums of powers. A window spans at most one block
+    # boundary, so every window sum is a difference of sums over at most
+    # ``block`` rows (plus one block total) rather than of series-long
+    # prefix sums, which keeps rounding error independent of the series length.
+    n_powers = 4 if 'kurt' in stats else 3 if 'skew' in stats else 2
+    block = max(max(windows), 256)
+    n_blocks = n_rows // block + 1
+    padded_rows = n_blocks * block
+
+    powers = np.zeros((n_powers + 1, padded_rows, n_cols))
+    powers[0, :n_rows] = valid
+    powers[1, :n_rows] = centered
+    for k in range(2, n_powers + 1):
+        np.multiply(powers[k - 1, :n_rows], centered, out=powers[k, :n_rows])
+
+    inclusive = np.cumsum(powers.reshape(n_powers + 1, n_blocks, block, n_cols), axis=2)
+    block_totals = inclusive[:, :, -1, :]
+    inclusive = inclusive.reshape(n_powers + 1, padded_rows, n_cols)
+    local_prefix = np.empty_like(inclusive)
+    local_prefix[:, 1:] = inclusive[:, :-1]
+    local_prefix[:, ::block] = 0.0
+    del powers, inclusive
+
+    ends = np.arange(1, n_rows + 1)
+
+    def window_sums(starts: np.ndarray) -> np.ndarray:
+        # Sums over rows [start, end) for every end = 1 .. n_rows
+        sums = local_prefix[:, 1:n_rows + 1] - local_prefix[:, starts]
+        start_blocks = starts // block
+        crosses = (ends // block) > start_blocks
+        sums[:, crosses] += block_totals[:, start_blocks[crosses]]
+        return sums
+
+    valid_cum = np.concatenate([np.zeros((1, n_cols), dtype=np.int64), np.cumsum(valid, axis=0)])
+    same_run = None
+    if any(stat in ('var', 'std', 'skew', 'kurt') for stat in stats):
+        same_run = _consecutive_same_count(values, valid, valid_cum)
+
+    for w_idx, window in enumerate(windows):
+        starts = np.maximum(ends - window, 0)
+        result[w_idx] = moments_from_sums(window_sums(starts), center, same_run, window, min_periods, stats)
+
+    return result.transpose(2, 3, 0, 1)
+
+
+def moments_from_sums(
+    sums: np.ndarray,
+    center: np.ndarray,
+    same_run: Optional[np.ndarray],
+    window: int,
+    min_periods: int = 1,
+    stats: Sequence[str] = MOMENT_STATS
+) -> np.ndarray:
+    """
+    Window statistics from sums of centered powers.
+
+    Args:
+        sums: Array (n_powers + 1, ...) whose k-th entry is the window sum of
+            (x - center) ** k over valid observations (k = 0 is the count)
+        center: Value subtracted from the observations (broadcastable)
+        same_run: Length of the run of identical valid values ending at the
+            last valid observation (only needed for var/std/skew/kurt)
+        window: Window length (caps ``min_periods`` like pandas)
+        min_periods: Minimum valid observations for a non-NaN result
+        stats: Statistics to compute, any of ``MOMENT_STATS``
+
+    Returns:
+        Array (len(stats), ...) with the statistics in ``stats`` order
+    """
+    nobs = sums[0]
+    out_shape = (len(stats),) + nobs.shape
+    result = np.empty(out_shape)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        dn = np.maximum(nobs, 1)
+        enough = (nobs >= min(min_periods, window)) & (nobs > 0)
+        uniform = same_run >= nobs if same_run is not None else np.zeros(nobs.shape, dtype=bool)
+
+        A = sums[1] / dn
+        A2 = A * A
+        B = sums[2] / dn - A2 if len(sums) > 2 else None
+        C = sums[3] / dn - A2 * A - 3 * A * B if len(sums) > 3 else None
+        variance = None
+        if any(stat in ('var', 'std') for stat in stats):
+            ssq = np.maximum(sums[2] - sums[1] * A, 0.0)
+            variance = np.where(uniform | (nobs == 1), 0.0, ssq / (nobs - 1))
+            variance = np.where(nobs > 1, variance, np.nan)
+
+        for s_idx, stat in enumerate(stats):
+            if stat == 'count':
+                result[s_idx] = nobs
+                continue
+            elif stat == 'sum':
+                out = sums[1] + nobs * center
+            elif stat == 'mean':
+                out = A + center
+            elif stat == 'var':
+                out = variance
+            elif stat == 'std':
+                out = np.sqrt(variance)
+            elif stat == 'skew':
+                skew = np.sqrt(nobs * (nobs - 1.0)) * C / ((nobs - 2.0) * B * np.sqrt(B))
+                skew = np.where(B <= 1e-14, np.nan, skew)
+                out = np.where(nobs < 3, np.nan, np.where(uniform, 0.0, skew))
+            else:
+                D = sums[4] / dn - A2 * A2 - 6 * B * A2 - 4 * C * A
+                K = (nobs * nobs - 1.0) * D / (B * B) - 3 * (nobs - 1.0) ** 2
+                kurt = K / ((nobs - 2.0) * (nobs - 3.0))
+                kurt = np.where(B <= 1e-14, np.nan, kurt)
+                out = np.where(nobs < 4, np.nan, np.where(uniform, -3.0, kurt))
+
+            result[s_idx] = np.where(enough, out, np.nan)
+
+    return result
+
+
+def _as_2d(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def rolling_rank(
+    values: np.ndarray,
+    window: int,
+    min_periods: Optional[int] = None,
+    pct: bool = True
+) -> np.ndarray:
+    """
+    Rank of each value within its trailing window, for all columns at once.
+
+    Args:
+        values: 2-D array (dates x assets); NaN marks missing observations
+        window: Window length in rows
+        min_periods: Minimum valid observations (defaults to ``window``)
+        pct: Return the rank as a fraction of the valid window observations
+
+    Returns:
+        Array of shape (dates, assets); ties get their average rank
+    """
+    frame = pd.DataFrame(_as_2d(values))
+    return frame.rolling(window, min_periods=min_periods).rank(method='average', pct=pct).to_numpy()
+
+
+def rolling_quantile(
+    values: np.ndarray,
+    window: int,
+    quantiles: Sequence[float] = (0.5,),
+    min_periods: Optional[int] = None,
+    interpolation: str = 'linear'
+) -> np.ndarray:
+    """
+    Rolling quantiles (e.g. medians or regime thresholds) for all columns.
+
+    Args:
+        values: 2-D array (dates x assets); NaN marks missing observations
+        window: Window length in rows
+        quantiles: Quantiles in [0, 1]
+        min_periods: Minimum valid observations (defaults to ``window``)
+        interpolation: Interpolation between order statistics, as in pandas
+
+    Returns:
+        Array of shape (dates, assets, len(quantiles))
+    """
+    frame = pd.DataFrame(_as_2d(values))
+    rolling = frame.rolling(window, min_periods=min_periods)
+    result = np.empty(frame.shape + (len(quantiles),))
+    for q_idx, quantile in enumerate(quantiles):
+        result[:, :, q_idx] = rolling.quantile(quantile, interpolation=interpolation).to_numpy()
+    return result
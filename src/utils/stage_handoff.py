@@ -0,0 +1,237 @@
+"""
+Columnar handoff of data between pipeline stages.
+
+The orchestrator used to pass whole DataFrames from preprocessing to the
+analyzers, and each analyzer re-sliced (and often copied) the columns it
+needed. ``StageHandoff`` keeps one column-array view per series of the
+producing stage's frame and hands consumers only the columns they ask for,
+either as a DataFrame backed by those same (read-only) arrays or as an Arrow table
+(when ``pyarrow`` is installed). Every handoff is recorded in a
+``HandoffLedger`` so a run can report how many bytes were shared and how
+many had to be copied at each stage boundary.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HandoffLedger:
+    """Record of the bytes shared and copied at each stage boundary."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        producer: str,
+        consumer: str,
+        n_columns: int,
+        bytes_shared: int,
+        bytes_copied: int,
+        fmt: str = "pandas"
+    ) -> Dict[str, Any]:
+        """Append one boundary crossing to the ledger."""
+        entry = {
+            'producer': producer,
+            'consumer': consumer,
+            'format': fmt,
+            'n_columns': int(n_columns),
+            'bytes_shared': int(bytes_shared),
+            'bytes_copied': int(bytes_copied)
+        }
+        self.records.append(entry)
+        return entry
+
+    @property
+    def total_bytes_copied(self) -> int:
+        return sum(entry['bytes_copied'] for entry in self.records)
+
+    def report(self) -> pd.DataFrame:
+        """Return the ledger as a DataFrame (one row per boundary crossing)."""
+        columns = ['producer', 'consumer', 'format', 'n_columns', 'bytes_shared', 'bytes_copied']
+        return pd.DataFrame(self.records, columns=columns)
+
+    def log_summary(self, log: Optional[logging.Logger] = None) -> None:
+        """Log the bytes copied at every recorded stage boundary."""
+        log = log or logger
+        if not self.records:
+            log.info("No stage handoffs recorded")
+            return
+
+        for entry in self.records:
+            log.info(
+                f"Stage handoff {entry['producer']} -> {entry['consumer']} ({entry['format']}): "
+                f"{entry['n_columns']} columns, {entry['bytes_shared'] / 1024**2:.2f} MB shared, "
+                f"{entry['bytes_copied'] / 1024**2:.2f} MB copied"
+            )
+        log.info(f"Total bytes copied across stage boundaries: {self.total_bytes_copied:,}")
+
+
+class StageHandoff:
+    """
+    Column-level, copy-free view of a stage's output.
+
+    The handoff holds one NumPy array per column. For numeric frames these are
+    read-only views into the producing frame's blocks, so selecting columns
+    for a consumer never duplicates the underlying data, and a consumer
+    writing into its frame raises instead of changing the producer's data
+    (column assignment and methods returning new data work as usual).
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        stage: str,
+        ledger: Optional[HandoffLedger] = None
+    ):
+        """
+        Wrap a stage's output frame.
+
+        Args:
+            data: Output DataFrame of the producing stage
+            stage: Name of the producing stage (used in the ledger)
+            ledger: Shared ledger; a private one is created if omitted
+        """
+        self.stage = stage
+        self.source = data
+        self.index = data.index
+        self.ledger = ledger if ledger is not None else HandoffLedger()
+
+        # Keep the first occurrence of duplicated column names, mirroring
+        # label-based selection on the source frame
+        self._arrays: Dict[str, np.ndarray] = {}
+        for position, col in enumerate(data.columns):
+            if col not in self._arrays:
+                self._arrays[col] = self._read_only(data.iloc[:, position].to_numpy())
+
+    @classmethod
+    def from_arrow(
+        cls,
+        table,
+        stage: str,
+        index_column: Optional[str] = None,
+        ledger: Optional[HandoffLedger] = None
+    ) -> "StageHandoff":
+        """
+        Build a handoff from an Arrow table or record batch.
+
+        Columns without nulls are exposed zero-copy; columns containing nulls
+        are converted (and copied) by Arrow.
+        """
+        columns = {}
+        index = None
+        for name in table.column_names:
+            column = table.column(name)
+            if hasattr(column, 'combine_chunks'):
+                column = column.combine_chunks()
+            array = column.to_numpy(zero_copy_only=False)
+            if name == index_column:
+                index = pd.Index(array, name=name)
+            else:
+                columns[name] = array
+
+        frame = pd.DataFrame(columns, index=index, copy=False)
+        return cls(frame, stage=stage, ledger=ledger)
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        """Read-only view of ``array`` (the producer's own array stays writable)."""
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._arrays)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._arrays
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the read-only array backing a column."""
+        return self._arrays[name]
+
+    def select(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        consumer: str = "consumer"
+    ) -> pd.DataFrame:
+        """
+        Hand a subset of columns to a consumer as a DataFrame.
+
+        Args:
+            columns: Columns to hand over (all columns if None); unknown
+                names are ignored
+            consumer: Name of the consuming stage (used in the ledger)
+
+        Returns:
+            DataFrame whose columns are read-only views shared with this handoff
+        """
+        names = self.columns if columns is None else [col for col in columns if col in self._arrays]
+        frame = pd.DataFrame(
+            {name: self._arrays[name] for name in names},
+            index=self.index,
+            columns=names,
+            copy=False
+        )
+
+        bytes_shared = 0
+        bytes_copied = 0
+        for name in names:
+            source = self._arrays[name]
+            if np.shares_memory(frame[name].to_numpy(), source):
+                bytes_shared += source.nbytes
+            else:
+                bytes_copied += source.nbytes
+
+        self.ledger.record(self.stage, consumer, len(names), bytes_shared, bytes_copied)
+        return frame
+
+    def to_arrow(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        consumer: str = "consumer"
+    ):
+        """
+        Hand a subset of columns to a consumer as an Arrow table.
+
+        Contiguous numeric columns are wrapped without copying; strided views
+        (e.g. columns of a row-major 2-D block) are copied by Arrow and show
+        up as copied bytes in the ledger.
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow handoffs. Install with: pip install pyarrow")
+
+        names = self.columns if columns is None else [col for col in columns if col in self._arrays]
+        arrays = []
+        bytes_shared = 0
+        bytes_copied = 0
+        for name in names:
+            source = self._arrays[name]
+            arrow_array = pa.array(source)
+            buffers = arrow_array.buffers()
+            data_buffer = buffers[1] if len(buffers) > 1 else None
+            if data_buffer is not None and source.size and data_buffer.address == source.ctypes.data:
+                bytes_shared += source.nbytes
+            else:
+                bytes_copied += source.nbytes
+            arrays.append(arrow_array)
+
+        self.ledger.record(self.stage, consumer, len(names), bytes_shared, bytes_copied, fmt="arrow")
+        return pa.table(arrays, names=names)
@@ -195,6 +195,162 @@ class TestEventAlignment:
         
         if monday in aligned.index:
             assert aligned.loc[monday] == sunday_value
+    
+    def test_trading_calendar_windows(self):
+        """Event and estimation windows are counted in NYSE sessions."""
+        from src.analysis.event_study import EventStudyAnalyzer
+        from src.utils.calendars import get_calendar
+        
+        np.random.seed(3)
+        dates = get_calendar('nyse').sessions_in('2023-06-01', '2024-01-31')
+        market = pd.Series(np.random.randn(len(dates)) * 0.01, index=dates, name='market')
+        returns = pd.DataFrame({'asset': 0.5 * market + np.random.randn(len(dates)) * 0.005}, index=dates)
+        
+        analyzer = EventStudyAnalyzer()
+        # Friday before Christmas 2023: the window skips the weekend and Dec 25
+        results = analyzer.run_full_event_study(
+            returns, market, [pd.Timestamp('2023-12-22')],
+            event_window_days=2, estimation_window=60, calendar='nyse'
+        )
+        start, end = results['event_windows'][0]
+        assert start == pd.Timestamp('2023-12-20')
+        assert end.normalize() == pd.Timestamp('2023-12-27')
+        event_days = results['abnormal_returns']['event_1'].index
+        assert list(event_days.strftime('%m-%d')) == ['12-20', '12-21', '12-22', '12-26', '12-27']
+        assert results['model_parameters']['asset']['n_observations'] <= 60
+    
+    def test_calendars_by_asset_class(self):
+        """Crypto windows are counted in calendar days, equity windows in NYSE sessions."""
+        from src.analysis.event_study import EventStudyAnalyzer
+        
+        np.random.seed(6)
+        dates = pd.date_range('2023-06-01', '2024-01-31', freq='D')
+        market = pd.Series(np.random.randn(len(dates)) * 0.01, index=dates, name='market')
+        market = market[dates.dayofweek < 5]
+        returns = pd.DataFrame({
+            'stocks_spy': 0.9 * market.reindex(dates) + np.random.randn(len(dates)) * 0.002,
+            'crypto_btc': np.random.randn(len(dates)) * 0.03
+        }, index=dates)
+        
+        analyzer = EventStudyAnalyzer()
+        results = analyzer.run_full_event_study(
+            returns, market, [pd.Timestamp('2023-12-22')],
+            event_window_days=2, estimation_window=60, calendar='by_asset_class'
+        )
+        assert results['provenance']['asset_calendars'] == {'stocks_spy': 'nyse', 'crypto_btc': 'crypto'}
+        nyse_start, nyse_end = results['calendar_event_windows']['nyse'][0]
+        crypto_start, crypto_end = results['calendar_event_windows']['crypto'][0]
+        assert (nyse_start, nyse_end.normalize()) == (pd.Timestamp('2023-12-20'), pd.Timestamp('2023-12-27'))
+        assert (crypto_start, crypto_end.normalize()) == (pd.Timestamp('2023-12-20'), pd.Timestamp('2023-12-24'))
+        
+        # 60 crypto sessions are 60 calendar days, of which only weekdays have a market return
+        params = results['model_parameters']
+        assert params['crypto_btc']['n_observations'] < 45 < params['stocks_spy']['n_observations'] <= 60
+        assert list(results['abnormal_returns']['event_1'].columns) == ['stocks_spy', 'crypto_btc']
+        assert results['event_windows'] == [(nyse_start, nyse_end)]
+    
+    def test_calendars_by_asset_class_summarize_every_asset(self):
+        """Assets whose windows end before the other calendar's keep their summary statistics."""
+        from src.analysis.event_study import EventStudyAnalyzer
+        
+        np.random.seed(7)
+        dates = pd.date_range('2023-06-01', '2024-03-31', freq='D')
+        market = pd.Series(np.random.randn(len(dates)) * 0.01, index=dates, name='market')
+        market = market[dates.dayofweek < 5]
+        returns = pd.DataFrame({
+            'crypto_btc': np.random.randn(len(dates)) * 0.03,
+            'stocks_spy': 0.9 * market.reindex(dates) + np.random.randn(len(dates)) * 0.002
+        }, index=dates)
+        # Fridays: the crypto window ends on Monday, the NYSE window on Wednesday
+        events = [pd.Timestamp('2024-01-12'), pd.Timestamp('2024-02-09'), pd.Timestamp('2024-03-08')]
+        
+        analyzer = EventStudyAnalyzer()
+        results = analyzer.run_full_event_study(
+            returns, market, events, event_window_days=3, estimation_window=60, calendar='by_asset_class'
+        )
+        assert list(results['summary_statistics']) == ['crypto_btc', 'stocks_spy']
+        for asset in ('crypto_btc', 'stocks_spy'):
+            assert results['summary_statistics'][asset]['total_events'] == len(events)
+        
+        crypto_only = analyzer.run_full_event_study(
+            returns[['crypto_btc']], market, events, event_window_days=3, estimation_window=60, calendar='crypto'
+        )
+        assert results['summary_statistics']['crypto_btc'] == crypto_only['summary_statistics']['crypto_btc']
+
+
+class TestMarketModel:
+    """Test the batched market-model estimator."""
+    
+    def test_matches_per_asset_lstsq(self):
+        """Every asset's fit equals lstsq on its own sample outside the event windows."""
+        from src.analysis.market_model import fit_market_model, ESTIMATED, SHORT_OVERLAP
+        
+        np.random.seed(11)
+        dates = pd.bdate_range('2023-01-02', periods=300)
+        market = pd.Series(np.random.randn(300) * 0.01, index=dates)
+        market.iloc[[5, 50]] = np.nan
+        returns = pd.DataFrame(
+            0.8 * market.fillna(0).values[:, None] + np.random.randn(300, 3) * 0.005,
+            index=dates, columns=['a', 'b', 'late']
+        )
+        returns.iloc[np.random.rand(300) < 0.1, 1] = np.nan
+        returns.iloc[:292, 2] = np.nan
+        windows = [(dates[100], dates[104]), (dates[102], dates[110]), (dates[280], dates[299])]
+        
+        fit = fit_market_model(returns, market, estimation_window=150, exclude_event_windows=windows)
+        assert fit.status.tolist() == [ESTIMATED, ESTIMATED, SHORT_OVERLAP]
+        
+        outside = np.ones(300, dtype=bool)
+        outside[100:111] = outside[280:] = False
+        for i, asset in enumerate(['a', 'b']):
+            sample = returns[asset][outside].dropna().tail(150)
+            sample = sample[market.loc[sample.index].notna()]
+            X = np.column_stack([np.ones(len(sample)), market.loc[sample.index]])
+            (alpha, beta), residuals = np.linalg.lstsq(X, sample.values, rcond=None)[:2]
+            assert fit.n_observations[i] == len(sample)
+            assert np.isclose(fit.alpha[i], alpha) and np.isclose(fit.beta[i], beta)
+            assert np.isclose(fit.residual_std[i], np.sqrt(residuals[0] / len(sample)))
+        
+        frame = fit.to_frame()
+        assert frame.loc['late', 'n_observations'] == 8 and np.isnan(frame.loc['late', 'beta'])
+    
+    def test_event_specific_estimation(self):
+        """Event mode fits each event over its own window, ending a gap before it."""
+        from src.analysis.event_study import EventStudyAnalyzer
+        from src.utils.calendars import get_calendar
+        
+        np.random.seed(4)
+        nyse = get_calendar('nyse')
+        dates = nyse.sessions_in('2022-01-01', '2023-12-31')
+        market = pd.Series(np.random.randn(len(dates)) * 0.01, index=dates, name='market')
+        # Beta moves from 0.5 to 1.5 in 2023
+        beta = np.where(dates.year == 2022, 0.5, 1.5)
+        returns = pd.DataFrame({'asset': beta * market + np.random.randn(len(dates)) * 0.002}, index=dates)
+        events = [pd.Timestamp('2022-11-15'), pd.Timestamp('2023-11-15')]
+        
+        analyzer = EventStudyAnalyzer()
+        results = analyzer.run_full_event_study(
+            returns, market, events, event_window_days=2, estimation_window=100,
+            calendar='nyse', estimation_mode='event', estimation_gap=10
+        )
+        params = results['event_model_parameters']
+        assert abs(params['event_1']['asset']['beta'] - 0.5) < 0.05
+        assert abs(params['event_2']['asset']['beta'] - 1.5) < 0.05
+        assert params['event_2']['asset']['n_observations'] == 100
+        
+        # The estimation window is the 100 sessions ending 10 sessions before the event window
+        start = results['event_windows'][1][0]
+        window = nyse.sessions[nyse.session_position(start)[0] - 110:nyse.session_position(start)[0] - 10]
+        X = np.column_stack([np.ones(100), market.loc[window]])
+        alpha, slope = np.linalg.lstsq(X, returns['asset'].loc[window].values, rcond=None)[0]
+        assert np.isclose(params['event_2']['asset']['beta'], slope)
+        
+        ar = results['abnormal_returns']['event_2']['asset']
+        expected = returns['asset'].loc[ar.index] - (alpha + slope * market.loc[ar.index])
+        np.testing.assert_allclose(ar.values, expected.values)
+        
+        with pytest.raises(ValueError):
+            analyzer.run_full_event_study(returns, market, events, estimation_mode='rolling')
 
 
 def test_imports_available():
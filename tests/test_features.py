@@ -63,7 +63,63 @@ class TestSurpriseCalculation:
         
         # Should have valid values after
         assert not pd.isna(proxy_surprise.iloc[-1])
-    
+
+    def test_survey_surprise_uses_prior_window_only(self):
+        """Test rolling standardization uses only the previous `window` surprises."""
+        from src.preprocessing.surprise_constructor import SurpriseConstructor
+
+        np.random.seed(3)
+        n = 40
+        actual = np.random.randn(n).cumsum()
+        forecast = actual + np.random.randn(n)
+        announcements = pd.concat([
+            pd.DataFrame({
+                'date': pd.date_range('2015-01-01', periods=n, freq='MS'),
+                'indicator': name,
+                'actual': actual * scale,
+                'forecast': forecast * scale
+            })
+            for name, scale in [('cpi', 1.0), ('nfp', 100.0)]
+        ])
+
+        results = SurpriseConstructor().construct_surprises(
+            announcements, standardization_window=10, min_obs_for_standardization=6
+        )
+        survey = results['survey_based']
+        cpi = survey[survey['indicator'] == 'cpi']
+
+        raw = actual - forecast
+        assert len(cpi) == n - 6
+        for t in [6, 9, 25, n - 1]:
+            history = raw[max(0, t - 10):t]
+            row = cpi.iloc[t - 6]
+            assert row['n_historical_obs'] == len(history)
+            assert row['standardization_mean'] == pytest.approx(history.mean())
+            assert row['standardization_std'] == pytest.approx(history.std(ddof=1))
+            assert row['surprise'] == pytest.approx((raw[t] - history.mean()) / history.std(ddof=1))
+
+        # Standardized surprises are scale-free across indicators
+        nfp = survey[survey['indicator'] == 'nfp']
+        np.testing.assert_allclose(nfp['surprise'].values, cpi['surprise'].values)
+
+    def test_combined_surprises_prefer_survey(self):
+        """Test survey surprises take priority over proxies on the same (indicator, date)."""
+        from src.preprocessing.surprise_constructor import SurpriseConstructor
+
+        dates = pd.date_range('2020-01-01', periods=3, freq='MS')
+        survey = pd.DataFrame({'indicator': ['cpi', 'cpi', 'nfp'], 'surprise': [1.0, 2.0, 3.0]},
+                              index=[dates[0], dates[1], dates[1]])
+        proxy = pd.DataFrame({'indicator': ['cpi', 'cpi', 'nfp', 'nfp'], 'surprise': [9.0, 9.0, 9.0, 4.0]},
+                             index=[dates[1], dates[2], dates[1], dates[2]])
+
+        combined = SurpriseConstructor()._combine_surprises(survey, proxy)
+
+        assert len(combined) == 5
+        proxies = combined[combined['surprise_type'] == 'proxy']
+        assert sorted(zip(proxies['indicator'], proxies.index)) == [('cpi', dates[2]), ('nfp', dates[2])]
+        assert (proxies['data_quality_note'] == 'Use with caution - statistical proxy').all()
+        assert (combined.loc[combined['surprise_type'] == 'survey', 'data_quality_note'] == 'Survey-based - reliable').all()
+
     def test_surprise_sign_indicator(self):
         """Test surprise sign indicator creation."""
         surprises = pd.Series([0.1, -0.2, 0.0, 0.3, -0.1])
@@ -243,6 +299,41 @@ class TestMarketRegimeFeatures:
         assert trend_strength.iloc[-1] > trend_strength.iloc[0]
 
 
+class TestVolatilityPercentiles:
+    """Test rolling volatility percentiles and quantile regime thresholds."""
+
+    def test_percentiles_for_every_asset(self):
+        """Each asset gets the percentile rank of its 20-day volatility."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+
+        np.random.seed(8)
+        prices = pd.DataFrame(
+            100 * np.exp(np.random.normal(0, 0.012, (600, 2)).cumsum(axis=0)),
+            index=pd.date_range('2018-01-01', periods=600, freq='D'),
+            columns=['stocks_sp500', 'crypto_btc']
+        )
+        engineer = FeatureEngineer()
+        features = engineer.create_market_regime_features(prices, percentile_window=100)
+
+        for col in prices.columns:
+            vol = np.log(prices[col] / prices[col].shift(1)).rolling(20).std()
+            expected = vol.rolling(100).rank(pct=True)
+            pd.testing.assert_series_equal(
+                features[f"{col}_volatility_percentile"], expected, check_names=False, atol=1e-12
+            )
+        pd.testing.assert_series_equal(
+            features['volatility_percentile'], features['stocks_sp500_volatility_percentile'], check_names=False
+        )
+
+        # Quantile thresholds flag the top 20% of trailing volatility as high
+        quantile_regime = engineer.create_market_regime_features(
+            prices, volatility_quantile=0.8, percentile_window=100
+        )
+        vol = np.log(prices['stocks_sp500'] / prices['stocks_sp500'].shift(1)).rolling(20).std()
+        expected = (vol > vol.rolling(100).quantile(0.8)).astype(int)
+        assert (quantile_regime['high_volatility_regime'] == expected).all()
+
+
 class TestInteractionFeatures:
     """Test interaction feature creation."""
     
@@ -264,5 +355,533 @@ class TestInteractionFeatures:
         assert interaction.iloc[4] == 0.2
 
 
+class TestVirtualInteractions:
+    """Test virtual surprise x regime interactions."""
+
+    def test_virtual_matches_materialized(self):
+        """Expanded virtual interactions equal the materialized columns."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+        from src.analysis.regression_analysis import RegressionAnalyzer
+
+        np.random.seed(4)
+        dates = pd.date_range('2020-01-01', periods=200, freq='D')
+        surprises = pd.DataFrame({
+            'cpi_surprise': np.where(np.random.rand(200) < 0.3, np.random.randn(200), np.nan),
+            'nfp_surprise': np.random.randn(200),
+            'cpi_sign': np.sign(np.random.randn(200))
+        }, index=dates)
+        regimes = pd.DataFrame({
+            'high_volatility_regime': np.random.randint(0, 2, 200),
+            'bull_market': np.random.randint(0, 2, 200),
+            'trend_strength': np.random.randn(200)
+        }, index=dates).iloc[5:]
+
+        engineer = FeatureEngineer()
+        materialized = engineer.create_interaction_features(surprises, regimes)
+        virtual = engineer.create_interaction_features(surprises, regimes, virtual=True)
+
+        assert virtual.columns == list(materialized.columns)
+        assert len(virtual) == 4
+        pd.testing.assert_frame_equal(virtual.to_frame(), materialized)
+
+        # Only the selected terms are expanded, on the design-matrix rows
+        rows = dates[50:120]
+        terms = virtual.select('nfp_surprise_x_*')
+        X = RegressionAnalyzer().build_design_matrix(
+            surprises.loc[rows], ['nfp_surprise'], terms
+        )
+        assert list(X.columns) == ['const', 'nfp_surprise', 'nfp_surprise_x_high_volatility_regime',
+                                   'nfp_surprise_x_bull_market']
+        pd.testing.assert_frame_equal(
+            X[terms.columns], materialized.loc[rows, terms.columns], check_freq=False
+        )
+
+    def test_interaction_regression_design_has_full_rank(self):
+        """Complementary regime dummies lose their reference category, keeping the design identified."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+        from src.analysis.regression_analysis import RegressionAnalyzer
+
+        np.random.seed(5)
+        dates = pd.date_range('2020-01-01', periods=300, freq='D')
+        surprises = pd.DataFrame({'cpi_surprise': np.random.randn(300)}, index=dates)
+        high_vol = np.random.randint(0, 2, 300)
+        bull = np.random.randint(0, 2, 300)
+        regimes = pd.DataFrame({
+            'high_volatility_regime': high_vol,
+            'low_volatility_regime': 1 - high_vol,
+            'bull_market': bull,
+            'bear_market': 1 - bull
+        }, index=dates)
+        returns = pd.Series(np.random.randn(300) * 0.01, index=dates)
+
+        interactions = FeatureEngineer().create_interaction_features(surprises, regimes, virtual=True)
+        result = RegressionAnalyzer().interaction_regression(returns, interactions)
+
+        exog = result.model.exog
+        assert np.linalg.matrix_rank(exog) == exog.shape[1]
+        assert list(result.params.index) == [
+            'const', 'cpi_surprise', 'high_volatility_regime', 'bull_market',
+            'cpi_surprise_x_high_volatility_regime', 'cpi_surprise_x_bull_market'
+        ]
+
+
+class TestEventWindowFeatures:
+    """Test event window indicator construction."""
+
+    def test_event_window_offsets(self):
+        """Test pre/event/post flags for intraday-stamped index and events."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+
+        dates = pd.date_range('2020-01-01 16:00', periods=30, freq='D')
+        data = pd.DataFrame({'price': np.arange(30.0)}, index=dates)
+        events = [datetime(2020, 1, 10, 8, 30), datetime(2020, 1, 29, 14, 0)]
+
+        features = FeatureEngineer().create_event_window_features(
+            data, events, pre_window=2, post_window=5
+        )
+
+        assert list(features.columns) == [
+            'pre_event', 'event_day', 'post_event_1d', 'post_event_2d',
+            'post_event_3d', 'post_event_4d', 'post_event_5d'
+        ]
+        days = features.index.day
+        assert list(days[features['pre_event'] == 1]) == [8, 9, 27, 28]
+        assert list(days[features['event_day'] == 1]) == [10, 29]
+        assert list(days[features['post_event_1d'] == 1]) == [11, 30]
+        assert list(days[features['post_event_5d'] == 1]) == [15]
+
+
+class TestFeatureRegistry:
+    """Test lazy, pattern-based feature materialization."""
+
+    @pytest.fixture
+    def market_data(self):
+        """Create price and economic data."""
+        np.random.seed(11)
+        dates = pd.date_range('2019-01-01', periods=400, freq='D')
+        prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(np.random.randn(400, 3) * 0.01, axis=0)),
+            index=dates,
+            columns=['stocks_sp500', 'crypto_btc', 'crypto_eth']
+        )
+        economic = pd.DataFrame({'economic_cpi': np.random.randn(400)}, index=dates)
+        return prices, economic
+
+    def test_only_requested_features_are_built(self, market_data):
+        """Test pattern requests build only the matching features and match eager output."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+        from src.preprocessing.feature_registry import FeatureRegistry
+
+        prices, economic = market_data
+        engineer = FeatureEngineer()
+        registry = FeatureRegistry(engineer, prices, economic)
+
+        features = registry.get(['crypto_btc_volatility_*d', 'stocks_sp500_return', '*_x_bull_market'])
+
+        assert list(features.columns[:5]) == [
+            'crypto_btc_volatility_1d', 'crypto_btc_volatility_5d', 'crypto_btc_volatility_10d',
+            'crypto_btc_volatility_20d', 'stocks_sp500_return'
+        ]
+        assert all(name.endswith('_x_bull_market') for name in features.columns[5:])
+        summary = registry.summary()
+        assert summary['volatility']['materialized'] == 0
+        assert summary['returns']['materialized'] < summary['returns']['available']
+
+        eager = engineer.create_comprehensive_features(prices, economic)
+        pd.testing.assert_frame_equal(features, eager[features.columns], check_freq=False)
+
+        # Cached features are not rebuilt
+        builds = registry.n_builds
+        registry.get('crypto_btc_volatility_20d')
+        assert registry.n_builds == builds
+
+
+class TestIncrementalFeatures:
+    """Test online feature updates for appended trading days."""
+
+    def test_append_matches_full_recompute(self):
+        """Appended rows match recomputing features over the extended history."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+
+        np.random.seed(11)
+        dates = pd.date_range('2020-01-01', periods=400, freq='D')
+        prices = pd.DataFrame(
+            100 * np.exp(np.random.normal(0, 0.02, (400, 3)).cumsum(axis=0)),
+            index=dates, columns=['stocks_spy', 'crypto_btc', 'stocks_qqq']
+        )
+        prices.iloc[np.random.rand(400) < 0.05, 1] = np.nan
+        prices.iloc[320:340, 2] = prices.iloc[319, 2]
+
+        engineer = FeatureEngineer()
+        history = engineer.start_incremental_features(prices.iloc[:300])
+        appended = pd.concat([
+            engineer.append_prices(prices.iloc[300:301]),
+            engineer.append_prices(prices.iloc[301:])
+        ])
+
+        log_returns = np.log(prices / prices.shift(1))
+        full = pd.concat([
+            engineer.create_return_features(prices),
+            engineer.create_volatility_features(log_returns)
+        ], axis=1)
+
+        assert list(history.columns) == list(full.columns)
+        assert list(appended.columns) == list(full.columns)
+        pd.testing.assert_frame_equal(appended, full.iloc[300:], check_freq=False, rtol=1e-6, atol=1e-10)
+
+    def test_append_requires_primed_state(self):
+        """Appending before priming the state raises."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+
+        engineer = FeatureEngineer()
+        with pytest.raises(ValueError):
+            engineer.append_prices(pd.DataFrame({'stocks_spy': [100.0]}))
+
+
+class TestChunkedPipeline:
+    """Test out-of-core chunked preprocessing."""
+
+    @staticmethod
+    def _minute_prices(n_rows=3000):
+        np.random.seed(21)
+        index = pd.date_range('2024-01-02 09:30', periods=n_rows, freq='1min')
+        prices = pd.DataFrame(
+            100 * np.exp(np.random.normal(0, 0.001, (n_rows, 3)).cumsum(axis=0)),
+            index=index, columns=['stocks_spy', 'crypto_btc', 'stocks_qqq']
+        )
+        prices.iloc[100:130, 1] = np.nan
+        prices.iloc[:40, 2] = np.nan
+        prices.iloc[900:930, 0] = prices.iloc[899, 0]
+        prices.iloc[500, 0] *= 1.05
+        return prices
+
+    def test_matches_in_memory_run(self):
+        """Chunks with overlap buffers reproduce the in-memory cleaning, returns and features."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+        from src.preprocessing.feature_engineering import FeatureEngineer
+        from src.utils.returns_panel import ReturnsPanel
+
+        prices = self._minute_prices()
+        preprocessor = DataPreprocessor()
+        cleaned = preprocessor.clean_price_data(prices, outlier_method='hampel', outlier_threshold=4.0)
+        engineer = FeatureEngineer()
+        features = pd.concat([
+            engineer.create_return_features(cleaned),
+            engineer.create_volatility_features(np.log(cleaned / cleaned.shift(1)))
+        ], axis=1)
+
+        chunked = DataPreprocessor()
+        results = chunked.run_chunked(prices, chunk_rows=97, outlier_method='hampel', outlier_threshold=4.0)
+
+        pd.testing.assert_frame_equal(results['prices'], cleaned, check_freq=False)
+        pd.testing.assert_frame_equal(results['returns'], ReturnsPanel(cleaned).log(), check_freq=False)
+        assert list(results['features'].columns) == list(features.columns)
+        pd.testing.assert_frame_equal(results['features'], features, check_freq=False, rtol=1e-6, atol=1e-10)
+        np.testing.assert_array_equal(chunked.outlier_mask.to_array(), preprocessor.outlier_mask.to_array())
+        assert chunked.memory_budget is None
+        assert chunked.chunked_memory_budget.records
+
+    def test_budget_sized_chunks_from_files(self, tmp_path):
+        """Budget-sized chunks from files stay within the budget and reach the sink in order."""
+        from src.preprocessing.chunked_pipeline import ChunkedPipeline
+
+        prices = self._minute_prices(6000)
+        paths = []
+        for i, start in enumerate(range(0, 6000, 2000)):
+            path = tmp_path / f"minute_{i}.csv"
+            prices.iloc[start:start + 2000].to_csv(path)
+            paths.append(path)
+
+        received = {'prices': [], 'returns': [], 'features': []}
+        pipeline = ChunkedPipeline(memory_budget_mb=3, outlier_method='rolling_mad', features=True)
+        assert pipeline.run(paths, sink=lambda name, frame: received[name].append(frame)) == {}
+
+        chunks = [record for record in pipeline.memory_budget.records if record['step'] != 'flush']
+        assert len(chunks) > 3
+        assert max(record['peak_bytes'] for record in chunks) <= 3 * 1024**2
+        for frames in received.values():
+            index = pd.DatetimeIndex(np.concatenate([frame.index.values for frame in frames]))
+            assert index.equals(prices.index)
+
+        with pytest.raises(ValueError):
+            ChunkedPipeline(outlier_method='iqr')
+
+
+class TestPanelWinsorization:
+    """Test panel-wide winsorization."""
+
+    def test_matches_per_column_winsorization(self):
+        """Full-sample bounds equal the single-series winsorizer; rolling bounds use only past rows."""
+        from src.analysis.improved_statistics import WinsorizeAndRobustness
+
+        np.random.seed(17)
+        panel = pd.DataFrame(np.random.standard_t(3, (400, 4)), columns=['a', 'b', 'c', 'd'])
+        panel.iloc[::9, 2] = np.nan
+        panel['label'] = 'x'
+        robustness = WinsorizeAndRobustness()
+
+        full, report = robustness.winsorize_panel(panel, 0.05, 0.95)
+        for col in ['a', 'b', 'c', 'd']:
+            pd.testing.assert_series_equal(full[col], robustness.winsorize(panel[col], 0.05, 0.95))
+        assert (full['label'] == 'x').all()
+        assert report.loc['c', 'n_valid'] == panel['c'].notna().sum()
+        assert report['clip_rate'].between(0.08, 0.11).all()
+
+        rolling, _ = robustness.winsorize_panel(panel, 0.05, 0.95, mode='rolling', window=50)
+        window = panel[['a', 'b', 'c', 'd']].rolling(50)
+        expected = panel[['a', 'b', 'c', 'd']].clip(window.quantile(0.05), window.quantile(0.95), axis=None)
+        pd.testing.assert_frame_equal(rolling[['a', 'b', 'c', 'd']], expected)
+
+        # Expanding bounds at a date ignore later observations
+        shocked = panel.copy()
+        shocked.iloc[300:, 0] *= 100
+        before, _ = robustness.winsorize_panel(panel, mode='expanding')
+        after, _ = robustness.winsorize_panel(shocked, mode='expanding', inplace=True)
+        pd.testing.assert_frame_equal(after.iloc[:300], before.iloc[:300])
+        assert after is shocked
+
+
+class TestAnnouncementIndicators:
+    """Test vectorized announcement indicator columns."""
+
+    def test_indicators_with_weekend_tolerance(self):
+        """Event dates map to rows in one pass; weekend events roll forward within tolerance."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        data = pd.DataFrame({'spy_return': np.arange(10.0)}, index=pd.bdate_range('2024-01-01', periods=10))
+        announcements = pd.DataFrame(
+            {'event': ['CPI', 'Nonfarm Payrolls', 'CPI', 'Nonfarm Payrolls']},
+            index=pd.to_datetime(['2024-01-03', '2024-01-05', '2024-01-06', '2024-03-01'])
+        )
+        preprocessor = DataPreprocessor()
+
+        exact = preprocessor._add_announcement_indicators(data, announcements)
+        assert list(exact.columns) == ['spy_return', 'announcement_cpi', 'announcement_nonfarm_payrolls']
+        assert (exact[['announcement_cpi', 'announcement_nonfarm_payrolls']].dtypes == np.int8).all()
+        assert list(exact.index[exact['announcement_cpi'] == 1]) == [pd.Timestamp('2024-01-03')]
+        assert list(exact.index[exact['announcement_nonfarm_payrolls'] == 1]) == [pd.Timestamp('2024-01-05')]
+
+        # Saturday CPI moves to Monday; the March event has no row within tolerance
+        rolled = preprocessor._add_announcement_indicators(data, announcements, tolerance_days=2)
+        assert list(rolled.index[rolled['announcement_cpi'] == 1]) == [
+            pd.Timestamp('2024-01-03'), pd.Timestamp('2024-01-08')
+        ]
+        assert rolled['announcement_nonfarm_payrolls'].sum() == 1
+
+
+class TestCopyFreePipeline:
+    """Test the copy-free DataPreprocessor pipeline mode."""
+
+    def test_copy_free_matches_default_and_reports_memory(self):
+        """Copy-free mode gives the same dataset, leaves inputs intact and records each step."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        np.random.seed(12)
+        dates = pd.date_range('2020-01-01', periods=200, freq='D')
+        crypto = pd.DataFrame({'btc_return': np.random.randn(200)}, index=dates)
+        stocks = pd.DataFrame({'spy_return': np.random.randn(200)}, index=dates)
+        economic = pd.DataFrame({'fed_rate': np.random.rand(200)}, index=dates)
+        announcements = pd.DataFrame({'event': ['CPI', 'FOMC'] * 5}, index=dates[::20])
+
+        default = DataPreprocessor().create_analysis_dataset(crypto, stocks, economic, announcements)
+        copy_free = DataPreprocessor(copy_free=True)
+        result = copy_free.create_analysis_dataset(crypto, stocks, economic, announcements)
+        pd.testing.assert_frame_equal(result, default)
+
+        report = copy_free.memory_budget.report()
+        assert list(report['step']) == [
+            'synchronize_datasets', 'combine_datasets', 'add_announcement_indicators',
+            'add_time_features', 'add_lagged_variables', 'release_create_analysis_dataset'
+        ]
+        assert (report['peak_bytes'] >= 0).all()
+        # Only the final dataset is copied when it leaves copy-on-write
+        release = report.set_index('step').loc['release_create_analysis_dataset']
+        assert release['bytes_allocated'] >= result.memory_usage(index=False).sum()
+
+        # Cleaning under copy-on-write never writes through to the caller's frame
+        prices = crypto.copy()
+        prices.iloc[10, 0] = 50.0
+        cleaned = copy_free.clean_price_data(prices)
+        assert prices.iloc[10, 0] == 50.0
+        pd.testing.assert_frame_equal(cleaned, DataPreprocessor().clean_price_data(prices))
+
+    def test_outputs_do_not_share_input_buffers(self):
+        """Writing into a step's output leaves the input intact, and tracing stops after a run."""
+        import tracemalloc
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        dates = pd.date_range('2020-01-01', periods=50, freq='D')
+        data = pd.DataFrame({'spy_return': np.zeros(50)}, index=dates)
+
+        for preprocessor in (DataPreprocessor(), DataPreprocessor(copy_free=True)):
+            result = preprocessor._add_time_features(data)
+            result.iloc[0, 0] = 99.0
+            assert data.iloc[0, 0] == 0.0
+            if preprocessor.copy_free:
+                assert preprocessor.memory_budget.records[-1]['step'] == 'release_add_time_features'
+
+            economic = pd.DataFrame({'fed_rate': np.zeros(50)}, index=dates)
+            preprocessor.create_analysis_dataset(data, data, economic)
+            assert not tracemalloc.is_tracing()
+
+
+class TestLagTensor:
+    """Test lagged variables exposed as a strided view."""
+
+    def test_lags_are_views_matching_shift(self):
+        """Lag views match shifted columns and materialize only on request."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        np.random.seed(9)
+        data = pd.DataFrame({
+            'spy_return': np.random.randn(50),
+            'btc_volatility': np.random.rand(50),
+            'fed_rate': np.arange(50),
+            'month': np.arange(50) % 12
+        }, index=pd.date_range('2020-01-01', periods=50, freq='D'))
+
+        preprocessor = DataPreprocessor()
+        result = preprocessor._add_lagged_variables(data, lags=[1, 3], lazy=True)
+        assert result is data
+
+        lags = preprocessor.lag_tensor
+        assert lags.tensor.shape == (50, 3, 3)
+        assert not lags.tensor.flags.writeable
+        assert np.shares_memory(lags.tensor, lags.lag(3))
+        np.testing.assert_array_equal(lags.tensor[:, :, 2], data[lags.columns].shift(3).to_numpy())
+        pd.testing.assert_series_equal(
+            lags['fed_rate_lag3'], data['fed_rate'].shift(3).astype(float), check_names=False
+        )
+        assert list(lags.to_frame('spy_*').columns) == ['spy_return_lag1', 'spy_return_lag3']
+
+        # Eager mode adds the same columns as shifting each series
+        eager = preprocessor._add_lagged_variables(data, lags=[1, 3])
+        assert list(eager.columns[4:]) == lags.names
+        for name in lags.names:
+            column, _, lag = name.rpartition('_lag')
+            pd.testing.assert_series_equal(
+                eager[name], data[column].shift(int(lag)).astype(float), check_names=False
+            )
+
+    def test_non_numeric_columns_keep_lag_columns(self):
+        """Matching non-numeric columns are lagged as columns, in both modes."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        data = pd.DataFrame({
+            'spy_return': np.arange(6, dtype=float),
+            'rate_regime': list('aabbcc')
+        }, index=pd.date_range('2020-01-01', periods=6, freq='D'))
+
+        preprocessor = DataPreprocessor()
+        eager = preprocessor._add_lagged_variables(data, lags=[1, 2])
+        assert list(eager.columns[2:]) == [
+            'spy_return_lag1', 'spy_return_lag2', 'rate_regime_lag1', 'rate_regime_lag2'
+        ]
+        pd.testing.assert_series_equal(eager['rate_regime_lag2'], data['rate_regime'].shift(2), check_names=False)
+
+        lazy = preprocessor._add_lagged_variables(data, lags=[1, 2], lazy=True)
+        assert list(lazy.columns[2:]) == ['rate_regime_lag1', 'rate_regime_lag2']
+        assert preprocessor.lag_tensor.columns == ['spy_return']
+
+
+class TestParallelFeatures:
+    """Test process-parallel per-asset feature generation."""
+
+    def test_sharded_features_match_serial(self):
+        """Features computed across worker processes equal the in-process result."""
+        from src.preprocessing.feature_engineering import FeatureEngineer
+
+        np.random.seed(2)
+        prices = pd.DataFrame(
+            100 * np.exp(np.random.normal(0, 0.02, (150, 5)).cumsum(axis=0)),
+            index=pd.date_range('2020-01-01', periods=150, freq='D'),
+            columns=[f'stocks_{i}' for i in range(5)]
+        )
+        returns = np.log(prices / prices.shift(1))
+
+        serial, parallel = FeatureEngineer(n_jobs=1), FeatureEngineer(n_jobs=2)
+        pd.testing.assert_frame_equal(
+            parallel.create_return_features(prices), serial.create_return_features(prices)
+        )
+        pd.testing.assert_frame_equal(
+            parallel.create_volatility_features(returns), serial.create_volatility_features(returns)
+        )
+
+
+class TestFeaturePruning:
+    """Test redundant-feature pruning."""
+
+    @pytest.fixture
+    def redundant_features(self):
+        """Create features with near-duplicate groups and missing values."""
+        np.random.seed(5)
+        n = 300
+        base = np.random.randn(n, 3)
+        features = pd.DataFrame({
+            'a_return_mean_5d': base[:, 0],
+            'a_cumret_5d': 5 * base[:, 0],
+            'a_return_mean_10d': base[:, 0] + 0.01 * np.random.randn(n),
+            'b_vol': base[:, 1],
+            'b_vol_neg': -base[:, 1] + 0.01 * np.random.randn(n),
+            'c_level': base[:, 2],
+            'a_return': base[:, 0],
+            'flat': np.ones(n)
+        }, index=pd.date_range('2020-01-01', periods=n, freq='D'))
+        features.iloc[np.random.rand(n) < 0.1, 1] = np.nan
+        return features
+
+    def test_pairwise_complete_corr_matches_pandas(self, redundant_features):
+        """Blocked correlations match DataFrame.corr with missing values."""
+        from src.preprocessing.feature_pruning import pairwise_complete_corr
+
+        values = redundant_features.to_numpy(dtype=float)
+        values[np.random.rand(*values.shape) < 0.2] = np.nan
+        corr = pairwise_complete_corr(values[:, :4], values, min_periods=10)
+        expected = pd.DataFrame(values).corr(min_periods=10).to_numpy()[:4]
+
+        np.testing.assert_allclose(corr, expected, atol=1e-10)
+
+    def test_groups_reduce_to_representatives(self, redundant_features, tmp_path):
+        """Correlated groups keep one member; protected columns are kept; manifest is cached."""
+        from src.preprocessing.feature_pruning import FeaturePruner
+
+        cache_path = tmp_path / 'manifest.json'
+        pruner = FeaturePruner(threshold=0.98, min_periods=30, block_size=2,
+                               protect=['*_return'], cache_path=str(cache_path))
+        pruned = pruner.fit_transform(redundant_features)
+
+        assert list(pruned.columns) == ['a_return_mean_5d', 'b_vol', 'c_level', 'a_return', 'flat']
+        assert pruner.manifest['groups'] == {
+            'a_return_mean_5d': ['a_cumret_5d', 'a_return_mean_10d'],
+            'b_vol': ['b_vol_neg']
+        }
+        assert cache_path.exists()
+
+        cached = FeaturePruner(threshold=0.98, min_periods=30, protect=['*_return'], cache_path=str(cache_path))
+        cached._group = None  # a cache hit must not recompute correlations
+        pd.testing.assert_frame_equal(cached.fit_transform(redundant_features), pruned)
+
+    def test_raw_price_columns_are_kept(self):
+        """Near-collinear price levels passed as ``keep`` are never pruned."""
+        from src.preprocessing.feature_pruning import FeaturePruner
+
+        np.random.seed(11)
+        n = 300
+        level = 100 * np.exp(np.cumsum(np.random.randn(n) * 0.01))
+        features = pd.DataFrame({
+            'stocks_gspc': level,
+            'stocks_dji': 8 * level + np.random.randn(n) * 0.01,
+            'stocks_gspc_return': np.r_[np.nan, np.diff(np.log(level))]
+        }, index=pd.date_range('2020-01-01', periods=n, freq='D'))
+        prices = features[['stocks_gspc', 'stocks_dji']]
+
+        assert list(FeaturePruner(threshold=0.98).fit_transform(features).columns) == \
+            ['stocks_gspc', 'stocks_gspc_return']
+        pruner = FeaturePruner(threshold=0.98)
+        pruned = pruner.fit_transform(features, keep=prices.columns)
+        pd.testing.assert_frame_equal(pruned, features)
+        assert pruner.manifest['dropped'] == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
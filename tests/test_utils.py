@@ -0,0 +1,512 @@
+"""
+Tests for shared utility modules.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+
+class TestStageHandoff:
+    """Test column handoff between pipeline stages."""
+
+    @pytest.fixture
+    def stage_output(self):
+        """Create a mixed-dtype stage output frame."""
+        dates = pd.date_range('2020-01-01', periods=200, freq='D')
+        np.random.seed(0)
+        return pd.DataFrame({
+            'stocks_spy': 100 + np.random.randn(200).cumsum(),
+            'crypto_btc': 1000 + np.random.randn(200).cumsum(),
+            'economic_cpi_surprise': np.random.randn(200),
+            'event_day': np.random.randint(0, 2, 200)
+        }, index=dates)
+
+    def test_select_shares_memory(self, stage_output):
+        """Selected columns are views of the producing frame."""
+        from src.utils.stage_handoff import StageHandoff
+
+        handoff = StageHandoff(stage_output, 'preprocessing')
+        selected = handoff.select(['stocks_spy', 'event_day'], consumer='event_study')
+
+        assert list(selected.columns) == ['stocks_spy', 'event_day']
+        assert selected.index.equals(stage_output.index)
+        assert np.shares_memory(selected['stocks_spy'].to_numpy(), stage_output['stocks_spy'].to_numpy())
+        pd.testing.assert_frame_equal(selected, stage_output[['stocks_spy', 'event_day']])
+
+    def test_consumer_cannot_write_producer_data(self, stage_output):
+        """Selected columns are read-only; derived columns can still be added."""
+        from src.utils.stage_handoff import StageHandoff
+
+        handoff = StageHandoff(stage_output, 'preprocessing')
+        selected = handoff.select(['stocks_spy'], consumer='event_study')
+        original = stage_output['stocks_spy'].iloc[0]
+
+        with pytest.raises(ValueError):
+            selected.iloc[0, 0] = 99.0
+        selected['spy_return'] = selected['stocks_spy'].pct_change()
+
+        assert stage_output['stocks_spy'].iloc[0] == original
+        assert stage_output['stocks_spy'].to_numpy().flags.writeable
+
+    def test_ledger_records_boundaries(self, stage_output):
+        """The ledger reports shared and copied bytes per consumer."""
+        from src.utils.stage_handoff import StageHandoff, HandoffLedger
+
+        ledger = HandoffLedger()
+        handoff = StageHandoff(stage_output, 'preprocessing', ledger=ledger)
+        handoff.select(['stocks_spy', 'crypto_btc', 'missing'], consumer='regression')
+        handoff.select(consumer='statistical_analysis')
+
+        report = ledger.report()
+        assert list(report['consumer']) == ['regression', 'statistical_analysis']
+        assert list(report['n_columns']) == [2, 4]
+        assert report.loc[0, 'bytes_shared'] == 2 * 200 * 8
+        assert ledger.total_bytes_copied == 0
+
+
+class TestRollingMoments:
+    """Test the multi-window rolling moments kernel against pandas."""
+
+    def test_matches_pandas_rolling(self):
+        """All statistics match pandas rolling with NaNs, ties and flat stretches."""
+        from src.utils.rolling import rolling_moments, MOMENT_STATS
+
+        np.random.seed(7)
+        values = np.random.normal(0, 0.02, (400, 4))
+        values[np.random.rand(400, 4) < 0.1] = np.nan
+        values[50:80, 1] = 0.01
+        values[:, 2] = np.round(values[:, 2], 2)
+        windows = [1, 3, 5, 20]
+
+        moments = rolling_moments(values, windows, min_periods=2)
+        assert moments.shape == (400, 4, len(windows), len(MOMENT_STATS))
+
+        frame = pd.DataFrame(values)
+        for w_idx, window in enumerate(windows):
+            rolling = frame.rolling(window, min_periods=min(2, window))
+            for s_idx, stat in enumerate(MOMENT_STATS):
+                if stat == 'count':
+                    continue
+                expected = getattr(rolling, stat)().to_numpy()
+                np.testing.assert_allclose(moments[:, :, w_idx, s_idx], expected, rtol=1e-6, atol=1e-10)
+
+    def test_uniform_window(self):
+        """Windows of identical values give zero variance and skew, kurtosis -3."""
+        from src.utils.rolling import rolling_moments
+
+        values = np.array([1.0, 1.0, 1.0, 1.0, np.nan, 1.0, 2.0])
+        moments = rolling_moments(values, [4], stats=('var', 'skew', 'kurt'))[:, 0, 0, :]
+
+        np.testing.assert_array_equal(moments[3], [0.0, 0.0, -3.0])
+        assert np.isnan(moments[0]).all()
+
+
+class TestRollingOrderStatistics:
+    """Test the rolling rank and quantile engine against per-column pandas."""
+
+    def test_rank_and_quantiles_match_pandas(self):
+        """All columns at once match Series.rolling rank/quantile with NaNs and ties."""
+        from src.utils.rolling import rolling_rank, rolling_quantile
+
+        np.random.seed(3)
+        values = np.round(np.random.randn(300, 3), 1)
+        values[np.random.rand(300, 3) < 0.1] = np.nan
+
+        ranks = rolling_rank(values, 30, min_periods=10)
+        quantiles = rolling_quantile(values, 30, [0.1, 0.5, 0.9], min_periods=10)
+        assert quantiles.shape == (300, 3, 3)
+
+        for col in range(3):
+            rolling = pd.Series(values[:, col]).rolling(30, min_periods=10)
+            np.testing.assert_allclose(ranks[:, col], rolling.rank(pct=True).to_numpy())
+            np.testing.assert_allclose(quantiles[:, col, 1], rolling.median().to_numpy())
+            np.testing.assert_allclose(quantiles[:, col, 2], rolling.quantile(0.9).to_numpy())
+
+
+class TestReturnsPanel:
+    """Test the shared memoized returns panel."""
+
+    def _prices(self):
+        np.random.seed(11)
+        index = pd.date_range('2021-01-01', periods=400, freq='D')
+        prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(np.random.randn(400, 2) * 0.01, axis=0)),
+            index=index, columns=['stocks_spy', 'crypto_btc']
+        )
+        prices.iloc[np.random.rand(400) < 0.2, 0] = np.nan
+        return prices
+
+    def test_matches_pct_change_and_log(self):
+        """Gap-skipping, row-adjacent and multi-horizon returns match pandas."""
+        from src.utils.returns_panel import ReturnsPanel
+
+        prices = self._prices()
+        panel = ReturnsPanel(prices)
+
+        for col in prices.columns:
+            expected = prices[col].dropna().pct_change().dropna()
+            pd.testing.assert_series_equal(panel.series(col), expected)
+            pd.testing.assert_series_equal(
+                panel.series(col, horizon=5), prices[col].dropna().pct_change(periods=5).dropna()
+            )
+        pd.testing.assert_frame_equal(
+            panel.log(skip_gaps=False), np.log(prices / prices.shift(1)), check_freq=False
+        )
+
+        mask = panel.valid_mask(skip_gaps=False)
+        np.testing.assert_array_equal(mask.to_numpy(), (prices.notna() & prices.shift(1).notna()).to_numpy())
+        with pytest.raises(ValueError):
+            panel.returns(kind='arithmetic')
+
+    def test_analyzers_share_one_computation(self):
+        """Stages reading the same panel compute each return series once."""
+        from src.utils.returns_panel import ReturnsPanel
+        from src.analysis.comprehensive_statistical_analysis import ComprehensiveStatisticalAnalysis
+        from src.analysis.regression_analysis import RegressionAnalyzer
+
+        prices = self._prices()
+        panel = ReturnsPanel(prices)
+
+        ComprehensiveStatisticalAnalysis().run_complete_analysis(
+            prices, crypto_assets=['crypto_btc'], stock_assets=['stocks_spy'], returns_panel=panel
+        )
+        RegressionAnalyzer().run_pooled_regression(prices, returns_panel=panel)
+        panel.simple()
+
+        assert set(panel.computations) == {('simple', 1, True, col) for col in prices.columns}
+        assert all(count == 1 for count in panel.computations.values())
+
+    def test_changed_prices_replace_cached_returns(self):
+        """A frame with the same columns but different prices is not served stale returns."""
+        from src.utils.returns_panel import ReturnsPanel
+
+        prices = self._prices()
+        panel = ReturnsPanel(prices)
+        panel.series('crypto_btc')
+
+        assert ReturnsPanel.for_data(prices.copy(), panel) is panel
+        assert panel.computations[('simple', 1, True, 'crypto_btc')] == 1
+
+        changed = prices * 2.0
+        changed.iloc[200:, 1] = 50.0
+        shared = ReturnsPanel.for_data(changed, panel)
+        pd.testing.assert_series_equal(
+            shared.series('crypto_btc'), changed['crypto_btc'].dropna().pct_change().dropna()
+        )
+
+
+class TestEventPanel:
+    """Test the dense event-window panel."""
+
+    def test_by_time_matches_masked_windows(self):
+        """Minute slots reproduce the per-event masked slices of the preprocessor."""
+        from src.preprocessing.data_preprocessor import DataPreprocessor
+
+        np.random.seed(5)
+        index = pd.date_range('2024-03-01 08:00', periods=600, freq='min')
+        prices = pd.DataFrame(
+            100 + np.cumsum(np.random.randn(600, 2), axis=0), index=index, columns=['spy', 'btc']
+        )
+        prices = prices.drop(index[300:310])
+        events = [pd.Timestamp('2024-03-01 10:00'), pd.Timestamp('2024-03-01 13:00'),
+                  pd.Timestamp('2024-03-01 17:50')]
+
+        preprocessor = DataPreprocessor()
+        windows = preprocessor.prepare_event_study_data(prices, events, 30, 30)
+        panel = preprocessor.prepare_event_study_data(prices, events, 30, 30, as_panel=True)
+
+        assert panel.shape == (3, 61, 2)
+        np.testing.assert_array_equal(panel.relative, np.arange(-30, 31))
+        for i in range(3):
+            expected = windows[f'event_{i+1}']['prices']
+            window = panel.window(i)
+            np.testing.assert_array_equal(window[['spy', 'btc']].to_numpy(), expected[['spy', 'btc']].to_numpy())
+            np.testing.assert_array_equal(window.index, expected['minutes_to_announcement'].astype(int))
+        # Event 3 runs past the end of the data; event 2 covers the dropped minutes
+        assert not panel.in_window[2, -1] and np.isnan(panel.values[2, -1]).all()
+        assert panel.in_window[1].sum() == 61 - 10
+
+    def test_by_rows_gather_and_mean(self):
+        """Trading-day slots step over calendar gaps; the mean ignores missing cells."""
+        from src.utils.event_panel import EventPanel
+
+        index = pd.bdate_range('2024-01-01', periods=30)
+        data = pd.DataFrame({'a': np.arange(30.0), 'b': np.arange(30.0) * 2}, index=index)
+        data.iloc[11, 1] = np.nan
+        # Saturday event maps to the following Monday row
+        panel = EventPanel.by_rows(data, ['2024-01-13', '2024-01-02'], pre=2, post=2)
+
+        np.testing.assert_array_equal(panel.values[0, :, 0], [8, 9, 10, 11, 12])
+        np.testing.assert_array_equal(panel.values[1, :, 0], [np.nan, 0, 1, 2, 3])
+        assert panel.dates[0, 2] == np.datetime64('2024-01-15')
+
+        means = panel.mean()
+        assert means.loc[-2, 'a'] == 8.0
+        assert means.loc[1, 'b'] == 4.0  # event 1's value is missing
+        long = panel.to_long()
+        assert len(long) == panel.valid.sum()
+
+
+class TestOutlierEngine:
+    """Test the vectorized outlier engine."""
+
+    def test_rolling_bounds_match_pandas(self):
+        """Trailing median/MAD bounds match a per-column pandas rolling computation."""
+        from src.utils.outliers import outlier_bounds, MAD_SCALE
+
+        np.random.seed(8)
+        data = pd.DataFrame(np.random.randn(200, 3))
+        data.iloc[::11, 1] = np.nan
+
+        lower, upper = outlier_bounds(data.to_numpy(), 'rolling_mad', threshold=3.0, window=15, min_periods=8)
+        rolling = data.rolling(15, min_periods=8)
+        median = rolling.median()
+        mad = rolling.apply(lambda w: np.nanmedian(np.abs(w - np.nanmedian(w))), raw=True)
+        np.testing.assert_allclose(lower, (median - 3.0 * MAD_SCALE * mad).to_numpy())
+        np.testing.assert_allclose(upper, (median + 3.0 * MAD_SCALE * mad).to_numpy())
+
+    def test_rolling_blocks_follow_byte_budget(self):
+        """Wide panels are processed in blocks sized from the byte budget, with unchanged bounds."""
+        import tracemalloc
+        from src.utils.outliers import outlier_bounds
+
+        np.random.seed(3)
+        values = np.random.randn(300, 200)
+        expected = outlier_bounds(values, 'hampel', window=21, block_rows=300)
+
+        tracemalloc.start()
+        bounds = outlier_bounds(values, 'hampel', window=21, block_bytes=4 * 1024**2)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        for result, reference in zip(bounds, expected):
+            np.testing.assert_array_equal(result, reference)
+        # A single 300-row block would need about 3 x 300 x 200 x 21 x 8 bytes (30 MB)
+        assert peak < 12 * 1024**2
+
+    def test_hampel_policies_and_mask(self):
+        """A spike is flagged, clipped or removed; the mask records its position."""
+        from src.utils.outliers import handle_outliers
+        from src.utils.helpers import clean_outliers
+
+        np.random.seed(0)
+        index = pd.date_range('2024-01-01', periods=60, freq='D')
+        data = pd.DataFrame(np.random.randn(60, 2) * 0.1, index=index, columns=['a', 'b'])
+        data['label'] = 'x'
+        data.loc[index[30], 'a'] = 25.0
+
+        flagged, mask = handle_outliers(data, method='hampel', threshold=6.0, window=11, policy='flag')
+        assert flagged is data
+        assert len(mask) == 1 and mask.counts().to_dict() == {'a': 1, 'b': 0}
+        assert mask.to_frame().loc[index[30], 'a']
+
+        clipped, _ = handle_outliers(data, method='hampel', threshold=6.0, window=11, policy='clip')
+        assert clipped.loc[index[30], 'a'] < 1.0
+        pd.testing.assert_series_equal(clipped['b'], data['b'])
+        assert (clipped['label'] == 'x').all()
+
+        removed = clean_outliers(data[['a', 'b']], method='hampel', threshold=6.0, window=11)
+        assert np.isnan(removed.loc[index[30], 'a']) and removed['a'].notna().sum() == 59
+
+        # Series interface keeps its legacy drop semantics
+        series = data['a'].copy()
+        series.iloc[5] = np.nan
+        z = (series - series.mean()) / series.std()
+        pd.testing.assert_series_equal(clean_outliers(series, 'zscore', 3.0), series[np.abs(z) <= 3.0])
+
+
+class TestAsofAlignment:
+    """Test the sparse as-of alignment engine."""
+
+    def test_matches_reindex_ffill_on_grid(self):
+        """On an explicit grid, as-of lookups equal reindex + forward fill."""
+        from src.utils.asof import align_asof
+
+        daily = pd.DataFrame(
+            {'a': np.arange(10.0), 'b': np.r_[np.arange(5.0), [np.nan] * 5]},
+            index=pd.date_range('2024-01-01', periods=10, freq='D')
+        )
+        grid = pd.date_range('2024-01-01', '2024-01-10', freq='6h')
+        aligned = align_asof({'daily': daily}, index=grid)['daily']
+        pd.testing.assert_frame_equal(aligned, daily.reindex(grid).ffill(), check_freq=False)
+
+    def test_native_index_and_staleness(self):
+        """Native timestamps only; stale observations are dropped per dataset."""
+        from src.utils.asof import align_asof
+        from src.utils.helpers import synchronize_timestamps
+
+        daily = pd.DataFrame({'px': np.arange(40.0)}, index=pd.date_range('2024-01-01', periods=40, freq='D'))
+        monthly = pd.DataFrame({'cpi': [1.0, 2.0]}, index=pd.to_datetime(['2024-01-01', '2024-02-01']))
+
+        aligned = align_asof({'daily': daily, 'monthly': monthly}, tolerance={'monthly': '10D'})
+        assert len(aligned['daily']) == 32
+        cpi = aligned['monthly']['cpi']
+        assert cpi.loc['2024-01-11'] == 1.0 and np.isnan(cpi.loc['2024-01-12'])
+        assert cpi.loc['2024-02-01'] == 2.0
+
+        synced = synchronize_timestamps({'daily': daily, 'monthly': monthly})
+        assert synced['monthly'].index.equals(synced['daily'].index)
+        assert synced['monthly']['cpi'].loc['2024-01-31'] == 1.0
+
+        # Interpolation stays linear in row position on the grid
+        weekly = daily.iloc[::7] ** 2
+        grid = synchronize_timestamps({'weekly': weekly, 'daily': daily}, freq='3D', method='interpolate')
+        expected = weekly.reindex(pd.date_range('2024-01-01', '2024-02-05', freq='3D')).interpolate()
+        pd.testing.assert_frame_equal(grid['weekly'], expected)
+
+    def test_window_grid(self):
+        """A windows-only grid covers just the requested windows."""
+        from src.utils.asof import window_index
+        from src.utils.helpers import synchronize_timestamps
+
+        index = pd.date_range('2024-01-01', periods=3 * 24 * 60, freq='1min')
+        data = {'px': pd.DataFrame({'px': np.arange(len(index), dtype=float)}, index=index)}
+        windows = [(pd.Timestamp('2024-01-01 10:00'), pd.Timestamp('2024-01-01 10:30')),
+                   (pd.Timestamp('2024-01-02 14:00'), pd.Timestamp('2024-01-02 14:10'))]
+        grid = window_index(windows, '1min')
+        assert len(grid) == 31 + 11
+
+        synced = synchronize_timestamps(data, windows=windows, freq='1min')['px']
+        assert synced.index.equals(grid)
+        pd.testing.assert_frame_equal(synced, data['px'].loc[grid], check_freq=False)
+
+
+class TestTradingCalendar:
+    """Test the precomputed trading calendars."""
+
+    def test_nyse_sessions(self):
+        """Holiday rules and special closures give the published session counts."""
+        from src.utils.calendars import get_calendar
+
+        nyse = get_calendar('nyse')
+        counts = {year: int((nyse.sessions.year == year).sum()) for year in (2001, 2012, 2022, 2023, 2024, 2025)}
+        assert counts == {2001: 248, 2012: 250, 2022: 251, 2023: 250, 2024: 252, 2025: 250}
+        # Saturday New Year's Day is not observed; Juneteenth is a holiday from 2022
+        assert nyse.is_session(['2021-12-31', '2022-06-20', '2021-06-18']).tolist() == [True, False, True]
+        assert get_calendar('nyse') is nyse
+
+    def test_offsets_and_windows(self):
+        """Session offsets roll non-sessions forward and skip weekends and holidays."""
+        from src.utils.calendars import get_calendar, calendar_for
+
+        nyse = get_calendar('nyse')
+        dates = pd.DatetimeIndex([pd.Timestamp('2024-03-28'), pd.Timestamp('2024-03-30'), pd.Timestamp('2024-07-03 14:00')])
+        assert nyse.offset(dates, 1).strftime('%Y-%m-%d').tolist() == ['2024-04-01', '2024-04-02', '2024-07-05']
+        assert nyse.offset('2024-03-30', -1)[0] == pd.Timestamp('2024-03-28')
+
+        starts, ends = nyse.window(['2024-12-24'], pre=2, post=2)
+        assert starts[0] == pd.Timestamp('2024-12-20') and ends[0].normalize() == pd.Timestamp('2024-12-27')
+        assert nyse.count('2024-01-01', '2024-01-31') == 21
+
+        crypto = calendar_for('cryptocurrency')
+        assert crypto.offset('2024-03-30', 1)[0] == pd.Timestamp('2024-03-31')
+        assert calendar_for('fx_index').is_session(['2024-12-25', '2024-12-26']).tolist() == [False, True]
+
+        with pytest.raises(ValueError):
+            nyse.offset('1980-01-02', 1)
+
+
+class TestRealizedMeasures:
+    """Test the daily realized measures engine."""
+
+    @pytest.fixture
+    def bars(self):
+        """Two symbols, three days of 1-minute closes with gaps."""
+        rng = np.random.default_rng(7)
+        days = pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04'])
+        index = pd.DatetimeIndex(np.concatenate([
+            pd.date_range(day + pd.Timedelta('9h30min'), periods=390, freq='1min') for day in days
+        ]))
+        log_prices = 4 + np.cumsum(rng.normal(0, 1e-3, (len(index), 2)), axis=0)
+        close = pd.DataFrame(np.exp(log_prices), index=index, columns=['SPY', 'QQQ'])
+        close.iloc[rng.random(close.shape) < 0.05] = np.nan
+        return close
+
+    def test_matches_per_day_computation(self, bars):
+        """Every measure equals the per-symbol, per-day computation."""
+        from src.utils.realized import realized_measures
+
+        measures = realized_measures(bars, subsample=5)
+        day = bars.loc['2024-01-03', 'QQQ']
+        log_prices = np.log(day).ffill()
+        variances, kurtoses = [], []
+        for offset in range(5):
+            returns = log_prices.iloc[offset::5].diff().dropna().to_numpy()
+            variances.append((returns ** 2).sum())
+            kurtoses.append(len(returns) * (returns ** 4).sum() / variances[-1] ** 2)
+        assert np.isclose(measures['realized_variance'].loc['2024-01-03', 'QQQ'], np.mean(variances))
+        assert np.isclose(measures['realized_kurtosis'].loc['2024-01-03', 'QQQ'], np.mean(kurtoses))
+
+        returns = log_prices.diff().dropna().to_numpy()
+        bipower = np.pi / 2 * (np.abs(returns[1:]) * np.abs(returns[:-1])).sum()
+        assert np.isclose(realized_measures(bars)['bipower_variation'].loc['2024-01-03', 'QQQ'], bipower)
+
+        high, low = day.max(), day.min()
+        assert np.isclose(measures['parkinson_variance'].loc['2024-01-03', 'QQQ'],
+                          np.log(high / low) ** 2 / (4 * np.log(2)))
+        # A duration converts to bars
+        pd.testing.assert_frame_equal(realized_measures(bars, subsample='5min')['realized_variance'],
+                                      measures['realized_variance'])
+
+    def test_daily_panel_columns(self, bars):
+        """Measures join the daily panel by date; days without bars are NaN."""
+        from src.utils.realized import realized_measures, add_realized_measures
+
+        daily = pd.DataFrame({'SPY': [1.0, 2.0, 3.0, 4.0]},
+                             index=pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']))
+        panel = add_realized_measures(daily, realized_measures(bars, measures=['realized_variance']))
+        assert panel.columns.tolist() == ['SPY', 'SPY_realized_variance', 'QQQ_realized_variance']
+        assert panel['SPY_realized_variance'].iloc[:3].gt(0).all()
+        assert np.isnan(panel['SPY_realized_variance'].iloc[3])
+
+        with pytest.raises(ValueError):
+            realized_measures(bars, measures=['realized_range'])
+
+
+class TestMissingDataProfile:
+    """Test the single-pass missing-data profile and bulk fill policies."""
+
+    @pytest.fixture
+    def panel(self):
+        """Panel with a late-starting series, interior gaps and a trailing gap."""
+        index = pd.date_range('2024-01-01', periods=12, freq='D')
+        return pd.DataFrame({
+            'stocks_SPY': [1.0, np.nan, 3.0, np.nan, np.nan, 6.0, 7.0, 8.0, 9.0, 10.0, np.nan, np.nan],
+            'crypto_NEW': [np.nan] * 8 + [1.0, 2.0, np.nan, 4.0],
+            'economic_CPI': [100.0] + [np.nan] * 5 + [101.0] + [np.nan] * 5
+        }, index=index)
+
+    def test_profile_statistics(self, panel):
+        """Missing rates, gaps and structural starts come from one mask."""
+        from src.utils.missing_data import MissingDataProfile
+
+        profile = MissingDataProfile(panel)
+        assert profile.missing_count.tolist() == [5, 9, 10]
+        assert profile.columns_above(70) == ['crypto_NEW', 'economic_CPI']
+        assert profile.columns_between(30, 70) == ['stocks_SPY']
+        assert profile.structural_start['crypto_NEW'] == pd.Timestamp('2024-01-09')
+        # Rows before the structural start are not gaps
+        assert profile.longest_gap.tolist() == [2, 1, 5]
+        assert profile.gap_histogram.loc['stocks_SPY', '2-4'] == 2
+
+        report = profile.to_report()
+        assert report['missing_patterns']['crypto_NEW']['max_consecutive'] == 8
+        assert report['missing_patterns']['stocks_SPY']['num_gaps'] == 3
+
+    def test_fill_policies_match_pandas(self, panel):
+        """Bulk policies equal pandas ffill/interpolate column by column."""
+        from src.utils.missing_data import MissingDataProfile, match_policies
+
+        profile = MissingDataProfile(panel)
+        policies = match_policies(panel.columns, {'*economic*': 'ffill', 'stocks_*': 'interpolate', 'crypto_*': 'drop'})
+        filled = profile.fill(panel, policies, limit=3)
+
+        assert filled.columns.tolist() == ['stocks_SPY', 'economic_CPI']
+        pd.testing.assert_series_equal(filled['economic_CPI'], panel['economic_CPI'].ffill(limit=3))
+        pd.testing.assert_series_equal(
+            filled['stocks_SPY'], panel['stocks_SPY'].interpolate(limit=3, limit_area='inside')
+        )
+
+        with pytest.raises(ValueError):
+            profile.fill(panel, {'backfill': ['stocks_SPY']})